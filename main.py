@@ -3,10 +3,13 @@ Description: Main entry point that launches our sensor monitor application.
 Author(s): Mohammad Amman
 Reviewed by: Salek MD PEASH BEEN, Thet Htar Zin
 Date: 26 May 2025
-Last Updated: 26 May 2025
+Last Updated: 18 October 2026
 
 """
+from simulator.startup import startup_timer
+startup_timer.start()  # First, so startup is timed from launch and the milestones are printed
 import sys
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 from ui.main_window import SensorMonitorMainWindow
 
@@ -17,4 +20,5 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # The optional responder process must also start from a frozen build
     main()
@@ -0,0 +1,29 @@
+"""
+Description: Qt-free building blocks of the TSA0002 sensor simulator that are shared
+between the GUI and the MSSP responder.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+# Modules are imported on first use, so "import simulator.startup" does not pull in the protocol
+_EXPORTS = {
+    "SensorSnapshot": ".sensor_state",
+    "SensorState": ".sensor_state",
+    "ResponseFrameCache": ".frame_cache",
+    "NoiseSource": ".sensor_model",
+    "SensorModel": ".sensor_model",
+    "EmulatedDevice": ".devices",
+    "DeviceTable": ".devices"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
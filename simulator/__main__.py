@@ -0,0 +1,182 @@
+"""
+Description: Headless TSA0002 sensor simulator. Runs the MSSP responder on a serial port without
+loading Qt, for rack machines and CI runners, e.g.
+    python -m simulator --port /dev/ttyUSB0 --scenario tunnel
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import argparse
+import os
+import random
+import threading
+import time
+from .async_transport import AsyncTransport
+from .devices import DeviceTable
+from .dispatch import UnknownCommandPolicy
+from .events import format_event
+from .responder import MsspResponder
+from .sensor_model import NOISE_KINDS
+from .scenarios import SCENARIOS_PATH, ScenarioError, reload_scenarios, scenario_curves
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m simulator", description="Headless TSA0002 light sensor simulator")
+    parser.add_argument("--port", required=True, action="append",
+                        help="Serial port or pyserial URL, e.g. /dev/ttyUSB0, COM7, socket://host:port. "
+                             "Repeat for several LCU links, those must be tty or pty devices")
+    parser.add_argument("--baud", type=int, default=9600, help="Baud rate")
+    parser.add_argument("--scenario", help="Key of a scenario in the scenario file to report, e.g. tunnel")
+    parser.add_argument("--scenarios", metavar="FILE", default=SCENARIOS_PATH, help="Scenario file (default: scenarios.yaml)")
+    parser.add_argument("--light", type=float, help="Light value, overrides the scenario")
+    parser.add_argument("--temp", type=float, help="Temperature, overrides the scenario")
+    parser.add_argument("--voltage", type=float, help="Voltage, overrides the scenario")
+    parser.add_argument("--static", action="store_true", help="Report the scenario's constant values instead of its light curve")
+    parser.add_argument("--devices", type=int, default=1, help="Number of sensors to emulate, from address 0x01 on")
+    parser.add_argument("--noise", choices=NOISE_KINDS, default="gaussian", help="Measurement noise of the sensors")
+    parser.add_argument("--noise-level", type=float, default=2.0, help="Standard deviation of the noise in lux")
+    parser.add_argument("--seed", type=int, help="Noise seed, the same seed gives the same samples again (default: random)")
+    parser.add_argument("--capture", help="Record all bus traffic to this capture file")
+    parser.add_argument("--unknown-command", choices=[policy.value for policy in UnknownCommandPolicy],
+                        default=UnknownCommandPolicy.LOG.value, help="What to do with commands we have no handler for")
+    parser.add_argument("--summary", type=float, default=10, help="Seconds between latency summaries, 0 = only at exit")
+    parser.add_argument("--verbose", action="store_true", help="Print every handled request")
+    args = parser.parse_args()
+
+    # Values from the scenario, or the GUI's manual defaults, single values can be overridden
+    scenario = None
+    if args.scenario:
+        try:
+            table = reload_scenarios(args.scenarios)
+        except ScenarioError as e:
+            parser.error(str(e))
+        scenario = table.by_key.get(args.scenario)
+        if scenario is None:
+            parser.error(f"Unknown scenario {args.scenario!r}, choose from {', '.join(table.keys())}")
+    light = args.light if args.light is not None else (scenario.light if scenario else 400)
+    temp = args.temp if args.temp is not None else (scenario.temp if scenario else 25)
+    voltage = args.voltage if args.voltage is not None else (scenario.voltage if scenario else 5)
+
+    # Explicit values always win over the scenario's curves
+    curves = None
+    if scenario and not args.static and args.light is None and args.temp is None and args.voltage is None:
+        curves = scenario_curves(scenario)
+    seed = args.seed if args.seed is not None else random.SystemRandom().randrange(2 ** 31)
+
+    # One responder with its own sensors per port, the noise seeds of the ports do not overlap
+    responders = []
+    for index, port in enumerate(args.port):
+        prefix = f"{port}: " if len(args.port) > 1 else ""
+
+        def print_event(event, prefix=prefix):
+            print("\n".join(prefix + line for line in format_event(event)))
+
+        responder = MsspResponder(
+            port, args.baud, args.unknown_command,
+            on_event=print_event if args.verbose else None,
+            on_error=lambda message, prefix=prefix: print(f"Error: {prefix}{message}")
+        )
+        if args.devices > 1:
+            responder.devices = DeviceTable.sequential(args.devices)
+        responder.devices.set_noise(args.noise, args.noise_level, seed + index * 256)
+        if args.capture:
+            os.makedirs(os.path.dirname(os.path.abspath(args.capture)), exist_ok=True)
+            root, extension = os.path.splitext(args.capture)
+            responder.capture_path = args.capture if len(args.port) == 1 else f"{root}_{index + 1}{extension}"
+        responder.update_sensor_values(light, temp, voltage, curves=curves)
+        responders.append(responder)
+
+    print(f"Scenario: {scenario.title if scenario else 'Manual'}  Light={light}, Temp={temp}°C, Voltage={voltage}V")
+    if curves is not None:
+        print(f"Light follows the scenario curve, {curves.duration_s:.1f} s loop")
+    print(f"Noise: {args.noise}, level {args.noise_level}, seed {seed} (repeat with --seed {seed})")
+    print(f"Emulating {len(responders[0].devices)} sensor(s) on {', '.join(args.port)} at {args.baud} baud, Ctrl+C to stop")
+
+    # A single port keeps the blocking pyserial loop (COM ports, socket:// URLs), several tty/pty
+    # ports share one asyncio event loop instead of a thread each
+    if len(responders) == 1:
+        runner = SinglePortRunner(responders[0])
+    else:
+        runner = MultiPortRunner(responders, args.baud)
+        try:
+            runner.start()
+        except (OSError, ValueError) as e:
+            runner.stop()
+            parser.error(f"Could not open port: {e}")
+
+    next_summary = time.monotonic() + args.summary
+    last_count = 0
+    try:
+        while runner.is_alive():
+            runner.wait(0.2)
+            if args.summary and time.monotonic() >= next_summary:
+                next_summary += args.summary
+                # Nothing to say while the bus is quiet
+                count = sum(histogram.count for responder in responders for histogram in list(responder.latency.histograms.values()))
+                if count != last_count:
+                    last_count = count
+                    print_summary(responders)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        runner.stop()
+
+    print_summary(responders)
+    for responder in responders:
+        if responder.ignored_frames:
+            print(f"{responder.com_port}: ignored frames for other addresses: {responder.ignored_frames}")
+        if responder.ignored_commands:
+            print(f"{responder.com_port}: unknown commands left unanswered: {responder.ignored_commands}")
+
+
+def print_summary(responders):
+    for responder in responders:
+        for line in responder.latency.summary_lines():
+            print(f"{responder.com_port}: {line}" if len(responders) > 1 else line)
+
+
+class SinglePortRunner:
+    """The responder's own blocking loop in a thread."""
+
+    def __init__(self, responder):
+        self.responder = responder
+        self.thread = threading.Thread(target=responder.run, name="mssp-responder", daemon=True)
+        self.thread.start()
+
+    def is_alive(self):
+        return self.thread.is_alive()
+
+    def wait(self, timeout):
+        self.thread.join(timeout)
+
+    def stop(self):
+        self.responder.stop()
+        self.thread.join()
+
+
+class MultiPortRunner:
+    """Every responder on its port in one shared AsyncTransport."""
+
+    def __init__(self, responders, baud_rate):
+        self.responders = responders
+        self.baud_rate = baud_rate
+        self.transport = AsyncTransport()
+
+    def start(self):
+        self.transport.start()
+        for responder in self.responders:
+            self.transport.add_port(responder.com_port, responder, self.baud_rate)
+
+    # Keeps running while at least one port is still open
+    def is_alive(self):
+        return bool(self.transport.open_ports())
+
+    def wait(self, timeout):
+        time.sleep(timeout)
+
+    def stop(self):
+        self.transport.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Description: asyncio transport that serves many serial ports from one event loop. Linux tty and pty
+devices are opened non-blocking and watched through the loop's selector, every port has its own
+frame decoder as read buffer and its own write queue, and each port is answered by its own
+MsspResponder. Other threads (the GUI, the headless CLI) only use the thread-safe methods of
+AsyncTransport, so a whole train's LCU links need one thread instead of one per port.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from .capture import DIRECTION_RX, DIRECTION_TX, NO_COMMAND
+from .events import BusEvent
+from .mssp_codec import MsspPort, FrameDecoder
+
+
+READ_SIZE = 4096
+
+
+# Put the tty into raw mode at the given baud rate, ptys accept and ignore the speed
+def configure_tty(fd, baud_rate):
+    import termios
+    import tty
+
+    speed = getattr(termios, f"B{baud_rate}", None)
+    if speed is None:
+        raise ValueError(f"Baud rate {baud_rate} is not supported by termios")
+    tty.setraw(fd)
+    attributes = termios.tcgetattr(fd)
+    attributes[2] |= termios.CLOCAL | termios.CREAD  # Ignore modem lines, enable the receiver
+    attributes[4] = attributes[5] = speed
+    termios.tcsetattr(fd, termios.TCSANOW, attributes)
+
+
+class AsyncSerialPort(MsspPort):
+    """Non-blocking tty/pty port driven by the event loop. Only the loop thread may use it."""
+
+    def __init__(self, path, baud_rate, loop, on_messages, on_error):
+        self.path = path
+        self.loop = loop
+        self.on_messages = on_messages  # on_messages(messages, received_ns)
+        self.on_error = on_error
+        self.decoder = FrameDecoder()  # Keeps partial frames between reads, the per-port read buffer
+        self.capture = None
+        self.write_queue = deque()
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.fd = os.open(path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            configure_tty(self.fd, baud_rate)
+        except Exception:
+            os.close(self.fd)
+            raise
+        loop.add_reader(self.fd, self._on_readable)
+
+    # Messages are pushed to on_messages by the loop, there is nothing to poll
+    def read_messages(self):
+        return []
+
+    def _on_readable(self):
+        try:
+            data = os.read(self.fd, READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            # EIO on a pty whose other side went away
+            self.fail(f"Read failed: {e}")
+            return
+        if not data:
+            self.fail("Port was closed")
+            return
+
+        received_ns = time.perf_counter_ns()
+        self.bytes_received += len(data)
+        messages = self.decoder.feed(data)
+        if self.capture is not None:
+            for message in messages:
+                self.capture.record(DIRECTION_RX, message.raw, message.get_cmd())
+        if messages:
+            self.on_messages(messages, received_ns)
+
+    # Write straight away while nothing is queued, whatever does not fit waits for the fd to drain
+    def send_frame(self, frame, command=NO_COMMAND):
+        if self.fd is None:
+            return
+        if self.capture is not None:
+            self.capture.record(DIRECTION_TX, frame, command)
+        if not self.write_queue:
+            try:
+                written = os.write(self.fd, frame)
+            except BlockingIOError:
+                written = 0
+            except OSError as e:
+                self.fail(f"Write failed: {e}")
+                return
+            self.bytes_sent += written
+            if written == len(frame):
+                return
+            frame = memoryview(frame)[written:]
+            self.loop.add_writer(self.fd, self._on_writable)
+        self.write_queue.append(frame)
+
+    def _on_writable(self):
+        while self.write_queue:
+            frame = self.write_queue[0]
+            try:
+                written = os.write(self.fd, frame)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                self.fail(f"Write failed: {e}")
+                return
+            self.bytes_sent += written
+            if written < len(frame):
+                self.write_queue[0] = memoryview(frame)[written:]
+                return
+            self.write_queue.popleft()
+        self.loop.remove_writer(self.fd)
+
+    def fail(self, message):
+        self.close()
+        self.on_error(message)
+
+    def close(self):
+        if self.fd is None:
+            return
+        self.loop.remove_reader(self.fd)
+        self.loop.remove_writer(self.fd)
+        os.close(self.fd)
+        self.fd = None
+        self.write_queue.clear()
+
+
+class AsyncTransport:
+    """One event loop thread for all ports. Public methods are safe to call from any thread."""
+
+    def __init__(self):
+        self.loop = asyncio.SelectorEventLoop()
+        self.ports = {}  # path -> (AsyncSerialPort, MsspResponder), only touched in the loop thread
+        self.thread = threading.Thread(target=self._run_loop, name="mssp-transport", daemon=True)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    # Run function(*args) in the loop thread and wait for its result, exceptions are raised here
+    def call(self, function, *args):
+        async def invoke():
+            return function(*args)
+        return asyncio.run_coroutine_threadsafe(invoke(), self.loop).result()
+
+    # Open path and let responder answer everything that arrives on it. Raises OSError or
+    # ValueError if the port cannot be opened.
+    def add_port(self, path, responder, baud_rate=9600):
+        return self.call(self._add_port, path, responder, baud_rate)
+
+    def _add_port(self, path, responder, baud_rate):
+        if path in self.ports:
+            raise ValueError(f"{path} is already served")
+
+        def handle_messages(messages, received_ns):
+            for message in messages:
+                try:
+                    responder.process_message(message, received_ns)
+                except Exception as e:
+                    responder.report_error(f"Communication error: {str(e)}")
+
+        def handle_error(message):
+            responder.report_error(message)
+            self._remove_port(path)
+
+        port = AsyncSerialPort(path, baud_rate, self.loop, handle_messages, handle_error)
+        self.ports[path] = (port, responder)
+        responder.attach_port(port)
+        responder.running = True
+        responder.post_event(BusEvent.info(f" MSSP Communication Started\nListening on {path} at {baud_rate} baud"))
+        responder.start_capture()
+        return port
+
+    def remove_port(self, path):
+        self.call(self._remove_port, path)
+
+    def _remove_port(self, path):
+        entry = self.ports.pop(path, None)
+        if entry is None:
+            return
+        port, responder = entry
+        responder.running = False
+        port.close()
+        responder.stop_capture()
+
+    # Paths that are still open, a port drops out when its device goes away
+    def open_ports(self):
+        return self.call(lambda: list(self.ports))
+
+    # Close every port and end the loop thread
+    def stop(self):
+        if not self.thread.is_alive():
+            return
+        self.call(lambda: [self._remove_port(path) for path in list(self.ports)])
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
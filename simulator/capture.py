@@ -0,0 +1,265 @@
+"""
+Description: Append-only binary capture of the RS485 traffic between the LCU and the simulator.
+Frames are written by a background thread so the responder never waits for the disk, and a
+sidecar index lets the memory-mapped reader jump to a time range or command type directly.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from collections import namedtuple
+
+
+# File layout:
+#   header  : magic, version, wall clock ns and monotonic ns at the start of the capture
+#   records : monotonic ns, direction, command, length, then the frame bytes exactly as on the wire
+# Index layout (<capture>.idx), one fixed size entry per record:
+#   monotonic ns, record offset in the capture file, direction, command
+CAPTURE_MAGIC = b"MSSPCAP\x00"
+CAPTURE_VERSION = 1
+FILE_HEADER = struct.Struct("<8sIQQ")
+RECORD_HEADER = struct.Struct("<QBBH")
+INDEX_ENTRY = struct.Struct("<QQBB6x")
+
+DIRECTION_RX = 0   # Received from the LCU
+DIRECTION_TX = 1   # Sent by the simulator
+NO_COMMAND = 0xFF  # Command byte unknown or not an MSSP message
+
+# A capture stops growing here, about 14 hours of polls at 100 requests per second
+MAX_CAPTURE_BYTES = 256 * 1024 * 1024
+
+CaptureRecord = namedtuple("CaptureRecord", ["timestamp_ns", "direction", "command", "data"])
+
+
+def index_path_for(path):
+    return f"{path}.idx"
+
+
+# Delete the oldest captures in directory whose name starts with prefix, so that at most keep
+# of them remain. Their index files go with them. Returns the number of captures deleted.
+def prune_captures(directory, keep, prefix=""):
+    try:
+        paths = [
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.startswith(prefix) and name.endswith(".cap")
+        ]
+        paths.sort(key=os.path.getmtime)
+    except OSError:
+        return 0
+
+    deleted = 0
+    for path in paths[:max(len(paths) - keep, 0)]:
+        try:
+            os.remove(path)
+            deleted += 1
+            if os.path.exists(index_path_for(path)):
+                os.remove(index_path_for(path))
+        except OSError:
+            pass
+    return deleted
+
+
+class CaptureWriter:
+
+    # The files are created by the writer thread with the first frame, so a session without
+    # traffic leaves nothing behind. Frames that would grow the capture past max_bytes are dropped.
+    def __init__(self, path, flush_interval=0.5, max_bytes=MAX_CAPTURE_BYTES):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.records = 0
+        self.dropped = 0
+        self.error = None
+        self._queue = queue.SimpleQueue()
+        self._data_file = None
+        self._index_file = None
+        self._offset = 0
+
+        self._thread = threading.Thread(target=self._write_loop, name="CaptureWriter", daemon=True)
+        self._thread.start()
+
+    # Called from the comms thread, only timestamps the frame and queues it
+    def record(self, direction, data, command=NO_COMMAND):
+        self._queue.put((time.monotonic_ns(), direction, command, bytes(data)))
+
+    def _write_loop(self):
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = ()
+
+            if item is None:
+                break
+            if item:
+                self._write(*item)
+
+            if time.monotonic() - last_flush >= self.flush_interval:
+                self._flush()
+                last_flush = time.monotonic()
+        self._flush()
+
+    def _open(self):
+        if self.error is not None:
+            return False
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._data_file = open(self.path, "ab")
+            self._index_file = open(index_path_for(self.path), "ab")
+            self._offset = self._data_file.tell()
+            if self._offset == 0:
+                header = FILE_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, time.time_ns(), time.monotonic_ns())
+                self._data_file.write(header)
+                self._offset = len(header)
+        except OSError as e:
+            self.error = str(e)
+            return False
+        return True
+
+    def _write(self, timestamp_ns, direction, command, data):
+        if self._data_file is None and not self._open():
+            self.dropped += 1
+            return
+        if self.max_bytes is not None and self._offset + RECORD_HEADER.size + len(data) > self.max_bytes:
+            self.dropped += 1
+            return
+        try:
+            self._data_file.write(RECORD_HEADER.pack(timestamp_ns, direction, command, len(data)))
+            self._data_file.write(data)
+            self._index_file.write(INDEX_ENTRY.pack(timestamp_ns, self._offset, direction, command))
+            self._offset += RECORD_HEADER.size + len(data)
+            self.records += 1
+        except OSError as e:
+            self.error = str(e)
+
+    # Data first, so an index entry never points past the end of the capture
+    def _flush(self):
+        if self._data_file is None:
+            return
+        try:
+            self._data_file.flush()
+            self._index_file.flush()
+        except OSError as e:
+            self.error = str(e)
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._data_file is not None:
+            self._data_file.close()
+            self._index_file.close()
+
+
+class CaptureReader:
+
+    def __init__(self, path):
+        self.path = path
+        self._data_file = open(path, "rb")
+        self._data = self._map(self._data_file)
+        if self._data is None or len(self._data) < FILE_HEADER.size:
+            raise ValueError(f"{path} is not an MSSP capture")
+
+        magic, version, self.start_wall_ns, self.start_monotonic_ns = FILE_HEADER.unpack_from(self._data, 0)
+        if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION:
+            raise ValueError(f"{path} is not an MSSP capture")
+
+        # Without an index (or with an old one) we build it once by walking the records
+        index_path = index_path_for(path)
+        self._index_file = None
+        self._index = None
+        if os.path.exists(index_path):
+            self._index_file = open(index_path, "rb")
+            self._index = self._map(self._index_file)
+        if self._index is None or not self._index_matches():
+            self._index = self._build_index()
+        self._count = len(self._index) // INDEX_ENTRY.size
+
+    @staticmethod
+    def _map(file):
+        if os.fstat(file.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # The last index entry has to describe a complete record inside the capture
+    def _index_matches(self):
+        count = len(self._index) // INDEX_ENTRY.size
+        if count == 0:
+            return len(self._data) == FILE_HEADER.size
+        offset = INDEX_ENTRY.unpack_from(self._index, (count - 1) * INDEX_ENTRY.size)[1]
+        if offset + RECORD_HEADER.size > len(self._data):
+            return False
+        length = RECORD_HEADER.unpack_from(self._data, offset)[3]
+        return offset + RECORD_HEADER.size + length == len(self._data)
+
+    def _build_index(self):
+        index = bytearray()
+        offset = FILE_HEADER.size
+        while offset + RECORD_HEADER.size <= len(self._data):
+            timestamp_ns, direction, command, length = RECORD_HEADER.unpack_from(self._data, offset)
+            if offset + RECORD_HEADER.size + length > len(self._data):
+                break  # Record cut short, for example by a crash
+            index += INDEX_ENTRY.pack(timestamp_ns, offset, direction, command)
+            offset += RECORD_HEADER.size + length
+        return bytes(index)
+
+    def __len__(self):
+        return self._count
+
+    def entry(self, position):
+        return INDEX_ENTRY.unpack_from(self._index, position * INDEX_ENTRY.size)
+
+    # Record number `position`, the data is a zero-copy view into the mapped file
+    def record(self, position):
+        offset = self.entry(position)[1]
+        timestamp_ns, direction, command, length = RECORD_HEADER.unpack_from(self._data, offset)
+        start = offset + RECORD_HEADER.size
+        return CaptureRecord(timestamp_ns, direction, command, memoryview(self._data)[start:start + length])
+
+    def __iter__(self):
+        for position in range(self._count):
+            yield self.record(position)
+
+    # Position of the first record at or after timestamp_ns, binary search over the index
+    def bisect(self, timestamp_ns):
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self.entry(middle)[0] < timestamp_ns:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    # Records with start_ns <= timestamp < end_ns, optionally only one direction or command
+    def between(self, start_ns=None, end_ns=None, command=None, direction=None):
+        first = 0 if start_ns is None else self.bisect(start_ns)
+        last = self._count if end_ns is None else self.bisect(end_ns)
+        index = memoryview(self._index)[first * INDEX_ENTRY.size:last * INDEX_ENTRY.size]
+        for position, (_, _, entry_direction, entry_command) in enumerate(INDEX_ENTRY.iter_unpack(index), first):
+            if command is not None and entry_command != command:
+                continue
+            if direction is not None and entry_direction != direction:
+                continue
+            yield self.record(position)
+
+    def by_command(self, command, direction=None):
+        return self.between(command=command, direction=direction)
+
+    def close(self):
+        for mapped in (self._data, self._index):
+            if isinstance(mapped, mmap.mmap):
+                try:
+                    mapped.close()
+                except BufferError:
+                    pass  # A record view is still in use, the map goes away with it
+        self._data_file.close()
+        if self._index_file:
+            self._index_file.close()
@@ -0,0 +1,115 @@
+"""
+Description: Time-varying scenario values. A scenario describes light, temperature and voltage as
+segments (hold, ramp, strobe, shadow), which are rendered once into NumPy sample arrays. The
+responder then finds the value for a poll by indexing the arrays with the monotonic time since
+the scenario started, so a dynamic scenario costs O(1) per LCU request.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import importlib.util
+import math
+
+
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+SAMPLE_RATE_HZ = 1000  # 1 ms resolution, enough for strobes up to a few hundred Hz
+
+# Segment kinds and their parameters after the kind, e.g. ("ramp", 800, 20, 1.5):
+#   hold    value, seconds
+#   ramp    start, end, seconds                    (linear)
+#   strobe  low, high, hz, seconds[, duty]         (square wave, duty = share of the period at high)
+#   shadow  base, depth, seconds                   (smooth dip from base down to depth and back)
+SEGMENT_PARAMETERS = {
+    "hold": (2, 2),
+    "ramp": (3, 3),
+    "strobe": (4, 5),
+    "shadow": (3, 3)
+}
+
+
+class CurveSet:
+    __slots__ = ("light", "temp", "voltage", "sample_rate", "samples", "loop")
+
+    def __init__(self, light, temp, voltage, sample_rate=SAMPLE_RATE_HZ, loop=True):
+        self.light = light
+        self.temp = temp
+        self.voltage = voltage
+        self.sample_rate = sample_rate
+        self.samples = len(light)
+        self.loop = loop
+
+    @property
+    def duration_s(self):
+        return self.samples / self.sample_rate
+
+    # Sample index for the time since the scenario started, wraps around or stays on the last sample
+    def index(self, elapsed_ns):
+        position = max(elapsed_ns, 0) * self.sample_rate // 1_000_000_000
+        return position % self.samples if self.loop else min(position, self.samples - 1)
+
+    # Hot path for the light value request: one division and one array read
+    def light_at(self, elapsed_ns):
+        return int(self.light[self.index(elapsed_ns)])
+
+    def values_at(self, elapsed_ns):
+        position = self.index(elapsed_ns)
+        return int(self.light[position]), int(self.temp[position]), int(self.voltage[position])
+
+
+def validate_segments(segments):
+    if not segments:
+        raise ValueError("A curve needs at least one segment")
+    for segment in segments:
+        if not segment or segment[0] not in SEGMENT_PARAMETERS:
+            raise ValueError(f"Unknown curve segment {segment!r}, use one of {', '.join(SEGMENT_PARAMETERS)}")
+        low, high = SEGMENT_PARAMETERS[segment[0]]
+        if not low <= len(segment) - 1 <= high:
+            raise ValueError(f"Curve segment {segment!r} needs {low} to {high} values after {segment[0]!r}")
+        if not all(isinstance(value, (int, float)) for value in segment[1:]):
+            raise ValueError(f"Curve segment {segment!r} may only hold numbers")
+        seconds = segment[4] if segment[0] == "strobe" else segment[-1]
+        if seconds <= 0:
+            raise ValueError(f"Curve segment {segment!r} needs a duration above 0 seconds")
+        if segment[0] == "strobe" and segment[3] <= 0:
+            raise ValueError(f"Curve segment {segment!r} needs a frequency above 0 Hz")
+
+
+# Samples of one segment list as a float array
+def render_segments(segments, sample_rate=SAMPLE_RATE_HZ):
+    import numpy as np
+    validate_segments(segments)
+    parts = []
+    for kind, *values in segments:
+        count = max(1, int(round(values[-1 if kind != "strobe" else 3] * sample_rate)))
+        t = np.arange(count) / sample_rate
+        if kind == "hold":
+            parts.append(np.full(count, float(values[0])))
+        elif kind == "ramp":
+            parts.append(np.linspace(values[0], values[1], count, endpoint=False))
+        elif kind == "strobe":
+            low, high, hz = values[:3]
+            duty = values[4] if len(values) > 4 else 0.5
+            parts.append(np.where((t * hz) % 1.0 < duty, float(high), float(low)))
+        elif kind == "shadow":
+            base, depth, seconds = values
+            parts.append(base - (base - depth) * (0.5 - 0.5 * np.cos(2 * math.pi * t / seconds)))
+    return np.concatenate(parts)
+
+
+# Render the curves of a scenario. Every channel is a number or a segment list, shorter channels
+# repeat until all have the length of the longest one.
+def compile_curves(light, temp, voltage, sample_rate=SAMPLE_RATE_HZ, loop=True):
+    import numpy as np
+    channels = [value if isinstance(value, (list, tuple)) else None for value in (light, temp, voltage)]
+    rendered = [render_segments(segments, sample_rate) if segments else None for segments in channels]
+    samples = max((len(array) for array in rendered if array is not None), default=1)
+
+    arrays = []
+    for value, array in zip((light, temp, voltage), rendered):
+        array = np.full(samples, float(value)) if array is None else np.resize(array, samples)
+        arrays.append(np.round(array).astype(np.int32))
+    for array in arrays:
+        array.flags.writeable = False  # Shared between threads, nobody may change them
+    return CurveSet(*arrays, sample_rate=sample_rate, loop=loop)
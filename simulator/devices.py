@@ -0,0 +1,107 @@
+"""
+Description: Table of emulated TSA0002 slave devices on one RS485 bus. Every device has its own
+address, device id, group, light state, measurement model and response frame cache, and the table
+finds the device for a request with a single list index on the address byte.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+from .sensor_state import SensorState
+from .frame_cache import ResponseFrameCache
+from .sensor_model import SensorModel, NoiseSource
+from .mssp_codec import LIGHT_SENSOR_ADDRESS
+
+
+# Device info defaults, see RespExample.py and Table 8 of the MSSP spec
+TSA0002_DEVICE_TYPE = 4096     # 0x00001000 Light sensor – TSA0002x (legacy value)
+DEFAULT_DEVICE_ID = 65535
+DEFAULT_FIRMWARE = 16842753    # 0x01010001 = 1.1.1
+DEFAULT_GROUP = 254            # 0xFE
+
+# Table 7: 0x01 - 0x7F are slave addresses, from 0x80 on group, unset and broadcast addresses
+FIRST_SLAVE_ADDRESS = 0x01
+LAST_SLAVE_ADDRESS = 0x7F
+
+
+class EmulatedDevice:
+    __slots__ = ("address", "dev_type", "dev_id", "firmware", "group", "state", "model", "frames", "info_frames")
+
+    def __init__(self, address, dev_id=DEFAULT_DEVICE_ID, group=DEFAULT_GROUP,
+                 dev_type=TSA0002_DEVICE_TYPE, firmware=DEFAULT_FIRMWARE, light=100, temp=25, voltage=5):
+        self.address = address
+        self.dev_type = dev_type
+        self.dev_id = dev_id
+        self.firmware = firmware
+        self.group = group
+        self.state = SensorState(light, temp, voltage)
+        self.model = SensorModel()  # Gaussian noise with a random seed until set_noise is called
+        self.frames = ResponseFrameCache()  # Light values, dropped with every new sensor snapshot
+        self.info_frames = ResponseFrameCache(max_entries=16)  # Device info, one frame per ctrl byte
+
+    def __repr__(self):
+        return f"EmulatedDevice(address=0x{self.address:02X}, dev_id={self.dev_id}, group=0x{self.group:02X})"
+
+
+class DeviceTable:
+
+    def __init__(self, devices=(), answer_any_address=False):
+        # One slot per possible address byte, so finding the device for msg[2] is a list index
+        self._slots = [None] * 256
+        self.devices = []
+        self.answer_any_address = answer_any_address
+        for device in devices:
+            self.add(device)
+
+    # The classic setup: one sensor that answers whatever address the LCU polls
+    @classmethod
+    def single(cls, address=LIGHT_SENSOR_ADDRESS):
+        return cls([EmulatedDevice(address)], answer_any_address=True)
+
+    # count sensors on consecutive addresses, each with its own device id
+    @classmethod
+    def sequential(cls, count, first_address=FIRST_SLAVE_ADDRESS, first_dev_id=1):
+        return cls(EmulatedDevice(first_address + number, dev_id=first_dev_id + number) for number in range(count))
+
+    def add(self, device):
+        if not FIRST_SLAVE_ADDRESS <= device.address <= LAST_SLAVE_ADDRESS:
+            raise ValueError(f"0x{device.address:02X} is not a slave address")
+        if any(existing.address == device.address for existing in self.devices):
+            raise ValueError(f"Address 0x{device.address:02X} is already used")
+        self.devices.append(device)
+        self._fill_slots()
+
+    # Point every slot at its device. With answer_any_address the first device also takes
+    # every unclaimed address, just like the simulator did before it knew about addresses.
+    def _fill_slots(self):
+        slots = [None] * 256
+        for device in self.devices:
+            slots[device.address] = device
+        if self.answer_any_address and self.devices:
+            fallback = self.devices[0]
+            slots = [None] + [device or fallback for device in slots[1:]]
+        self._slots = slots
+
+    # Device answering a request to this address, None if no emulated device owns it.
+    # Unless answer_any_address is set, group and broadcast addresses get no response
+    # because several slaves answering at once would collide on the bus.
+    def lookup(self, address):
+        return self._slots[address]
+
+    # Publish new values to one device, or to all when address is None
+    def publish(self, light, temp, voltage, address=None, curves=None):
+        targets = self.devices if address is None else [self._slots[address]]
+        snapshots = [device.state.publish(light, temp, voltage, curves) for device in targets if device is not None]
+        return snapshots[0] if snapshots else None
+
+    # New noise for every device. With a seed every device gets seed + its index, so a run can be
+    # repeated sample for sample and the sensors still do not all show the same noise.
+    def set_noise(self, kind="gaussian", level=2.0, seed=None):
+        for index, device in enumerate(self.devices):
+            device.model = SensorModel(NoiseSource(kind, level, None if seed is None else seed + index))
+
+    def __len__(self):
+        return len(self.devices)
+
+    def __iter__(self):
+        return iter(self.devices)
@@ -0,0 +1,141 @@
+"""
+Description: Table-driven dispatch of MSSP commands. Handlers are registered per command byte,
+compiled once into a 256 entry table when the responder starts, and each entry keeps its own
+call counters and timing. New commands can be added as plugins with register_command.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import time
+from enum import Enum
+from functools import partial
+from .mssp_codec import COMMAND_NAMES
+from .events import Outcome
+
+
+# Handler results that count as an error of the command, handlers catch their own exceptions
+ERROR_OUTCOMES = (Outcome.FAILED, Outcome.NAK)
+
+
+class UnknownCommandPolicy(Enum):
+    IGNORE = "ignore"   # Drop the request silently
+    NAK = "nak"         # Answer with TW_MSSP_INVALID_COMMAND
+    LOG = "log"         # Do not answer, but show the request in the log
+
+
+class CommandEntry:
+    __slots__ = ("command", "name", "handler", "calls", "errors", "total_ns", "max_ns")
+
+    def __init__(self, command, name, handler):
+        self.command = command
+        self.name = name
+        self.handler = handler
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def stats(self):
+        return {
+            "command": f"0x{self.command:02X}",
+            "name": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_us": round(self.total_ns / self.calls / 1000, 1) if self.calls else 0,
+            "max_us": round(self.max_ns / 1000, 1)
+        }
+
+
+class CommandRegistry:
+
+    def __init__(self):
+        self._handlers = {}
+
+    # Register handler for a command byte, also usable as a decorator:
+    #     @registry.register(0x0C, "Single param")
+    #     def handle(responder, device, msg, ctrl, received_ns): ...
+    # Handlers return (events.Outcome, the frame they sent or None), or None to stay out of the log.
+    # FAILED and NAK outcomes are counted as errors of the command.
+    def register(self, command, handler=None, name=None):
+        if not 0 <= command <= 0xFF:
+            raise ValueError(f"Command {command} does not fit in one byte")
+
+        def add(function):
+            self._handlers[command] = (name or COMMAND_NAMES.get(command, f"Cmd 0x{command:02X}"), function)
+            return function
+
+        return add(handler) if handler is not None else add
+
+    def unregister(self, command):
+        self._handlers.pop(command, None)
+
+    def items(self):
+        return self._handlers.items()
+
+    def __contains__(self, command):
+        return command in self._handlers
+
+
+class Dispatcher:
+    """Compiled dispatch table: a list indexed by the command byte, built once."""
+
+    def __init__(self, entries, unknown_handler, unknown_policy=UnknownCommandPolicy.LOG):
+        self.table = [None] * 256
+        for entry in entries:
+            self.table[entry.command] = entry
+        self.unknown_handler = unknown_handler
+        self.unknown_policy = unknown_policy
+        self.unknown_counts = {}
+
+    # Run the handler for `command` with the handler arguments, timing and counting the call
+    def dispatch(self, command, *args):
+        entry = self.table[command]
+        if entry is None:
+            self.unknown_counts[command] = self.unknown_counts.get(command, 0) + 1
+            return self.unknown_handler(self.unknown_policy, *args)
+
+        start_ns = time.perf_counter_ns()
+        try:
+            result = entry.handler(*args)
+        except Exception:
+            entry.errors += 1
+            raise
+        finally:
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            entry.calls += 1
+            entry.total_ns += elapsed_ns
+            if elapsed_ns > entry.max_ns:
+                entry.max_ns = elapsed_ns
+
+        if result is not None and result[0] in ERROR_OUTCOMES:
+            entry.errors += 1
+        return result
+
+    def entries(self):
+        return [entry for entry in self.table if entry is not None]
+
+    def stats(self):
+        return {
+            "commands": [entry.stats() for entry in self.entries()],
+            "unknown": {f"0x{command:02X}": count for command, count in sorted(dict(self.unknown_counts).items())}
+        }
+
+
+# Commands added by plugins, merged into every responder's table when it is built
+plugin_registry = CommandRegistry()
+
+
+def register_command(command, handler=None, name=None):
+    return plugin_registry.register(command, handler, name)
+
+
+# Compile built-in handlers and plugin handlers into a Dispatcher for one responder.
+# Plugin handlers get the responder as first argument, plugins may replace built-in commands.
+def build_dispatcher(responder, builtin_registry, unknown_handler, unknown_policy=UnknownCommandPolicy.LOG):
+    entries = {}
+    for command, (name, handler) in builtin_registry.items():
+        entries[command] = CommandEntry(command, name, handler)
+    for command, (name, handler) in plugin_registry.items():
+        entries[command] = CommandEntry(command, name, partial(handler, responder))
+    return Dispatcher(entries.values(), unknown_handler, UnknownCommandPolicy(unknown_policy))
@@ -0,0 +1,100 @@
+"""
+Description: Lock-free single-producer single-consumer ring of byte records in a
+multiprocessing.shared_memory block. The responder process appends events, the GUI process
+drains them, and neither side ever waits for the other: a full ring drops the new record.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import struct
+from multiprocessing import shared_memory
+
+
+# head (bytes ever written) and the dropped counter belong to the producer, tail (bytes ever read)
+# to the consumer. They sit on separate cache lines, each side only ever writes its own counters.
+HEAD_OFFSET = 0
+DROPPED_OFFSET = 8
+TAIL_OFFSET = 64
+DATA_OFFSET = 128
+COUNTER = struct.Struct("<Q")
+LENGTH = struct.Struct("<I")
+WRAP_MARKER = 0xFFFFFFFF  # Rest of the ring is unused, the next record starts at the beginning
+
+DEFAULT_CAPACITY = 1 << 22  # About a second of log events at full poll rate
+
+
+class EventRing:
+
+    # Creates a new ring, or attaches to an existing one when name is given
+    def __init__(self, name=None, capacity=DEFAULT_CAPACITY):
+        if capacity & (capacity - 1):
+            raise ValueError("Ring capacity must be a power of two")
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=DATA_OFFSET + capacity)
+            self.shm.buf[:DATA_OFFSET] = bytes(DATA_OFFSET)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.buf = self.shm.buf
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def dropped(self):
+        return COUNTER.unpack_from(self.buf, DROPPED_OFFSET)[0]
+
+    # Producer side: append one record, False when the ring is full and the record was dropped.
+    # The record is written completely before head moves, so the consumer never sees half of it.
+    def push(self, payload):
+        size = LENGTH.size + len(payload)
+        head = COUNTER.unpack_from(self.buf, HEAD_OFFSET)[0]
+        tail = COUNTER.unpack_from(self.buf, TAIL_OFFSET)[0]
+        position = head & self.mask
+        padding = self.capacity - position if position + size > self.capacity else 0
+        if padding + size > self.capacity - (head - tail):
+            COUNTER.pack_into(self.buf, DROPPED_OFFSET, self.dropped + 1)
+            return False
+
+        if padding:
+            if padding >= LENGTH.size:
+                LENGTH.pack_into(self.buf, DATA_OFFSET + position, WRAP_MARKER)
+            head += padding
+            position = 0
+        start = DATA_OFFSET + position
+        LENGTH.pack_into(self.buf, start, len(payload))
+        self.buf[start + LENGTH.size:start + size] = payload
+        COUNTER.pack_into(self.buf, HEAD_OFFSET, head + size)
+        return True
+
+    # Consumer side: every record written since the last drain, oldest first
+    def drain(self):
+        head = COUNTER.unpack_from(self.buf, HEAD_OFFSET)[0]
+        tail = COUNTER.unpack_from(self.buf, TAIL_OFFSET)[0]
+        records = []
+        while tail < head:
+            position = tail & self.mask
+            # Less than a length field left before the end is always padding
+            if self.capacity - position < LENGTH.size:
+                tail += self.capacity - position
+                continue
+            length = LENGTH.unpack_from(self.buf, DATA_OFFSET + position)[0]
+            if length == WRAP_MARKER:
+                tail += self.capacity - position
+                continue
+            start = DATA_OFFSET + position + LENGTH.size
+            records.append(bytes(self.buf[start:start + length]))
+            tail += LENGTH.size + length
+        COUNTER.pack_into(self.buf, TAIL_OFFSET, tail)
+        return records
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+
+    # Only the side that created the ring removes it
+    def unlink(self):
+        self.shm.unlink()
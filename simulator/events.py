@@ -0,0 +1,122 @@
+"""
+Description: Structured bus events reported by the MSSP responder. The comms thread only records
+what happened (timestamp, direction, address, command, frame bytes and outcome) in a slotted
+record, and display text is built by format_event when someone actually looks at the event,
+usually the log view painting a visible row.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import struct
+import time
+from enum import IntEnum
+from .capture import DIRECTION_RX, DIRECTION_TX
+from .mssp_codec import (
+    MsspError, decode_frame, HEADER_SIZE, MSG_DEVICE_INFO_REQ, MSG_GET_LIGHT_VALUE_REQ, COMMAND_NAMES
+)
+
+
+class Direction(IntEnum):
+    RX = DIRECTION_RX   # Request from the LCU
+    TX = DIRECTION_TX   # Response sent by the simulator
+    NONE = 2            # Not a frame, a status note of the responder
+
+
+class Outcome(IntEnum):
+    RESPONDED = 0       # Request answered / response sent
+    UNSUPPORTED = 1     # No handler for the command, not answered
+    NAK = 2             # Answered with TW_MSSP_INVALID_COMMAND
+    FAILED = 3          # The handler raised, the error is reported separately
+    INFO = 4            # Status note, payload is its text
+
+
+# perf_counter_ns() + offset = wall clock ns, taken once instead of a datetime.now() per frame
+WALL_CLOCK_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+LIGHT_VALUES = struct.Struct("<HHH")
+DEVICE_INFO = struct.Struct("<IIIBB")
+
+
+class BusEvent:
+    __slots__ = ("timestamp_ns", "direction", "address", "command", "payload", "outcome")
+
+    # timestamp_ns is time.perf_counter_ns(). RX payloads are the decoded request (VER, CTRL, ADDR,
+    # CMD, data), TX payloads the encoded frame as it went on the wire.
+    def __init__(self, timestamp_ns, direction, address, command, payload, outcome):
+        self.timestamp_ns = timestamp_ns
+        self.direction = direction
+        self.address = address
+        self.command = command
+        self.payload = payload
+        self.outcome = outcome
+
+    @classmethod
+    def info(cls, text):
+        return cls(time.perf_counter_ns(), Direction.NONE, 0, 0, text, Outcome.INFO)
+
+    # Plain tuple for marshal, used to send events to another process
+    def to_tuple(self):
+        payload = self.payload if isinstance(self.payload, str) else bytes(self.payload)
+        return self.timestamp_ns, int(self.direction), self.address, self.command, payload, int(self.outcome)
+
+    @classmethod
+    def from_tuple(cls, values):
+        timestamp_ns, direction, address, command, payload, outcome = values
+        return cls(timestamp_ns, Direction(direction), address, command, payload, Outcome(outcome))
+
+    def __repr__(self):
+        return (f"BusEvent({self.direction.name}, addr=0x{self.address:02X}, cmd=0x{self.command:02X}, "
+                f"{self.outcome.name})")
+
+
+def format_time(timestamp_ns):
+    seconds, ns = divmod(timestamp_ns + WALL_CLOCK_OFFSET_NS, 1_000_000_000)
+    return time.strftime("%H:%M:%S", time.localtime(seconds)) + f".{ns // 1_000_000:03d}"
+
+
+# Number of lines format_event returns, known without formatting anything
+def line_count(event):
+    if event.outcome is Outcome.INFO:
+        return event.payload.count("\n") + 1
+    if event.direction is Direction.RX:
+        return 4 if event.outcome in (Outcome.UNSUPPORTED, Outcome.NAK) else 3
+    return 1 if event.outcome is Outcome.NAK else 2
+
+
+# Display lines of one event, the same text the log used to get as preformatted strings
+def format_event(event):
+    if event.outcome is Outcome.INFO:
+        return event.payload.split("\n")
+
+    timestamp = format_time(event.timestamp_ns)
+    if event.direction is Direction.RX:
+        lines = [
+            f"[{timestamp}]  Message: {event.payload.hex()}",
+            f"[{timestamp}] Control: 0x{event.payload[1]:02X}",
+            f"[{timestamp}]  Addr: 0x{event.address:02X}, Cmd: 0x{event.command:02X}"
+        ]
+        if event.outcome in (Outcome.UNSUPPORTED, Outcome.NAK):
+            lines.append(f"[{timestamp}]  Command: 0x{event.command:02X} (not supported)")
+        return lines
+
+    if event.outcome is Outcome.NAK:
+        return [f"[{timestamp}]  NAK sent: invalid command"]
+    try:
+        data = bytes(decode_frame(event.payload[1:-1])[HEADER_SIZE:])
+        if event.command == MSG_GET_LIGHT_VALUE_REQ:
+            light_raw, light_avg, light_last = LIGHT_VALUES.unpack(data)
+            return [
+                f"[{timestamp}] ✅ Light Value Response Sent",
+                f"[{timestamp}]  Raw: {light_raw}, Avg: {light_avg}, Last: {light_last}"
+            ]
+        if event.command == MSG_DEVICE_INFO_REQ:
+            dev_type, dev_id, fw, _, _ = DEVICE_INFO.unpack(data)
+            return [
+                f"[{timestamp}] ✅ Device Info Response Sent",
+                f"[{timestamp}]  Type: {dev_type}, ID: {dev_id}, FW: {fw}"
+            ]
+    except (MsspError, struct.error):
+        pass
+    name = COMMAND_NAMES.get(event.command, f"Cmd 0x{event.command:02X}")
+    return [f"[{timestamp}] ✅ {name} Response Sent", f"[{timestamp}]  Frame: {bytes(event.payload).hex()}"]
@@ -0,0 +1,51 @@
+"""
+Description: Cache of ready-to-send MSSP response frames. Answering a poll with an unchanged
+payload becomes a dictionary lookup instead of building, addressing and encoding the message again.
+That pays off for payloads that repeat: device info always, light values only while the sensor
+model is noiseless (--noise none). Noisy light values are encoded directly, they never repeat.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+
+
+class ResponseFrameCache:
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._frames = {}
+        self._version = None
+
+    # Return the cached frame for this key, building it only on the first request.
+    # The key should hold the command, the payload values and the ctrl byte.
+    # A new sensor snapshot version drops every frame built from the old values,
+    # None for payloads that do not depend on the sensor values at all.
+    def lookup(self, version, key, build):
+        if version != self._version:
+            self._frames.clear()
+            self._version = version
+
+        frame = self._frames.get(key)
+        if frame is not None:
+            self.hits += 1
+            return frame
+
+        # A light curve walks through many values, so keep the cache bounded
+        if len(self._frames) >= self.max_entries:
+            self._frames.clear()
+
+        frame = build()
+        self._frames[key] = frame
+        self.misses += 1
+        return frame
+
+    # Drop all frames, for example when the device identity changes
+    def invalidate(self):
+        self._frames.clear()
+        self._version = None
+
+    def __len__(self):
+        return len(self._frames)
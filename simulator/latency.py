@@ -0,0 +1,166 @@
+"""
+Description: Low-overhead, log-bucketed latency histograms for the MSSP responder. Measures the
+turnaround from frame received to response sent per command type. Only the comms thread writes,
+so recording takes no locks, and the GUI reads the counters for display and JSON export.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import json
+import time
+from .mssp_codec import COMMAND_NAMES
+
+
+# Every power of two is split into 8 sub-buckets, so a bucket is at most 12.5 % wide.
+# 64 powers of two cover anything a 64 bit ns counter can hold.
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+BUCKET_COUNT = 64 * SUB_BUCKETS
+
+# A response slower than this has most likely missed the LCU's response timeout
+LATE_RESPONSE_NS = 100_000_000
+
+
+def bucket_index(value_ns):
+    if value_ns < SUB_BUCKETS:
+        return max(value_ns, 0)
+    exponent = value_ns.bit_length() - 1
+    sub_bucket = (value_ns >> (exponent - SUB_BUCKET_BITS)) & (SUB_BUCKETS - 1)
+    return (exponent - SUB_BUCKET_BITS + 1) * SUB_BUCKETS + sub_bucket
+
+
+# Lowest and highest value (exclusive) that land in a bucket
+def bucket_bounds(index):
+    if index < SUB_BUCKETS:
+        return index, index + 1
+    exponent = index // SUB_BUCKETS + SUB_BUCKET_BITS - 1
+    width = 1 << (exponent - SUB_BUCKET_BITS)
+    lower = (SUB_BUCKETS + index % SUB_BUCKETS) * width
+    return lower, lower + width
+
+
+class LatencyHistogram:
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    # Hot path: one bucket increment and a few integer updates
+    def record(self, value_ns):
+        self.counts[bucket_index(value_ns)] += 1
+        self.count += 1
+        self.total_ns += value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+        if self.min_ns is None or value_ns < self.min_ns:
+            self.min_ns = value_ns
+
+    # Value below which `fraction` of the samples fall, taken as the middle of its bucket
+    def percentile(self, fraction, counts=None):
+        counts = counts or list(self.counts)
+        total = sum(counts)
+        if not total:
+            return 0
+        wanted = max(1, int(round(fraction * total)))
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= wanted:
+                lower, upper = bucket_bounds(index)
+                return min((lower + upper) // 2, self.max_ns)
+        return self.max_ns
+
+    # Plain tuple of the counters, to hand the histogram to another process
+    def state(self):
+        return list(self.counts), self.count, self.total_ns, self.min_ns, self.max_ns
+
+    @classmethod
+    def from_state(cls, state):
+        histogram = cls()
+        histogram.counts, histogram.count, histogram.total_ns, histogram.min_ns, histogram.max_ns = state
+        histogram.counts = list(histogram.counts)
+        return histogram
+
+    def to_dict(self):
+        counts = list(self.counts)  # One copy, so all numbers come from the same moment
+        count = sum(counts)
+        return {
+            "count": count,
+            "min_us": round((self.min_ns or 0) / 1000, 1),
+            "mean_us": round(self.total_ns / self.count / 1000, 1) if self.count else 0,
+            "p50_us": round(self.percentile(0.50, counts) / 1000, 1),
+            "p90_us": round(self.percentile(0.90, counts) / 1000, 1),
+            "p99_us": round(self.percentile(0.99, counts) / 1000, 1),
+            "p999_us": round(self.percentile(0.999, counts) / 1000, 1),
+            "max_us": round(self.max_ns / 1000, 1),
+            "buckets": [
+                [bucket_bounds(index)[0], bucket_bounds(index)[1], bucket_count]
+                for index, bucket_count in enumerate(counts) if bucket_count
+            ]
+        }
+
+
+class LatencyRecorder:
+    """One histogram per MSSP command byte."""
+
+    def __init__(self):
+        self.histograms = {}
+        self.late = 0  # Responses slower than LATE_RESPONSE_NS
+
+    def record(self, command, value_ns):
+        histogram = self.histograms.get(command)
+        if histogram is None:
+            histogram = self.histograms[command] = LatencyHistogram()
+        histogram.record(value_ns)
+        if value_ns > LATE_RESPONSE_NS:
+            self.late += 1
+
+    def reset(self):
+        self.histograms = {}
+        self.late = 0
+
+    # Number of responses and their summed turnaround over every command
+    def totals(self):
+        histograms = list(self.histograms.values())
+        return sum(histogram.count for histogram in histograms), sum(histogram.total_ns for histogram in histograms)
+
+    # Every histogram as plain data, the responder process sends this to the GUI
+    def state(self):
+        return {command: histogram.state() for command, histogram in dict(self.histograms).items()}
+
+    # Replace the histograms with ones received from the responder process
+    def load_state(self, state):
+        self.histograms = {command: LatencyHistogram.from_state(data) for command, data in state.items()}
+
+    # Short text per command for the status panel
+    def summary_lines(self):
+        lines = []
+        for command, histogram in sorted(dict(self.histograms).items()):
+            data = histogram.to_dict()
+            name = COMMAND_NAMES.get(command, f"Cmd 0x{command:02X}")
+            lines.append(
+                f"{name}: n={data['count']}  p50={data['p50_us'] / 1000:.2f} ms  "
+                f"p99={data['p99_us'] / 1000:.2f} ms  max={data['max_us'] / 1000:.2f} ms"
+            )
+        return lines
+
+    def to_dict(self):
+        return {
+            "exported_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "unit_bucket_bounds": "ns",
+            "commands": {
+                f"0x{command:02X}": dict(histogram.to_dict(), name=COMMAND_NAMES.get(command, "Unknown"))
+                for command, histogram in sorted(dict(self.histograms).items())
+            }
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def export(self, path):
+        with open(path, "w") as f:
+            f.write(self.to_json())
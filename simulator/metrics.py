@@ -0,0 +1,36 @@
+"""
+Description: Health counters of a running MSSP responder. The comms thread only bumps a few
+integers and stores the arrival time of the last poll per address; whoever wants rates takes
+a BusMetrics snapshot now and then and compares it with the previous one.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+from collections import namedtuple
+
+
+# Counters since the session started. Times are perf_counter_ns(), last_poll_ns maps every
+# address the LCU polled to its last poll. timeouts are requests the LCU got no answer for in
+# time: unanswered requests to our sensors plus responses later than LATE_RESPONSE_NS. Unknown
+# commands the policy does not answer (ignore, log) are counted as ignored, not as timeouts.
+BusMetrics = namedtuple("BusMetrics", [
+    "taken_ns", "frames_received", "responses_sent", "errors", "crc_errors", "timeouts", "ignored",
+    "latency_count", "latency_total_ns", "last_poll_ns"
+])
+
+# Rates and ages between two snapshots, latency_ms is the mean turnaround in that interval
+BusRates = namedtuple("BusRates", ["frames_per_s", "responses_per_s", "latency_ms", "poll_age_s"])
+
+
+def bus_rates(previous, current):
+    elapsed_s = (current.taken_ns - previous.taken_ns) / 1e9 if previous else 0
+    frames_per_s = (current.frames_received - previous.frames_received) / elapsed_s if elapsed_s else 0
+    responses_per_s = (current.responses_sent - previous.responses_sent) / elapsed_s if elapsed_s else 0
+    count = current.latency_count - (previous.latency_count if previous else 0)
+    total_ns = current.latency_total_ns - (previous.latency_total_ns if previous else 0)
+    latency_ms = total_ns / count / 1e6 if count else None
+    poll_age_s = {
+        address: (current.taken_ns - polled_ns) / 1e9 for address, polled_ns in sorted(current.last_poll_ns.items())
+    }
+    return BusRates(frames_per_s, responses_per_s, latency_ms, poll_age_s)
@@ -0,0 +1,304 @@
+"""
+Description: Built-in MSSP (Multi Slave Serial Protocol) codec and serial port wrapper.
+Handles COBS framing, the CRC16-CCITT checksum and the VER/CTRL/ADDR/CMD header as described
+in the MSSP Protocol Specification, and decodes frames incrementally from a reusable receive buffer.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import struct
+from collections import deque
+from .capture import DIRECTION_RX, DIRECTION_TX, NO_COMMAND
+
+
+# See Table 5. Explanation of the frame structure of MSSP spec
+PROTOCOL_VERSION = 0x01
+MASTER_BIT = 0x40          # Bit 6 of CTRL, set when master sent the message
+COUNTER_MASK = 0x0F        # Bits 3-0 of CTRL, message counter 1..15
+FRAME_DELIMITER = 0x00
+
+# See Table 7. Slave / slave group address definitions
+LIGHT_SENSOR_ADDRESS = 0x7D
+UNSET_ADDRESS = 0xFE
+BROADCAST_ADDRESS = 0xFF
+
+# See chapter 5. Commands, the response uses the same command byte as the request
+MSG_DEVICE_INFO_REQ = 0x00
+MSG_GET_LIGHT_VALUE_REQ = 0x0A
+MSG_GET_SINGLE_PARAM_REQ = 0x0C
+
+COMMAND_NAMES = {
+    MSG_DEVICE_INFO_REQ: "Device info",
+    MSG_GET_LIGHT_VALUE_REQ: "Light value",
+    MSG_GET_SINGLE_PARAM_REQ: "Single param"
+}
+
+# See chapter 6. Results, used as data of a negative response
+MSSP_OK = 0x00
+MSSP_INVALID_COMMAND = 0x02
+MSSP_NOT_IMPLEMENTED = 0x08
+
+HEADER_SIZE = 4            # VER, CTRL, ADDR, CMD
+CRC_SIZE = 2
+MAX_FRAME_SIZE = 512       # Anything longer is line noise, MSSP messages are small
+
+
+class MsspError(Exception):
+    pass
+
+
+class MsspCrcError(MsspError):
+    pass
+
+
+# CRC16-CCITT, polynomial 0x1021, initial value 0xFFFF, no reflection and no final XOR
+def _build_crc_table():
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return tuple(table)
+
+
+_CRC_TABLE = _build_crc_table()
+
+
+def crc16_ccitt(data, crc=0xFFFF):
+    table = _CRC_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+    return crc
+
+
+# COBS encoding, see chapter 3.1.1 and the examples in Table 4 of the MSSP spec
+def cobs_encode(data):
+    out = bytearray()
+    chunks = bytes(data).split(b"\x00")
+    last = len(chunks) - 1
+    for index, chunk in enumerate(chunks):
+        while len(chunk) >= 0xFE:
+            out.append(0xFF)
+            out += chunk[:0xFE]
+            chunk = chunk[0xFE:]
+            # A full block at the very end needs no extra overhead byte
+            if not chunk and index == last:
+                return bytes(out)
+        out.append(len(chunk) + 1)
+        out += chunk
+    return bytes(out)
+
+
+# COBS decoding. Every run between two code bytes is copied as one slice,
+# so decoding from a memoryview never copies byte by byte.
+def cobs_decode(encoded):
+    out = bytearray()
+    length = len(encoded)
+    index = 0
+    while index < length:
+        code = encoded[index]
+        end = index + code
+        if code == 0 or end > length:
+            raise MsspError("Invalid COBS data")
+        out += encoded[index + 1:end]
+        index = end
+        if code < 0xFF and index < length:
+            out.append(0)
+    return out
+
+
+class MsspMessage(bytearray):
+    """Decoded MSSP message: VER, CTRL, ADDR, CMD followed by the data bytes (CRC stripped)."""
+
+    @classmethod
+    def create(cls, cmd, data=b"", addr=LIGHT_SENSOR_ADDRESS, ctrl=0x01):
+        message = cls((PROTOCOL_VERSION, ctrl, addr, cmd))
+        message += data
+        return message
+
+    def get_ctrl(self):
+        return self[1]
+
+    def set_ctrl(self, ctrl):
+        self[1] = ctrl
+
+    def get_addr(self):
+        return self[2]
+
+    def set_addr(self, addr):
+        self[2] = addr
+
+    def get_cmd(self):
+        return self[3]
+
+    def get_data(self):
+        return bytes(self[HEADER_SIZE:])
+
+    def is_from_master(self):
+        return bool(self[1] & MASTER_BIT)
+
+    # Add the CRC, COBS encode and wrap into 0x00 delimiters, ready for the wire
+    def encode(self):
+        crc = crc16_ccitt(memoryview(self)[1:])
+        body = cobs_encode(bytes(self) + struct.pack("<H", crc))
+        return b"\x00" + body + b"\x00"
+
+
+# Decode the COBS encoded contents of a single frame (without delimiters)
+def decode_frame(encoded):
+    decoded = cobs_decode(encoded)
+    if len(decoded) < HEADER_SIZE + CRC_SIZE:
+        raise MsspError("Frame too short")
+    body = memoryview(decoded)[:-CRC_SIZE]
+    (received_crc,) = struct.unpack_from("<H", decoded, len(decoded) - CRC_SIZE)
+    if crc16_ccitt(body[1:]) != received_crc:
+        raise MsspCrcError("CRC mismatch")
+    body.release()
+    del decoded[-CRC_SIZE:]
+    return MsspMessage(decoded)
+
+
+class FrameDecoder:
+    """Incremental frame decoder. Feed it whatever the serial port returned,
+    it keeps partial frames between calls and returns every complete message."""
+
+    def __init__(self, max_frame_size=MAX_FRAME_SIZE, keep_raw=False):
+        self.max_frame_size = max_frame_size
+        # With keep_raw every message also gets .raw, the delimited frame as it was on the wire
+        self.keep_raw = keep_raw
+        self.crc_errors = 0
+        self.framing_errors = 0
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        buffer = self._buffer
+        buffer += data
+        messages = []
+        start = 0
+        view = memoryview(buffer)
+        try:
+            while True:
+                end = buffer.find(FRAME_DELIMITER, start)
+                if end < 0:
+                    break
+                # Back to back delimiters (end of one frame, start of next) are empty frames
+                if end > start:
+                    try:
+                        message = decode_frame(view[start:end])
+                        if self.keep_raw:
+                            message.raw = b"".join((b"\x00", view[start:end], b"\x00"))
+                        messages.append(message)
+                    except MsspCrcError:
+                        self.crc_errors += 1
+                    except MsspError:
+                        self.framing_errors += 1
+                start = end + 1
+        finally:
+            view.release()
+
+        # Drop what has been consumed with one move instead of per frame
+        if start:
+            del buffer[:start]
+        # A frame without end delimiter that keeps growing is garbage
+        if len(buffer) > self.max_frame_size:
+            self.framing_errors += 1
+            buffer.clear()
+        return messages
+
+    def reset(self):
+        self._buffer.clear()
+
+
+# Payload builders for the responses of chapter 4
+def _uint16(value):
+    return min(max(int(value), 0), 0xFFFF)
+
+
+def create_msg_get_light_value_resp(light_raw, light_avg, light_last):
+    data = struct.pack("<HHH", _uint16(light_raw), _uint16(light_avg), _uint16(light_last))
+    return MsspMessage.create(MSG_GET_LIGHT_VALUE_REQ, data)
+
+
+def create_msg_device_info_resp(dev_type, dev_id, fw, addr, group):
+    data = struct.pack("<IIIBB", dev_type, dev_id, fw, addr, group)
+    return MsspMessage.create(MSG_DEVICE_INFO_REQ, data, addr=addr)
+
+
+# Negative response: same command byte with only a result code as data
+def create_msg_result_resp(command, result, addr=LIGHT_SENSOR_ADDRESS):
+    return MsspMessage.create(command, bytes((result,)), addr=addr)
+
+
+class MsspPort:
+    """Serial port speaking MSSP. Offers the same calls we used from the tw_mssp library
+    (get_msg, send_msg, create_msg_*) plus read_messages for reading several frames at once."""
+
+    MASTER_BIT = MASTER_BIT
+    LIGHT_SENSOR_ADDRESS = LIGHT_SENSOR_ADDRESS
+    MSG_DEVICE_INFO_REQ = MSG_DEVICE_INFO_REQ
+    MSG_GET_LIGHT_VALUE_REQ = MSG_GET_LIGHT_VALUE_REQ
+    MSG_GET_SINGLE_PARAM_REQ = MSG_GET_SINGLE_PARAM_REQ
+
+    create_msg_get_light_value_resp = staticmethod(create_msg_get_light_value_resp)
+    create_msg_device_info_resp = staticmethod(create_msg_device_info_resp)
+    create_msg_result_resp = staticmethod(create_msg_result_resp)
+
+    def __init__(self, port, baud_rate=9600, timeout=5, rs485=True, rx_buffer_size=4096):
+        # pyserial is imported here so the codec itself works without it
+        import serial
+
+        # serial_for_url also accepts pty paths and socket:// URLs
+        self.serial = serial.serial_for_url(port, baudrate=baud_rate, timeout=timeout)
+        if rs485:
+            try:
+                from serial.rs485 import RS485Settings
+                self.serial.rs485_mode = RS485Settings()
+            except (AttributeError, ValueError, NotImplementedError, OSError):
+                pass  # Adapters with automatic direction control work without it
+
+        self.decoder = FrameDecoder()
+        self.capture = None
+        self._rx_buffer = bytearray(rx_buffer_size)
+        self._rx_view = memoryview(self._rx_buffer)
+        self._pending = deque()
+
+    # Record every received and sent frame to a CaptureWriter, None switches recording off
+    def set_capture(self, capture):
+        self.capture = capture
+        self.decoder.keep_raw = capture is not None
+
+    # Block until at least one byte arrives (or timeout), then take everything waiting
+    # in the driver in the same call and return all complete messages.
+    def read_messages(self):
+        count = self.serial.readinto(self._rx_view[:1])
+        if not count:
+            return []
+        waiting = min(self.serial.in_waiting, len(self._rx_buffer) - 1)
+        if waiting:
+            count += self.serial.readinto(self._rx_view[1:1 + waiting])
+        messages = self.decoder.feed(self._rx_view[:count])
+        if self.capture is not None:
+            for message in messages:
+                self.capture.record(DIRECTION_RX, message.raw, message.get_cmd())
+        return messages
+
+    # One message at a time like tw_mssp, None on timeout
+    def get_msg(self):
+        if not self._pending:
+            self._pending.extend(self.read_messages())
+        return self._pending.popleft() if self._pending else None
+
+    def send_msg(self, message):
+        self.send_frame(message.encode(), message.get_cmd())
+
+    # Send an already encoded frame, for example from the response frame cache
+    def send_frame(self, frame, command=NO_COMMAND):
+        self.serial.write(frame)
+        if self.capture is not None:
+            self.capture.record(DIRECTION_TX, frame, command)
+
+    def close(self):
+        self.serial.close()
+        self._rx_view.release()
@@ -0,0 +1,207 @@
+"""
+Description: Runs the MSSP responder in its own process, so nothing the GUI does (fades, pixmap
+scaling, log appends) can hold the GIL while the LCU waits for an answer. The sensor values are
+shared through a shared_memory block, the responder's events and errors come back through a
+lock-free event ring and the periodic latency and health snapshots through a second one, so each
+ring keeps exactly one producer thread. Only rare control messages (curves, stop) use a pipe.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import marshal
+import multiprocessing
+import os
+import threading
+from .event_ring import EventRing
+from .events import BusEvent
+from .latency import LatencyRecorder
+from .metrics import BusMetrics
+from .shared_state import SharedSensorState, SharedSensorView
+
+
+EVENT_BUS = "bus"           # BusEvent.to_tuple()
+EVENT_ERROR = "error"       # message
+EVENT_LATENCY = "latency"   # LatencyRecorder.state()
+EVENT_METRICS = "metrics"   # MsspResponder.metrics() as a plain tuple
+
+LATENCY_INTERVAL_S = 0.5
+STATUS_RING_CAPACITY = 1 << 18  # Snapshots only, a few per second
+STOP_TIMEOUT_S = 7          # The responder notices stop at the latest after the 5 s port read timeout
+
+
+# Real-time scheduling needs CAP_SYS_NICE (or admin rights), a higher priority is the next best thing
+def raise_priority():
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(10))
+        return "SCHED_FIFO"
+    except (AttributeError, OSError):
+        pass
+    try:
+        os.nice(-10)
+        return "nice -10"
+    except (AttributeError, OSError):
+        return None
+
+
+# Entry point of the responder process
+def responder_main(com_port, baud_rate, unknown_command_policy, capture_path, noise_seed, state_name,
+                   ring_name, status_ring_name, control):
+    from .responder import MsspResponder
+
+    # The rings are single producer: this (the comms) thread writes ring, the control thread status_ring
+    ring = EventRing(ring_name)
+    status_ring = EventRing(status_ring_name, STATUS_RING_CAPACITY)
+    view = SharedSensorView(state_name)
+
+    def push(event):
+        ring.push(marshal.dumps(event))
+
+    responder = MsspResponder(
+        com_port, baud_rate, unknown_command_policy,
+        on_event=lambda event: push((EVENT_BUS, event.to_tuple())),
+        on_error=lambda message: push((EVENT_ERROR, message))
+    )
+    responder.capture_path = capture_path
+    if noise_seed is not None:
+        responder.devices.set_noise(seed=noise_seed)
+    for device in responder.devices:
+        device.state = view
+
+    priority = raise_priority()
+    info = BusEvent.info(f" Responder process {os.getpid()}, scheduling: {priority or 'normal priority'}")
+    push((EVENT_BUS, info.to_tuple()))
+
+    def push_status(event):
+        status_ring.push(marshal.dumps(event))
+
+    control_thread = threading.Thread(target=serve_control, args=(responder, view, control, push_status), daemon=True)
+    control_thread.start()
+    try:
+        responder.run()
+    finally:
+        # Final snapshots go through the event ring, which is drained after the status ring
+        push((EVENT_LATENCY, responder.latency.state()))
+        push((EVENT_METRICS, tuple(responder.metrics())))
+        view.close()
+        ring.close()
+
+
+# Control pipe of the responder process: curves, stop, and the latency histograms and health
+# counters every half second
+def serve_control(responder, view, control, push):
+    last_count = 0
+    while True:
+        try:
+            if control.poll(LATENCY_INTERVAL_S):
+                message = control.recv()
+                if message[0] == "curves":
+                    view.add_curves(message[1], message[2])
+                elif message[0] == "stop":
+                    responder.stop()
+                    return
+        except (EOFError, OSError):
+            # The GUI went away, no one is left to answer for
+            responder.stop()
+            return
+
+        count = sum(histogram.count for histogram in list(responder.latency.histograms.values()))
+        if count != last_count:
+            last_count = count
+            push((EVENT_LATENCY, responder.latency.state()))
+        push((EVENT_METRICS, tuple(responder.metrics())))
+
+
+class ResponderProcess:
+    """GUI side of the responder process. Only one thread may use it."""
+
+    def __init__(self, com_port="COM7", baud_rate=9600, unknown_command_policy="log"):
+        self.com_port = com_port
+        self.baud_rate = baud_rate
+        self.unknown_command_policy = unknown_command_policy
+        self.capture_path = None
+        self.noise_seed = None  # None picks a random seed in the process
+        self.latency = LatencyRecorder()  # Mirror of the responder's histograms, refreshed by events()
+        self.bus_metrics = None  # Latest health counters of the responder, refreshed by events()
+        # spawn, never fork a process that has Qt running
+        self.context = multiprocessing.get_context("spawn")
+        self.control, self.child_control = self.context.Pipe()
+        self.state = SharedSensorState()
+        self.state.send_curves = lambda version, curves: self.control.send(("curves", version, curves))
+        self.ring = EventRing()
+        self.status_ring = EventRing(capacity=STATUS_RING_CAPACITY)
+        self.corrupt_records = 0  # Records events() could not decode and skipped
+        self.process = None
+        self.stopped = False
+
+    def start(self):
+        self.process = self.context.Process(
+            target=responder_main, name="mssp-responder", daemon=True,
+            args=(self.com_port, self.baud_rate, self.unknown_command_policy, self.capture_path,
+                  self.noise_seed, self.state.name, self.ring.name, self.status_ring.name, self.child_control)
+        )
+        self.process.start()
+
+    # Same as MsspResponder.update_sensor_values, all emulated sensors share the values
+    def update_sensor_values(self, light, temp, voltage, address=None, curves=None):
+        if address is not None:
+            raise ValueError("The responder process only supports the same values for every sensor")
+        return self.state.publish(light, temp, voltage, curves)
+
+    def is_alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    # BusEvents and error texts since the last call, latency and health updates are applied here.
+    # A record that cannot be decoded is skipped and counted, it must never break the GUI's timer.
+    def events(self):
+        events = []
+        for record in self.status_ring.drain() + self.ring.drain():
+            try:
+                kind, data = marshal.loads(record)
+                if kind == EVENT_BUS:
+                    events.append(BusEvent.from_tuple(data))
+                elif kind == EVENT_LATENCY:
+                    self.latency.load_state(data)
+                elif kind == EVENT_METRICS:
+                    self.bus_metrics = BusMetrics(*data)
+                elif kind == EVENT_ERROR:
+                    events.append(str(data))
+                else:
+                    raise ValueError(f"Unknown event kind {kind!r}")
+            except (EOFError, ValueError, TypeError, KeyError, IndexError):
+                self.corrupt_records += 1
+        return events
+
+    # Empty the rings without handing out their BusEvents, for when the GUI clears its output.
+    # Latency and health updates are still applied and error texts are still returned.
+    def discard_events(self):
+        return [event for event in self.events() if isinstance(event, str)]
+
+    def metrics(self):
+        return self.bus_metrics
+
+    @property
+    def dropped_events(self):
+        return self.ring.dropped
+
+    # Stop the process and release the shared memory, returns the events it sent on the way out
+    def stop(self):
+        if self.stopped:
+            return []
+        self.stopped = True
+        if self.process is not None:
+            try:
+                self.control.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(STOP_TIMEOUT_S)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        events = self.events()
+        self.control.close()
+        self.state.close()
+        for ring in (self.ring, self.status_ring):
+            ring.close()
+            ring.unlink()
+        return events
@@ -0,0 +1,152 @@
+"""
+Description: Replays recorded LCU requests from a bus capture through the responder's dispatch
+path, in real time, N times faster or as fast as possible, and reports the responses and the
+processing time of every frame. Lets us reproduce field issues without an LCU on the port.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import argparse
+import time
+from collections import namedtuple
+from .capture import CaptureReader, DIRECTION_RX, NO_COMMAND
+from .mssp_codec import MsspPort, MsspError, FrameDecoder, decode_frame
+from .responder import MsspResponder
+
+
+ReplayResult = namedtuple("ReplayResult", ["timestamp_ns", "request", "responses", "processing_ns"])
+
+
+class ReplayPort(MsspPort):
+    """Stands in for the serial port during a replay and collects the responses instead of sending them."""
+
+    def __init__(self):
+        self.decoder = FrameDecoder()
+        self.capture = None
+        self.sent = []
+
+    def read_messages(self):
+        return []
+
+    def send_frame(self, frame, command=NO_COMMAND):
+        self.sent.append(bytes(frame))
+
+    def close(self):
+        pass
+
+
+class ReplayEngine:
+
+    # handle_message is the responder's per message entry point, port the ReplayPort it sends through.
+    # speed 1.0 replays in real time, 10.0 ten times faster, 0 or None as fast as possible.
+    def __init__(self, reader, handle_message, port, speed=1.0):
+        self.reader = reader
+        self.handle_message = handle_message
+        self.port = port
+        self.speed = speed
+        self.results = []
+        self.decode_errors = 0
+        self.elapsed_ns = 0
+        self.running = False
+
+    def run(self, on_result=None):
+        self.running = True
+        self.results = []
+        first_capture_ns = None
+        start_ns = time.perf_counter_ns()
+
+        for record in self.reader.between(direction=DIRECTION_RX):
+            if not self.running:
+                break
+            try:
+                # Captured frames still carry their 0x00 delimiters
+                request = decode_frame(record.data[1:-1])
+            except MsspError:
+                self.decode_errors += 1
+                continue
+
+            # Keep the original spacing between requests, scaled by the replay speed
+            if self.speed:
+                if first_capture_ns is None:
+                    first_capture_ns = record.timestamp_ns
+                due_ns = start_ns + (record.timestamp_ns - first_capture_ns) / self.speed
+                delay_ns = due_ns - time.perf_counter_ns()
+                if delay_ns > 0:
+                    time.sleep(delay_ns / 1e9)
+
+            sent_before = len(self.port.sent)
+            begin_ns = time.perf_counter_ns()
+            self.handle_message(request)
+            processing_ns = time.perf_counter_ns() - begin_ns
+
+            result = ReplayResult(record.timestamp_ns, request, self.port.sent[sent_before:], processing_ns)
+            self.results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+        self.elapsed_ns = time.perf_counter_ns() - start_ns
+        self.running = False
+        return self.summary()
+
+    def stop(self):
+        self.running = False
+
+    # Counts and per frame processing time percentiles of the last run, times in microseconds
+    def summary(self):
+        times = sorted(result.processing_ns for result in self.results)
+        count = len(times)
+        elapsed_s = self.elapsed_ns / 1e9 if count else 0
+
+        def percentile(fraction):
+            return times[min(int(fraction * count), count - 1)] / 1000 if count else 0
+
+        return {
+            "requests": count,
+            "responses": sum(len(result.responses) for result in self.results),
+            "unanswered": sum(1 for result in self.results if not result.responses),
+            "decode_errors": self.decode_errors,
+            "elapsed_s": round(elapsed_s, 3),
+            "requests_per_s": round(count / elapsed_s, 1) if elapsed_s else 0,
+            "processing_us": {
+                "min": percentile(0),
+                "p50": percentile(0.50),
+                "p99": percentile(0.99),
+                "max": percentile(1),
+                "mean": round(sum(times) / count / 1000, 1) if count else 0
+            }
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded RS485 capture through the MSSP responder")
+    parser.add_argument("capture", help="Capture file written by the simulator (.cap)")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = real time, 10 = ten times faster, 0 = as fast as possible")
+    parser.add_argument("--light", type=float, default=100, help="Light value the responder answers with")
+    parser.add_argument("--verbose", action="store_true", help="Print every request and its response")
+    args = parser.parse_args()
+
+    responder = MsspResponder("replay")
+    port = ReplayPort()
+    responder.attach_port(port)
+    responder.update_sensor_values(args.light, 25, 5)
+
+    def print_result(result):
+        responses = " ".join(frame.hex() for frame in result.responses) or "-"
+        print(f"{result.timestamp_ns} {result.request.hex()} -> {responses} ({result.processing_ns / 1000:.1f} us)")
+
+    reader = CaptureReader(args.capture)
+    engine = ReplayEngine(reader, responder.process_message, port, args.speed)
+    try:
+        summary = engine.run(print_result if args.verbose else None)
+    finally:
+        reader.close()
+
+    processing = summary.pop("processing_us")
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    print("processing_us: " + ", ".join(f"{key}={value}" for key, value in processing.items()))
+
+
+if __name__ == "__main__":
+    main()
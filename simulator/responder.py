@@ -0,0 +1,306 @@
+"""
+Description: Qt-free MSSP responder that answers the LCU on behalf of the emulated TSA0002 sensors.
+Reads requests from the port, dispatches them through the command table and reports what it did
+through plain callbacks, so the GUI, the headless CLI and the benchmark tools all share it.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import time
+from .devices import DeviceTable
+from .sensor_model import DEFAULT_SAMPLES
+from .dispatch import CommandRegistry, UnknownCommandPolicy, build_dispatcher
+from .mssp_codec import MSG_DEVICE_INFO_REQ, MSG_GET_LIGHT_VALUE_REQ, MSSP_INVALID_COMMAND
+from .capture import CaptureWriter
+from .events import BusEvent, Direction, Outcome
+from .latency import LatencyRecorder
+from .metrics import BusMetrics
+from .startup import startup_timer
+
+
+class MsspResponder:
+
+    # on_event(BusEvent) and on_error(message) are called from the thread that runs the responder,
+    # the GUI turns them into Qt signals
+    def __init__(self, com_port="COM7", baud_rate=9600, unknown_command_policy=UnknownCommandPolicy.LOG,
+                 on_event=None, on_error=None):
+        self.com_port = com_port
+        self.baud_rate = baud_rate
+        self.on_event = on_event
+        self.on_error = on_error
+        self.mssp = None
+        self.running = False
+        self.devices = DeviceTable.single()  # Emulated sensors, looked up by the address byte
+        self.ignored_frames = 0  # Requests for addresses none of our sensors own
+        # Health counters, only the comms thread writes them, metrics() reads them
+        self.frames_received = 0
+        self.responses_sent = 0
+        self.unanswered = 0  # Requests to our sensors that should have got a response but did not
+        self.ignored_commands = 0  # Unknown commands the policy deliberately leaves unanswered
+        self.errors = 0
+        self.last_poll_ns = [0] * 256  # perf_counter_ns() of the last request per address byte
+        self.log_sink = None  # When set, events are batched instead of reported one by one
+        self.capture_path = None  # When set, all bus traffic is recorded to this capture file
+        self.capture = None
+        self.latency = LatencyRecorder()  # Frame received to response sent, per command
+
+        # Command byte -> handler table, built once here instead of an if/elif chain in the loop
+        self.dispatcher = build_dispatcher(
+            self, self.builtin_commands(), self.handle_unknown_command, unknown_command_policy
+        )
+
+    # Initialize the MSSP communication
+    def initialize_mssp(self):
+
+        try:
+            from .mssp_codec import MsspPort
+            self.attach_port(MsspPort(self.com_port, self.baud_rate, 5, True))
+            startup_timer.mark("port_open")
+            return True
+
+        except Exception as e:
+            self.report_error(f"Failed to initialize MSSP: {str(e)}")
+            return False
+
+    # Commands every responder answers, plugins add more through simulator.dispatch.register_command
+    def builtin_commands(self):
+        registry = CommandRegistry()
+        registry.register(MSG_GET_LIGHT_VALUE_REQ, self.handle_light_value_request)
+        registry.register(MSG_DEVICE_INFO_REQ, self.handle_device_info_request)
+        return registry
+
+    # Use an already opened port, for example the ReplayPort when replaying a capture
+    def attach_port(self, port):
+        self.mssp = port
+        self.MASTER_BIT = port.MASTER_BIT
+
+    # Update sensor values that will be sent to LCU, for every emulated sensor or only the one at `address`.
+    # This is safe to call while the responder is running, the next poll answers with the new snapshot.
+    # curves (a CurveSet) makes the values follow a dynamic scenario from now on.
+    def update_sensor_values(self, light, temp, voltage, address=None, curves=None):
+        return self.devices.publish(light, temp, voltage, address, curves)
+
+    # Hand an event over, batched through the log sink when there is one
+    def post_event(self, event):
+        if self.log_sink is not None:
+            self.log_sink.post(event)
+        elif self.on_event is not None:
+            self.on_event(event)
+
+    # True when someone listens, otherwise no event records are built at all
+    def has_listener(self):
+        return self.log_sink is not None or self.on_event is not None
+
+    def report_error(self, message):
+        self.errors += 1
+        if self.on_error is not None:
+            self.on_error(message)
+
+    # Main communication loop, blocks until stop() is called from another thread
+    def run(self):
+
+        if not self.initialize_mssp():
+            return
+
+        self.running = True
+        self.post_event(BusEvent.info(f" MSSP Communication Started\nListening on {self.com_port} at {self.baud_rate} baud"))
+        self.start_capture()
+
+        try:
+            while self.running:
+                try:
+                    # Get every message from LCU that arrived in one read
+                    # (this will block until data received or timeout)
+                    messages = self.mssp.read_messages()
+                    received_ns = time.perf_counter_ns()
+                    for msg in messages:
+                        self.process_message(msg, received_ns)
+
+                except Exception as e:
+                    if self.running:  # Only show error if we're still supposed to be running
+                        self.report_error(f"Communication error: {str(e)}")
+                        time.sleep(1)  # Wait before retrying
+        finally:
+            self.mssp.close()
+            self.stop_capture()
+
+    # Record the bus traffic, the writer thread does all disk I/O and creates the file with the first frame
+    def start_capture(self):
+        if not self.capture_path:
+            return
+        self.capture = CaptureWriter(self.capture_path)
+        self.mssp.set_capture(self.capture)
+        self.post_event(BusEvent.info(f" Capturing bus traffic to {self.capture_path}"))
+
+    # Close the capture file, and say so when frames could not be recorded
+    def stop_capture(self):
+        capture, self.capture = self.capture, None
+        if capture is None:
+            return
+        capture.close()
+        if capture.error is not None:
+            self.report_error(f"Could not write capture file: {capture.error}")
+        elif capture.dropped:
+            self.post_event(BusEvent.info(f" Capture size limit reached, {capture.dropped} frames were not recorded"))
+
+    # Process one decoded message from the LCU, received_ns is the perf_counter_ns() of its arrival
+    def process_message(self, msg, received_ns=None):
+        if received_ns is None:
+            received_ns = time.perf_counter_ns()
+
+        # Check if we got a valid message
+        if msg is None or len(msg) < 4:
+            return
+
+        # Only answer requests, our own responses may echo back on the RS485 bus
+        ctrl = msg.get_ctrl()
+        if not ctrl & self.MASTER_BIT:
+            return
+
+        # Extract command and address
+        addr = msg[2]
+        cmd = msg[3]
+        self.frames_received += 1
+        self.last_poll_ns[addr] = received_ns
+
+        # Requests to other slaves on the bus are none of our business
+        device = self.devices.lookup(addr)
+        if device is None:
+            self.ignored_frames += 1
+            return
+
+        # Handlers return (Outcome, frame they sent or None), None means the request should not
+        # show up in the log at all. Only the records are built here, the text when it is shown.
+        # An unsupported command without a frame was left unanswered on purpose, that is no timeout.
+        result = self.dispatcher.dispatch(cmd, device, msg, ctrl, received_ns)
+        if result is None:
+            self.ignored_commands += 1
+            return
+
+        outcome, frame = result
+        if frame is not None:
+            self.responses_sent += 1
+        elif outcome is Outcome.UNSUPPORTED:
+            self.ignored_commands += 1
+        else:
+            self.unanswered += 1
+        if not self.has_listener():
+            return
+
+        self.post_event(BusEvent(received_ns, Direction.RX, addr, cmd, msg, outcome))
+        if frame is not None:
+            self.post_event(BusEvent(time.perf_counter_ns(), Direction.TX, device.address, cmd, frame, outcome))
+
+    # Handle specific requests from LCU
+    def handle_light_value_request(self, device, msg, ctrl, received_ns):
+
+        try:
+            # Read the snapshot only once, the light value is what the sensor would see right now
+            snapshot = device.state.current()
+            light = snapshot.light
+            if snapshot.curves is not None:
+                light = snapshot.curves.light_at(time.monotonic_ns() - snapshot.started_ns)
+
+            # Every poll is one measurement, the LCU asks for the average of its last n samples
+            samples = msg[4] if len(msg) > 4 else DEFAULT_SAMPLES
+            light_raw, light_avg, light_last = device.model.read(light, samples)
+
+            # Create response message based on RespExample.py. Without noise the values repeat and
+            # the frame already built is reused, noisy values differ on every poll and a cache
+            # lookup would only ever miss.
+            ctrl = ctrl & ~self.MASTER_BIT  # Flip bit 6, keep rest of mask same
+            if device.model.noiseless:
+                frame = device.frames.lookup(
+                    snapshot.version,
+                    (self.mssp.MSG_GET_LIGHT_VALUE_REQ, light_raw, light_avg, light_last, ctrl),
+                    lambda: self.build_light_value_response(device.address, light_raw, light_avg, light_last, ctrl)
+                )
+            else:
+                frame = self.build_light_value_response(device.address, light_raw, light_avg, light_last, ctrl)
+
+            # Send response
+            self.mssp.send_frame(frame, self.mssp.MSG_GET_LIGHT_VALUE_REQ)
+            self.latency.record(self.mssp.MSG_GET_LIGHT_VALUE_REQ, time.perf_counter_ns() - received_ns)
+            return Outcome.RESPONDED, frame
+
+        except Exception as e:
+            self.report_error(f"Error handling light request: {str(e)}")
+            return Outcome.FAILED, None
+
+    # Handle device info request from LCU based on RespExample.py
+    def handle_device_info_request(self, device, msg, ctrl, received_ns):
+
+        try:
+            # Device info of this emulated TSA0002 sensor (defaults from RespExample.py)
+            devType = device.dev_type  # 0x00001000 Light sensor – TSA0002x (LSB format)
+            devId = device.dev_id
+            fw = device.firmware
+            addr = device.address
+            group = device.group  # 0xFE by default
+
+            # Create response message (reference from RespExample.py), or reuse the one already built.
+            # The key holds the whole identity, so new sensor values do not throw these frames away.
+            ctrl = ctrl & ~self.MASTER_BIT  # Flip bit 6, keep rest of mask same
+            frame = device.info_frames.lookup(
+                None,
+                (self.mssp.MSG_DEVICE_INFO_REQ, devType, devId, fw, addr, group, ctrl),
+                lambda: self.build_device_info_response(devType, devId, fw, addr, group, ctrl)
+            )
+
+            # Send response
+            self.mssp.send_frame(frame, self.mssp.MSG_DEVICE_INFO_REQ)
+            self.latency.record(self.mssp.MSG_DEVICE_INFO_REQ, time.perf_counter_ns() - received_ns)
+            return Outcome.RESPONDED, frame
+
+        except Exception as e:
+            self.report_error(f"Error handling device info request: {str(e)}")
+            return Outcome.FAILED, None
+
+    # Commands without a handler: ignore, log or answer with TW_MSSP_INVALID_COMMAND
+    def handle_unknown_command(self, policy, device, msg, ctrl, received_ns):
+        cmd = msg[3]
+        if policy is UnknownCommandPolicy.IGNORE:
+            return None
+
+        if policy is UnknownCommandPolicy.NAK:
+            try:
+                message = self.mssp.create_msg_result_resp(cmd, MSSP_INVALID_COMMAND, device.address)
+                message.set_ctrl(ctrl & ~self.MASTER_BIT)
+                frame = message.encode()
+                self.mssp.send_frame(frame, cmd)
+                self.latency.record(cmd, time.perf_counter_ns() - received_ns)
+                return Outcome.NAK, frame
+            except Exception as e:
+                self.report_error(f"Error sending NAK: {str(e)}")
+                return Outcome.FAILED, None
+        return Outcome.UNSUPPORTED, None
+
+    # Build and encode the light value response frame, on a frame cache miss or for noisy values
+    def build_light_value_response(self, addr, light_raw, light_avg, light_last, ctrl):
+        message = self.mssp.create_msg_get_light_value_resp(light_raw, light_avg, light_last)
+        message.set_addr(addr)
+        message.set_ctrl(ctrl)
+        return message.encode()
+
+    # Build and encode the device info response frame, only called on a frame cache miss
+    def build_device_info_response(self, devType, devId, fw, addr, group, ctrl):
+        message = self.mssp.create_msg_device_info_resp(devType, devId, fw, addr, group)
+        message.set_addr(addr)
+        message.set_ctrl(ctrl)
+        return message.encode()
+
+    # Snapshot of the health counters, cheap enough to take every GUI tick
+    def metrics(self):
+        latency_count, latency_total_ns = self.latency.totals()
+        decoder = getattr(self.mssp, "decoder", None)
+        return BusMetrics(
+            time.perf_counter_ns(), self.frames_received, self.responses_sent, self.errors,
+            getattr(decoder, "crc_errors", 0), self.unanswered + self.latency.late, self.ignored_commands,
+            latency_count, latency_total_ns,
+            {address: polled_ns for address, polled_ns in enumerate(self.last_poll_ns) if polled_ns}
+        )
+
+    # Ask the loop to finish, it notices at the latest after the port read timeout
+    def stop(self):
+        self.running = False
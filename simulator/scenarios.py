@@ -0,0 +1,187 @@
+"""
+Description: Predefined sensor scenarios (tunnel, direct sunlight, fire, ...) with the values the
+emulated sensor reports and the image the GUI shows for them. They are defined in scenarios.yaml,
+validated and compiled once into an immutable table that the GUI panels and the headless responder
+(--scenario tunnel) share. The GUI reloads the file when it changes. Dynamic scenarios describe
+their values over time as curve segments, see simulator/curves.py.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+from .curves import NUMPY_AVAILABLE, compile_curves, validate_segments
+
+
+SCENARIOS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scenarios.yaml")
+
+# Title of the situation panel button for manual values, no scenario may use it
+MANUAL_SITUATION = "Enter values manually"
+
+# light_curve, temp_curve and voltage_curve are tuples of curve segments, None keeps the value constant
+Scenario = namedtuple(
+    "Scenario",
+    ["key", "title", "light", "temp", "voltage", "image", "image_intensity", "light_curve", "temp_curve", "voltage_curve"],
+    defaults=(None, None, None)
+)
+
+REQUIRED_FIELDS = ("key", "title", "light", "temp", "voltage", "image")
+OPTIONAL_FIELDS = ("image_intensity", "curves")
+CURVE_CHANNELS = ("light", "temp", "voltage")
+KEY_PATTERN = re.compile(r"^[a-z][a-z0-9_-]*$")
+
+
+class ScenarioError(ValueError):
+    pass
+
+
+class ScenarioTable:
+    """Immutable, validated scenarios with lookups by key and by title."""
+
+    def __init__(self, scenarios=(), path=None):
+        self.scenarios = tuple(scenarios)
+        self.path = path
+        self.by_key = MappingProxyType({scenario.key: scenario for scenario in self.scenarios})
+        self.by_title = MappingProxyType({scenario.title: scenario for scenario in self.scenarios})
+
+    # Scenario for a short key or a situation panel title, None if there is no such scenario
+    def find(self, name):
+        return self.by_key.get(name) or self.by_title.get(name)
+
+    def keys(self):
+        return [scenario.key for scenario in self.scenarios]
+
+    def titles(self):
+        return [scenario.title for scenario in self.scenarios]
+
+    def __iter__(self):
+        return iter(self.scenarios)
+
+    def __len__(self):
+        return len(self.scenarios)
+
+
+def _number(entry, field, where):
+    value = entry[field]
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ScenarioError(f"{where}: {field} must be a number, not {value!r}")
+    return value
+
+
+# One YAML entry to a Scenario, lists become tuples so the result is immutable and hashable
+def parse_scenario(entry, position):
+    where = f"Scenario {position}"
+    if not isinstance(entry, dict):
+        raise ScenarioError(f"{where} must be a mapping of fields")
+    missing = [field for field in REQUIRED_FIELDS if field not in entry]
+    unknown = [field for field in entry if field not in REQUIRED_FIELDS + OPTIONAL_FIELDS]
+    if missing or unknown:
+        problems = [f"missing {', '.join(missing)}"] if missing else []
+        problems += [f"unknown {', '.join(map(str, unknown))}"] if unknown else []
+        raise ScenarioError(f"{where}: {'; '.join(problems)}")
+
+    key = entry["key"]
+    if not isinstance(key, str) or not KEY_PATTERN.match(key):
+        raise ScenarioError(f"{where}: key must be lower case letters, digits, - or _, not {key!r}")
+    where = f"Scenario {key!r}"
+    for field in ("title", "image"):
+        if not isinstance(entry[field], str) or not entry[field].strip():
+            raise ScenarioError(f"{where}: {field} must be a non-empty text")
+    if entry["title"] == MANUAL_SITUATION:
+        raise ScenarioError(f"{where}: the title {MANUAL_SITUATION!r} is reserved for manual input")
+    image_intensity = entry.get("image_intensity", 1)
+    if isinstance(image_intensity, bool) or not isinstance(image_intensity, int):
+        raise ScenarioError(f"{where}: image_intensity must be a whole number")
+
+    curves = entry.get("curves") or {}
+    if not isinstance(curves, dict) or any(channel not in CURVE_CHANNELS for channel in curves):
+        raise ScenarioError(f"{where}: curves may only have {', '.join(CURVE_CHANNELS)}")
+    compiled_curves = {}
+    for channel, segments in curves.items():
+        if not isinstance(segments, list) or not all(isinstance(segment, list) for segment in segments):
+            raise ScenarioError(f"{where}: the {channel} curve must be a list of segments like [hold, 20, 5.0]")
+        segments = tuple(tuple(segment) for segment in segments)
+        try:
+            validate_segments(segments)
+        except ValueError as e:
+            raise ScenarioError(f"{where}: {e}") from None
+        compiled_curves[f"{channel}_curve"] = segments
+
+    return Scenario(
+        key, entry["title"].strip(),
+        _number(entry, "light", where), _number(entry, "temp", where), _number(entry, "voltage", where),
+        entry["image"].strip(), image_intensity, **compiled_curves
+    )
+
+
+# Read, validate and compile a scenario file, raises ScenarioError with a readable message
+def load_scenarios(path=SCENARIOS_PATH):
+    try:
+        import yaml
+    except ImportError:
+        raise ScenarioError("PyYAML is needed to read the scenario file (pip install PyYAML)") from None
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entries = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    except OSError as e:
+        raise ScenarioError(f"Could not read {path}: {e}") from None
+    except yaml.YAMLError as e:
+        raise ScenarioError(f"{os.path.basename(path)} is not valid YAML: {e}") from None
+
+    if not isinstance(entries, list):
+        raise ScenarioError(f"{os.path.basename(path)} must be a list of scenarios")
+    scenarios = [parse_scenario(entry, position) for position, entry in enumerate(entries, 1)]
+
+    for field in ("key", "title"):
+        seen = set()
+        for scenario in scenarios:
+            value = getattr(scenario, field)
+            if value in seen:
+                raise ScenarioError(f"Two scenarios use the {field} {value!r}")
+            seen.add(value)
+    return ScenarioTable(scenarios, path)
+
+
+_table = None
+
+
+# The current scenario table, loaded from scenarios.yaml on first use
+def scenarios():
+    if _table is None:
+        reload_scenarios()
+    return _table
+
+
+# Load the file again and make it the current table. On an error the old table stays current.
+def reload_scenarios(path=None):
+    table = load_scenarios(path or (_table.path if _table is not None else SCENARIOS_PATH))
+    set_scenarios(table)
+    return table
+
+
+# Replacing the reference is atomic, readers on other threads see the old or the new table
+def set_scenarios(table):
+    global _table
+    _table = table
+
+
+def find_scenario(name):
+    return scenarios().find(name)
+
+
+# Sample arrays of a dynamic scenario, rendered once per scenario. None for static scenarios
+# and when NumPy is not installed (the scenario then reports its constant values).
+@lru_cache(maxsize=64)
+def scenario_curves(scenario):
+    if not (scenario.light_curve or scenario.temp_curve or scenario.voltage_curve) or not NUMPY_AVAILABLE:
+        return None
+    return compile_curves(
+        scenario.light_curve or scenario.light,
+        scenario.temp_curve or scenario.temp,
+        scenario.voltage_curve or scenario.voltage
+    )
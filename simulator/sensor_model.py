@@ -0,0 +1,143 @@
+"""
+Description: Measurement model of an emulated TSA0002. Every light value request is one
+measurement: the true light value plus noise from a seeded generator. Measurements go into
+a ring buffer with cumulative sums, so the average over the n samples the LCU asks for and
+the last value are O(1). Noise is pre-generated in NumPy blocks, the per-poll cost is one read.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import importlib.util
+import random
+
+
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+NOISE_KINDS = ("none", "gaussian", "flicker", "drift")
+NOISE_BLOCK = 4096
+DRIFT_REVERSION = 0.002   # Share of the drift that fades per sample, keeps the walk around zero
+
+# MSG_GET_LIGHT_VALUE_REQ asks for at most 255 samples
+RING_CAPACITY = 256
+DEFAULT_SAMPLES = 5
+NORMALIZED_MAX = 1000     # Average and last value are normalized to 0..1000
+
+
+class NoiseSource:
+    """Seeded noise in lux, level is the standard deviation. Same seed, same sequence."""
+
+    def __init__(self, kind="gaussian", level=2.0, seed=None, block_size=NOISE_BLOCK):
+        if kind not in NOISE_KINDS:
+            raise ValueError(f"Unknown noise {kind!r}, use one of {', '.join(NOISE_KINDS)}")
+        self.kind = kind
+        self.level = float(level)
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.block_size = block_size
+        self._drift = 0.0
+        if kind == "none" or self.level == 0:
+            self._rng = None
+        elif NUMPY_AVAILABLE:
+            import numpy as np
+            self._rng = np.random.default_rng(self.seed)
+        else:
+            self._rng = random.Random(self.seed)  # Gaussian only, good enough without NumPy
+        self._block = []
+        self._position = 0
+        self._refill()
+
+    # Hot path: one list read, a new block every block_size samples
+    def next(self):
+        if self._position >= len(self._block):
+            self._refill()
+        value = self._block[self._position]
+        self._position += 1
+        return value
+
+    def _refill(self):
+        self._position = 0
+        if self._rng is None:
+            self._block = [0.0] * self.block_size
+        elif not NUMPY_AVAILABLE:
+            self._block = [self._rng.gauss(0.0, self.level) for _ in range(self.block_size)]
+        else:
+            # A plain list, indexing it is cheaper than reading single NumPy scalars
+            self._block = getattr(self, f"_{self.kind}_block")().tolist()
+
+    def _gaussian_block(self):
+        return self._rng.normal(0.0, self.level, self.block_size)
+
+    # 1/f noise: white noise shaped in the frequency domain, scaled to the wanted deviation
+    def _flicker_block(self):
+        import numpy as np
+        spectrum = np.fft.rfft(self._rng.normal(0.0, 1.0, self.block_size))
+        frequencies = np.fft.rfftfreq(self.block_size)
+        frequencies[0] = frequencies[1]
+        noise = np.fft.irfft(spectrum / np.sqrt(frequencies), self.block_size)
+        noise -= noise.mean()
+        return noise * (self.level / (noise.std() or 1.0))
+
+    # Slow random walk pulled back towards zero (Ornstein-Uhlenbeck), continuous across blocks.
+    # x[k] = a^k * x0 + sum(a^(k-j) * step[j]), computed for the whole block at once.
+    def _drift_block(self):
+        import numpy as np
+        a = 1.0 - DRIFT_REVERSION
+        step_level = self.level * np.sqrt(1.0 - a * a)  # Long-run deviation equals level
+        steps = self._rng.normal(0.0, step_level, self.block_size)
+        powers = a ** np.arange(1, self.block_size + 1)
+        drift = powers * (self._drift + np.cumsum(steps / powers))
+        self._drift = float(drift[-1])
+        return drift
+
+
+class SensorModel:
+    """Ring buffer of measurements with cumulative sums. Only the comms thread uses it."""
+
+    __slots__ = ("noise", "samples", "totals", "count", "position")
+
+    def __init__(self, noise=None):
+        self.noise = noise if noise is not None else NoiseSource()
+        self.samples = [0] * RING_CAPACITY
+        self.totals = [0] * RING_CAPACITY  # totals[i] = sum of every measurement up to and including slot i
+        self.count = 0
+        self.position = -1
+
+    # Take one measurement of the true light value and return it
+    def measure(self, light):
+        sample = int(round(light + self.noise.next()))
+        previous_total = self.totals[self.position] if self.count else 0
+        self.position = (self.position + 1) % RING_CAPACITY
+        self.samples[self.position] = sample
+        self.totals[self.position] = previous_total + sample
+        if self.count < RING_CAPACITY:
+            self.count += 1
+        return sample
+
+    # Mean of the last n measurements, two reads from the cumulative sums
+    def average(self, n):
+        n = max(1, min(n, self.count, RING_CAPACITY - 1))
+        if not self.count:
+            return 0
+        newest = self.totals[self.position]
+        if n == self.count and self.count < RING_CAPACITY:
+            return round(newest / n)
+        return round((newest - self.totals[(self.position - n) % RING_CAPACITY]) / n)
+
+    # True when measurements equal the true value, so equal light values give equal responses
+    @property
+    def noiseless(self):
+        return self.noise.level == 0 or self.noise.kind == "none"
+
+    def last(self):
+        return self.samples[self.position] if self.count else 0
+
+    # The three values of MSG_GET_LIGHT_VALUE_RESP after one new measurement: the average of n
+    # samples, the average normalized to 0..1000 and the last measurement normalized to 0..1000
+    def read(self, light, n=DEFAULT_SAMPLES):
+        last = self.measure(light)
+        average = self.average(n)
+        return average, min(max(average, 0), NORMALIZED_MAX), min(max(last, 0), NORMALIZED_MAX)
+
+    def reset(self):
+        self.count = 0
+        self.position = -1
@@ -0,0 +1,47 @@
+"""
+Description: Versioned, immutable snapshots of the simulated sensor values. The GUI publishes
+a new snapshot whenever the user sends data, and the MSSP responder picks up the latest one
+on the next LCU poll without restarting the serial session.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import threading
+import time
+from collections import namedtuple
+
+
+# One complete set of values the responder reports to the LCU.
+# Being a tuple, a snapshot can never be half updated.
+# Dynamic scenarios also carry their precomputed curves (simulator/curves.py) and the
+# time.monotonic_ns() they started at, light/temp/voltage are then the values shown in the GUI.
+SensorSnapshot = namedtuple("SensorSnapshot", ["light", "temp", "voltage", "version", "curves", "started_ns"],
+                            defaults=(None, 0))
+
+
+class SensorState:
+
+    def __init__(self, light=100, temp=25, voltage=5):
+        # The lock only serialises publishers, readers never take it
+        self._lock = threading.Lock()
+        self._snapshot = SensorSnapshot(int(light), int(temp), int(voltage), 0)
+
+    # Publish new sensor values and return the snapshot that now is current.
+    # Swapping the reference is atomic, so the comms thread either sees the old
+    # triple or the new one, never a mix of both. With curves the values follow them from now on.
+    def publish(self, light, temp, voltage, curves=None):
+        with self._lock:
+            snapshot = SensorSnapshot(
+                int(light), int(temp), int(voltage), self._snapshot.version + 1, curves, time.monotonic_ns()
+            )
+            self._snapshot = snapshot
+        return snapshot
+
+    # Latest snapshot, read once per LCU request
+    def current(self):
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot.version
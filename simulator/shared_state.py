@@ -0,0 +1,108 @@
+"""
+Description: Sensor values in a multiprocessing.shared_memory block, so a responder running in
+its own process sees the values the GUI publishes without any message passing on the poll path.
+A sequence lock keeps the reader from ever seeing half of an update.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from .sensor_state import SensorSnapshot
+
+
+# sequence, light, temp, voltage, version, started_ns, has_curves
+STATE_LAYOUT = struct.Struct("<QqqqQQB")
+SEQUENCE = struct.Struct("<Q")
+MAX_READ_RETRIES = 1000  # A writer that died mid-update leaves the sequence odd, give up after this
+
+
+class SharedSensorState:
+    """Writer side, lives in the GUI process. Same publish() as SensorState."""
+
+    def __init__(self, light=100, temp=25, voltage=5):
+        self.shm = shared_memory.SharedMemory(create=True, size=STATE_LAYOUT.size)
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._snapshot = None
+        # send_curves(version, curves) hands curves to the reader before their version is published
+        self.send_curves = None
+        self.publish(light, temp, voltage)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    # An odd sequence number means an update is being written, readers retry until it is even again
+    def publish(self, light, temp, voltage, curves=None):
+        with self._lock:
+            version = self._snapshot.version + 1 if self._snapshot else 0
+            snapshot = SensorSnapshot(int(light), int(temp), int(voltage), version, curves, time.monotonic_ns())
+            if curves is not None:
+                self.send_curves(version, curves)
+            buf = self.shm.buf
+            STATE_LAYOUT.pack_into(
+                buf, 0, self._sequence + 1, snapshot.light, snapshot.temp, snapshot.voltage,
+                version, snapshot.started_ns, curves is not None
+            )
+            self._sequence += 2
+            SEQUENCE.pack_into(buf, 0, self._sequence)
+            self._snapshot = snapshot
+        return snapshot
+
+    def current(self):
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SharedSensorView:
+    """Reader side, lives in the responder process and stands in for a device's SensorState."""
+
+    def __init__(self, name):
+        self.shm = shared_memory.SharedMemory(name=name)
+        self._sequence = None
+        self._snapshot = SensorSnapshot(0, 0, 0, 0)
+        # version -> CurveSet, replaced as a whole by add_curves from the control thread
+        self._curves = {}
+
+    def add_curves(self, version, curves):
+        self._curves = {version: curves}
+
+    # Hot path: one 8 byte read while nothing changed, never blocks
+    def current(self):
+        buf = self.shm.buf
+        sequence = SEQUENCE.unpack_from(buf, 0)[0]
+        if sequence == self._sequence:
+            return self._snapshot
+        for _ in range(MAX_READ_RETRIES):
+            values = STATE_LAYOUT.unpack_from(buf, 0)
+            if not values[0] & 1 and SEQUENCE.unpack_from(buf, 0)[0] == values[0]:
+                break
+        else:
+            return self._snapshot  # Writer stuck mid-update, keep answering with the last good values
+
+        _, light, temp, voltage, version, started_ns, has_curves = values
+        curves = self._curves.get(version) if has_curves else None
+        self._snapshot = SensorSnapshot(light, temp, voltage, version, curves, started_ns)
+        # Curves still on their way through the pipe: answer with the plain values for now and
+        # look again on the next poll instead of waiting here
+        if curves is not None or not has_curves:
+            self._sequence = values[0]
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self.current().version
+
+    def close(self):
+        self.shm.close()
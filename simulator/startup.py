@@ -0,0 +1,45 @@
+"""
+Description: Built-in startup timer. Records how long after launch the first milestones are reached,
+like the first paint of the main window and the first open serial port. Once the GUI launcher has
+started the timer the milestones are printed, so startup regressions show up in every GUI run, while the
+headless CLI, the virtual LCU and the responder process stay quiet.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import time
+
+
+class StartupTimer:
+
+    def __init__(self, verbose=False):
+        self.start_ns = time.perf_counter_ns()
+        self.verbose = verbose
+        self.marks = {}
+
+    # Restart the clock and print the milestones from now on, main.py calls this first thing
+    def start(self):
+        self.start_ns = time.perf_counter_ns()
+        self.verbose = True
+        self.marks.clear()
+
+    # Record a milestone, only its first occurrence counts. Returns the ms since launch.
+    def mark(self, name):
+        if name in self.marks:
+            return self.marks[name]
+        elapsed_ms = (time.perf_counter_ns() - self.start_ns) / 1e6
+        self.marks[name] = elapsed_ms
+        if self.verbose:
+            print(f"Startup: {name.replace('_', ' ')} after {elapsed_ms:.1f} ms")
+        return elapsed_ms
+
+    def elapsed_ms(self, name):
+        return self.marks.get(name)
+
+    def report(self):
+        return {name: round(elapsed_ms, 1) for name, elapsed_ms in self.marks.items()}
+
+
+# One timer per process, silent until start() is called
+startup_timer = StartupTimer()
@@ -0,0 +1,282 @@
+"""
+Description: Virtual LCU (MSSP master) for closed-loop benchmarking without Teknoware hardware.
+Polls the simulator over a pseudo-terminal pair or a local TCP socket with light value and device
+info requests at a configurable rate and pattern, checks every response, and reports the request
+rate, response latency percentiles and timeouts.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import argparse
+import os
+import select
+import socket
+import threading
+import time
+from .mssp_codec import (
+    MsspMessage, FrameDecoder, MASTER_BIT, COUNTER_MASK, LIGHT_SENSOR_ADDRESS,
+    MSG_DEVICE_INFO_REQ, MSG_GET_LIGHT_VALUE_REQ
+)
+from .devices import DeviceTable
+from .responder import MsspResponder
+
+
+# Pattern names usable on the command line, e.g. --pattern light,light,info
+PATTERN_COMMANDS = {
+    "light": MSG_GET_LIGHT_VALUE_REQ,
+    "info": MSG_DEVICE_INFO_REQ
+}
+
+# MSG_GET_LIGHT_VALUE_REQ data: number of samples, raw flag (0 = calibrated)
+LIGHT_REQUEST_DATA = bytes((5, 0))
+
+
+class FdLink:
+    """Master side of a pseudo-terminal pair."""
+
+    def __init__(self, fd):
+        self.fd = fd
+
+    def fileno(self):
+        return self.fd
+
+    def read(self, size=4096):
+        return os.read(self.fd, size)
+
+    def write(self, data):
+        os.write(self.fd, data)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class SocketLink:
+    """Accepted TCP connection, the responder connects with a socket://host:port URL."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def fileno(self):
+        return self.connection.fileno()
+
+    def read(self, size=4096):
+        return self.connection.recv(size)
+
+    def write(self, data):
+        self.connection.sendall(data)
+
+    def close(self):
+        self.connection.close()
+
+
+# Create a raw pseudo-terminal pair, returns the master link and the path the responder opens
+def open_pty_link():
+    import tty
+    master_fd, slave_fd = os.openpty()
+    tty.setraw(master_fd)
+    tty.setraw(slave_fd)
+    slave_path = os.ttyname(slave_fd)
+    # Keep the slave open until the responder has opened it, else the first write fails with EIO
+    return FdLink(master_fd), slave_path, slave_fd
+
+
+class VirtualLcu:
+
+    # rate_hz 0 means closed loop: the next request goes out as soon as the previous one is answered.
+    # With several addresses every pattern step polls the next slave in turn.
+    def __init__(self, link, addresses=(LIGHT_SENSOR_ADDRESS,), rate_hz=10, pattern=("light",), timeout=0.1):
+        self.link = link
+        self.addresses = list(addresses)
+        self.rate_hz = rate_hz
+        self.commands = [PATTERN_COMMANDS[name] for name in pattern]
+        self.timeout = timeout
+        self.decoder = FrameDecoder()
+        self.counter = 0
+        self.running = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.sent = 0
+        self.answered = 0
+        self.timeouts = 0
+        self.mismatches = 0
+        self.latencies_ns = []
+        self.elapsed_ns = 0
+
+    # Message counter runs 1..15 and starts again from 1, 0 is never used
+    def next_ctrl(self):
+        self.counter = self.counter % COUNTER_MASK + 1
+        return MASTER_BIT | self.counter
+
+    def build_request(self, command, address):
+        data = LIGHT_REQUEST_DATA if command == MSG_GET_LIGHT_VALUE_REQ else b""
+        return MsspMessage.create(command, data, addr=address, ctrl=self.next_ctrl())
+
+    # A valid response is a slave message with our counter, address and command
+    def is_response_to(self, response, request):
+        return (
+            not response.is_from_master()
+            and response.get_ctrl() == request.get_ctrl() & ~MASTER_BIT
+            and response.get_addr() == request.get_addr()
+            and response.get_cmd() == request.get_cmd()
+        )
+
+    # Send one request and wait for its response, returns the latency in ns or None on timeout
+    def poll(self, command, address):
+        request = self.build_request(command, address)
+        self.link.write(request.encode())
+        sent_ns = time.perf_counter_ns()
+        deadline_ns = sent_ns + int(self.timeout * 1e9)
+        self.sent += 1
+
+        while True:
+            remaining = (deadline_ns - time.perf_counter_ns()) / 1e9
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([self.link], [], [], remaining)
+            if not readable:
+                break
+            data = self.link.read()
+            received_ns = time.perf_counter_ns()
+            if not data:
+                break
+            for response in self.decoder.feed(data):
+                if self.is_response_to(response, request):
+                    latency_ns = received_ns - sent_ns
+                    self.answered += 1
+                    self.latencies_ns.append(latency_ns)
+                    return latency_ns
+                self.mismatches += 1
+
+        self.timeouts += 1
+        return None
+
+    # Poll for duration seconds (or count requests) following the pattern at the configured rate
+    def run(self, duration=10.0, count=None):
+        self.running = True
+        start_ns = time.perf_counter_ns()
+        end_ns = start_ns + int(duration * 1e9)
+        interval_ns = int(1e9 / self.rate_hz) if self.rate_hz else 0
+        index = 0
+
+        while self.running and time.perf_counter_ns() < end_ns and (count is None or index < count):
+            if interval_ns:
+                delay_ns = start_ns + index * interval_ns - time.perf_counter_ns()
+                if delay_ns > 0:
+                    time.sleep(delay_ns / 1e9)
+            self.poll(self.commands[index % len(self.commands)], self.addresses[index % len(self.addresses)])
+            index += 1
+
+        self.elapsed_ns = time.perf_counter_ns() - start_ns
+        self.running = False
+        return self.report()
+
+    def stop(self):
+        self.running = False
+
+    def report(self):
+        latencies = sorted(self.latencies_ns)
+        elapsed_s = self.elapsed_ns / 1e9
+
+        def percentile(fraction):
+            return round(latencies[min(int(fraction * len(latencies)), len(latencies) - 1)] / 1e6, 3) if latencies else None
+
+        return {
+            "requests": self.sent,
+            "responses": self.answered,
+            "timeouts": self.timeouts,
+            "mismatched_frames": self.mismatches,
+            "crc_errors": self.decoder.crc_errors,
+            "elapsed_s": round(elapsed_s, 3),
+            "request_rate_hz": round(self.sent / elapsed_s, 1) if elapsed_s else 0,
+            "latency_ms": {
+                "p50": percentile(0.50),
+                "p90": percentile(0.90),
+                "p99": percentile(0.99),
+                "max": percentile(1)
+            }
+        }
+
+
+# Start the simulator's responder on the given port in a thread of this process, emulating the given
+# device table. Returns the responder and its thread.
+def start_local_responder(port, light, devices=None):
+    responder = MsspResponder(port, on_error=lambda message: print(f"Responder: {message}"))
+    if devices is not None:
+        responder.devices = devices
+    responder.update_sensor_values(light, 25, 5)
+    thread = threading.Thread(target=responder.run, name="mssp-responder", daemon=True)
+    thread.start()
+    return responder, thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Virtual LCU that benchmarks the MSSP responder")
+    link_group = parser.add_mutually_exclusive_group()
+    link_group.add_argument("--pty", action="store_true", help="Use a pseudo-terminal pair (default)")
+    link_group.add_argument("--socket", metavar="HOST:PORT", help="Listen on a TCP socket, the responder connects to socket://HOST:PORT")
+    parser.add_argument("--no-responder", action="store_true", help="Do not start the responder here, only print where to connect it")
+    parser.add_argument("--rate", type=float, default=20, help="Requests per second, 0 = as fast as responses come back")
+    parser.add_argument("--pattern", default="light", help="Comma separated request pattern, e.g. light,light,info")
+    parser.add_argument("--duration", type=float, default=10, help="Benchmark length in seconds")
+    parser.add_argument("--timeout", type=float, default=0.1, help="Response timeout in seconds")
+    parser.add_argument("--address", help="Comma separated slave addresses to poll, e.g. 0x01,0x02 (default: every emulated sensor)")
+    parser.add_argument("--devices", type=int, default=1, help="Number of sensors the local responder emulates, from address 0x01 on")
+    parser.add_argument("--light", type=float, default=100, help="Light value for the local responder")
+    args = parser.parse_args()
+
+    pattern = [name.strip() for name in args.pattern.split(",") if name.strip()]
+    unknown = [name for name in pattern if name not in PATTERN_COMMANDS]
+    if unknown or not pattern:
+        parser.error(f"Unknown pattern entries: {', '.join(unknown) or '(empty)'}")
+
+    devices = DeviceTable.single() if args.devices <= 1 else DeviceTable.sequential(args.devices)
+    if args.address:
+        addresses = [int(text, 0) for text in args.address.split(",")]
+    else:
+        addresses = [device.address for device in devices]
+
+    keep_open_fd = None
+    if args.socket:
+        host, port_number = args.socket.rsplit(":", 1)
+        server = socket.create_server((host, int(port_number)))
+        responder_port = f"socket://{host}:{port_number}"
+    else:
+        link, responder_port, keep_open_fd = open_pty_link()
+
+    responder = None
+    if args.no_responder:
+        print(f"Connect the responder to {responder_port}")
+    else:
+        responder, responder_thread = start_local_responder(responder_port, args.light, devices)
+
+    if args.socket:
+        connection, _ = server.accept()
+        server.close()
+        link = SocketLink(connection)
+
+    # Give the responder a moment to open the port before the first poll
+    time.sleep(0.5)
+    if keep_open_fd is not None and responder is not None:
+        os.close(keep_open_fd)
+
+    lcu = VirtualLcu(link, addresses, args.rate, pattern, args.timeout)
+    try:
+        report = lcu.run(args.duration)
+    except KeyboardInterrupt:
+        report = lcu.report()
+    finally:
+        if responder is not None:
+            responder.stop()
+            responder_thread.join()
+        link.close()
+
+    latency = report.pop("latency_ms")
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    print("latency_ms: " + ", ".join(f"{key}={value}" for key, value in latency.items()))
+
+
+if __name__ == "__main__":
+    main()
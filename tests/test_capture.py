@@ -0,0 +1,121 @@
+"""
+Description: Tests for the capture file: what the writer records the reader gives back, with and
+without the index file.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import os
+import pytest
+from simulator.capture import (
+    CaptureReader, CaptureWriter, DIRECTION_RX, DIRECTION_TX, NO_COMMAND, FILE_HEADER, RECORD_HEADER,
+    index_path_for, prune_captures
+)
+from simulator.mssp_codec import MSG_DEVICE_INFO_REQ, MSG_GET_LIGHT_VALUE_REQ
+
+RECORDS = [
+    (DIRECTION_RX, b"\x00\x06\x01\x41\x7d\x0a\x05\x00", MSG_GET_LIGHT_VALUE_REQ),
+    (DIRECTION_TX, b"\x00\x0a\x01\x01\x7d\x0a\x90\x01\x90\x01\x90\x01\x00", MSG_GET_LIGHT_VALUE_REQ),
+    (DIRECTION_RX, b"\x00\x05\x01\x42\x7d\x00\x00", MSG_DEVICE_INFO_REQ),
+    (DIRECTION_RX, b"\x13\x37", NO_COMMAND)
+]
+
+
+@pytest.fixture
+def capture_path(tmp_path):
+    path = str(tmp_path / "bus.cap")
+    writer = CaptureWriter(path)
+    for direction, data, command in RECORDS:
+        writer.record(direction, data, command)
+    writer.close()
+    assert writer.error is None
+    return path
+
+
+def read_all(path):
+    reader = CaptureReader(path)
+    try:
+        return [(record.direction, bytes(record.data), record.command, record.timestamp_ns) for record in reader]
+    finally:
+        reader.close()
+
+
+def test_round_trip(capture_path):
+    records = read_all(capture_path)
+    assert [record[:3] for record in records] == RECORDS
+    timestamps = [record[3] for record in records]
+    assert timestamps == sorted(timestamps)
+
+
+def test_round_trip_without_index(capture_path):
+    expected = read_all(capture_path)
+    os.remove(index_path_for(capture_path))
+    assert read_all(capture_path) == expected
+
+
+def test_filters_by_command_and_time(capture_path):
+    reader = CaptureReader(capture_path)
+    try:
+        light = [bytes(record.data) for record in reader.by_command(MSG_GET_LIGHT_VALUE_REQ)]
+        assert light == [RECORDS[0][1], RECORDS[1][1]]
+        requests = list(reader.by_command(MSG_GET_LIGHT_VALUE_REQ, direction=DIRECTION_RX))
+        assert len(requests) == 1
+
+        third_ns = reader.record(2).timestamp_ns
+        later = [bytes(record.data) for record in reader.between(start_ns=third_ns)]
+        assert later == [data for _, data, _, timestamp_ns in read_all(capture_path) if timestamp_ns >= third_ns]
+        assert later[-2:] == [RECORDS[2][1], RECORDS[3][1]]
+    finally:
+        reader.close()
+
+
+def test_writer_appends_to_existing_capture(capture_path):
+    writer = CaptureWriter(capture_path)
+    writer.record(DIRECTION_TX, b"\x01\x02", NO_COMMAND)
+    writer.close()
+    records = read_all(capture_path)
+    assert len(records) == len(RECORDS) + 1
+    assert records[-1][:3] == (DIRECTION_TX, b"\x01\x02", NO_COMMAND)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_capture.cap"
+    path.write_bytes(b"hello, this is no capture file at all")
+    with pytest.raises(ValueError):
+        CaptureReader(str(path))
+
+
+def test_writer_without_frames_creates_no_files(tmp_path):
+    path = tmp_path / "captures" / "idle.cap"
+    writer = CaptureWriter(str(path))
+    writer.close()
+    assert writer.error is None
+    assert not (tmp_path / "captures").exists()
+
+
+def test_writer_drops_frames_past_size_limit(tmp_path):
+    path = str(tmp_path / "bus.cap")
+    data = b"\x00" * 10
+    writer = CaptureWriter(path, max_bytes=FILE_HEADER.size + 2 * (RECORD_HEADER.size + len(data)))
+    for _ in range(5):
+        writer.record(DIRECTION_RX, data, NO_COMMAND)
+    writer.close()
+    assert (writer.records, writer.dropped) == (2, 3)
+    assert len(read_all(path)) == 2
+    assert os.path.getsize(path) <= writer.max_bytes
+
+
+def test_prune_keeps_newest_captures(tmp_path):
+    for i in range(5):
+        path = tmp_path / f"rs485_log_{i}.cap"
+        path.write_bytes(b"")
+        (tmp_path / f"rs485_log_{i}.cap.idx").write_bytes(b"")
+        os.utime(path, (1000 + i, 1000 + i))
+    (tmp_path / "mine.cap").write_bytes(b"")
+
+    assert prune_captures(str(tmp_path), 2, prefix="rs485_log_") == 3
+    assert sorted(os.listdir(tmp_path)) == [
+        "mine.cap", "rs485_log_3.cap", "rs485_log_3.cap.idx", "rs485_log_4.cap", "rs485_log_4.cap.idx"
+    ]
+    assert prune_captures(str(tmp_path / "missing"), 2) == 0
@@ -0,0 +1,73 @@
+"""
+Description: Tests for the scenario curves: strobe half periods, linear ramps, and what a poll
+sees once a curve has ended, looping or holding its last value.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import pytest
+from simulator.curves import compile_curves, validate_segments
+
+np = pytest.importorskip("numpy")
+
+MS = 1_000_000  # Nanoseconds per sample at the default 1000 Hz
+
+
+def test_strobe_switches_every_half_period():
+    # 5 Hz: 100 ms high, 100 ms low
+    curves = compile_curves([("strobe", 10, 500, 5, 1.0)], 25, 5)
+    assert curves.samples == 1000
+    assert [curves.light_at(ms * MS) for ms in (0, 99, 100, 199, 200, 999)] == [500, 500, 10, 10, 500, 10]
+    assert int(np.count_nonzero(curves.light == 500)) == 500
+
+
+def test_strobe_duty():
+    curves = compile_curves([("strobe", 0, 100, 10, 0.1, 0.25)], 25, 5)
+    assert [curves.light_at(ms * MS) for ms in (0, 24, 25, 99)] == [100, 100, 0, 0]
+
+
+def test_ramp_interpolates_linearly():
+    curves = compile_curves([("ramp", 0, 1000, 1.0)], 25, 5)
+    assert [curves.light_at(ms * MS) for ms in (0, 250, 500, 999)] == [0, 250, 500, 999]
+
+
+def test_segments_follow_each_other():
+    curves = compile_curves([("hold", 800, 0.5), ("ramp", 800, 20, 0.5)], 25, 5)
+    assert curves.duration_s == pytest.approx(1.0)
+    assert curves.light_at(499 * MS) == 800
+    assert curves.light_at(500 * MS) == 800
+    assert curves.light_at(750 * MS) == 410
+
+
+def test_loops_by_default():
+    curves = compile_curves([("ramp", 0, 1000, 1.0)], 25, 5)
+    assert curves.light_at(1_250 * MS) == curves.light_at(250 * MS) == 250
+
+
+def test_holds_last_value_when_not_looping():
+    curves = compile_curves([("ramp", 0, 1000, 1.0)], 25, 5, loop=False)
+    assert curves.light_at(999 * MS) == 999
+    assert curves.light_at(1_000 * MS) == 999
+    assert curves.light_at(3_600_000 * MS) == 999
+    assert curves.light_at(-5 * MS) == 0
+
+
+def test_values_at_repeats_shorter_channels():
+    curves = compile_curves([("hold", 100, 1.0)], [("hold", 20, 0.25), ("hold", 30, 0.25)], 5)
+    assert curves.values_at(0) == (100, 20, 5)
+    assert curves.values_at(300 * MS) == (100, 30, 5)
+    assert curves.values_at(600 * MS) == (100, 20, 5)
+
+
+@pytest.mark.parametrize("segments", [
+    [],
+    [("wobble", 1, 2)],
+    [("hold", 100)],
+    [("ramp", 0, 100, 0)],
+    [("strobe", 0, 100, 0, 1.0)],
+    [("hold", "bright", 1.0)]
+])
+def test_rejects_bad_segments(segments):
+    with pytest.raises(ValueError):
+        validate_segments(segments)
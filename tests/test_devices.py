@@ -0,0 +1,90 @@
+"""
+Description: Tests for the device table: which addresses each sensor answers, and which sensors a
+publish to an address reaches.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import pytest
+from simulator.devices import DeviceTable, EmulatedDevice, FIRST_SLAVE_ADDRESS, LAST_SLAVE_ADDRESS
+from simulator.mssp_codec import BROADCAST_ADDRESS, LIGHT_SENSOR_ADDRESS, UNSET_ADDRESS
+
+GROUP_ADDRESS = 0x80
+
+
+def light_of(device):
+    return device.state.current().light
+
+
+def test_single_answers_every_address_but_zero():
+    table = DeviceTable.single()
+    (device,) = table
+    assert device.address == LIGHT_SENSOR_ADDRESS
+    for address in (LIGHT_SENSOR_ADDRESS, FIRST_SLAVE_ADDRESS, LAST_SLAVE_ADDRESS,
+                    GROUP_ADDRESS, UNSET_ADDRESS, BROADCAST_ADDRESS):
+        assert table.lookup(address) is device
+    assert table.lookup(0) is None
+
+
+def test_sequential_answers_only_own_addresses():
+    table = DeviceTable.sequential(3, first_address=0x10, first_dev_id=100)
+    assert [(device.address, device.dev_id) for device in table] == [(0x10, 100), (0x11, 101), (0x12, 102)]
+    for device in table:
+        assert table.lookup(device.address) is device
+    # Several slaves answering a group or broadcast address would collide on the bus
+    for address in (0x0F, 0x13, LIGHT_SENSOR_ADDRESS, GROUP_ADDRESS, UNSET_ADDRESS, BROADCAST_ADDRESS):
+        assert table.lookup(address) is None
+
+
+def test_fallback_goes_to_the_first_device_only_for_unclaimed_addresses():
+    table = DeviceTable([EmulatedDevice(0x20), EmulatedDevice(0x21)], answer_any_address=True)
+    first, second = table
+    assert table.lookup(0x21) is second
+    assert table.lookup(0x22) is first
+    assert table.lookup(BROADCAST_ADDRESS) is first
+
+
+@pytest.mark.parametrize("address", [0x00, LAST_SLAVE_ADDRESS + 1, BROADCAST_ADDRESS])
+def test_add_rejects_non_slave_addresses(address):
+    with pytest.raises(ValueError):
+        DeviceTable([EmulatedDevice(address)])
+
+
+def test_add_rejects_used_address():
+    table = DeviceTable.sequential(2)
+    with pytest.raises(ValueError):
+        table.add(EmulatedDevice(FIRST_SLAVE_ADDRESS))
+
+
+def test_publish_to_every_device():
+    table = DeviceTable.sequential(3)
+    snapshot = table.publish(500, 20, 24)
+    assert snapshot.light == 500
+    assert [light_of(device) for device in table] == [500, 500, 500]
+
+
+def test_publish_to_one_address():
+    table = DeviceTable.sequential(3)
+    table.publish(500, 20, 24, address=FIRST_SLAVE_ADDRESS + 1)
+    assert [light_of(device) for device in table] == [100, 500, 100]
+
+
+def test_publish_to_an_unclaimed_address_reaches_no_device():
+    table = DeviceTable.sequential(2)
+    assert table.publish(500, 20, 24, address=0x40) is None
+    assert [light_of(device) for device in table] == [100, 100]
+
+
+def test_publish_to_any_address_reaches_the_fallback_device():
+    table = DeviceTable.single()
+    snapshot = table.publish(700, 20, 24, address=BROADCAST_ADDRESS)
+    assert snapshot.light == 700
+    assert light_of(table.lookup(LIGHT_SENSOR_ADDRESS)) == 700
+
+
+def test_set_noise_gives_every_device_its_own_seed():
+    table = DeviceTable.sequential(3)
+    table.set_noise("gaussian", 2.0, seed=40)
+    assert [device.model.noise.seed for device in table] == [40, 41, 42]
+    assert all(device.model.noise.kind == "gaussian" for device in table)
@@ -0,0 +1,130 @@
+"""
+Description: Tests for the command dispatch table: unknown commands, which handler results count as
+errors, and how plugin handlers are registered next to the built-in ones.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import pytest
+from simulator.dispatch import (
+    CommandEntry, CommandRegistry, Dispatcher, UnknownCommandPolicy, build_dispatcher, plugin_registry,
+    register_command
+)
+from simulator.events import Outcome
+from simulator.mssp_codec import LIGHT_SENSOR_ADDRESS, MSG_GET_LIGHT_VALUE_REQ, MsspMessage
+from simulator.responder import MsspResponder
+
+UNKNOWN_COMMAND = 0x33
+PLUGIN_COMMAND = 0x0C
+
+
+@pytest.fixture
+def plugin_command():
+    yield PLUGIN_COMMAND
+    plugin_registry.unregister(PLUGIN_COMMAND)
+
+
+def dispatcher_for(*handlers, unknown_handler=None):
+    registry = CommandRegistry()
+    for command, handler in enumerate(handlers, 1):
+        registry.register(command, handler)
+    return Dispatcher(
+        [CommandEntry(command, name, handler) for command, (name, handler) in registry.items()], unknown_handler
+    )
+
+
+def dispatch_unknown(policy):
+    responder = MsspResponder("unused", 9600, policy)
+    device = responder.devices.lookup(LIGHT_SENSOR_ADDRESS)
+    message = MsspMessage.create(UNKNOWN_COMMAND, ctrl=0x41)
+    return responder, responder.dispatcher.dispatch(UNKNOWN_COMMAND, device, message, 0x41, 0)
+
+
+def test_unknown_command_is_unsupported_with_log_policy():
+    responder, result = dispatch_unknown("log")
+    assert result == (Outcome.UNSUPPORTED, None)
+    assert responder.dispatcher.stats()["unknown"] == {"0x33": 1}
+
+
+def test_unknown_command_is_dropped_with_ignore_policy():
+    responder, result = dispatch_unknown("ignore")
+    assert result is None
+    assert responder.dispatcher.stats()["unknown"] == {"0x33": 1}
+
+
+def test_unknown_command_goes_to_the_unknown_handler():
+    calls = []
+    dispatcher = dispatcher_for(unknown_handler=lambda policy, *args: calls.append((policy, args)))
+    dispatcher.dispatch(UNKNOWN_COMMAND, "device")
+    assert calls == [(UnknownCommandPolicy.LOG, ("device",))]
+
+
+@pytest.mark.parametrize("result, errors", [
+    ((Outcome.RESPONDED, b"frame"), 0),
+    ((Outcome.UNSUPPORTED, None), 0),
+    ((Outcome.INFO, None), 0),
+    (None, 0),
+    ((Outcome.NAK, b"frame"), 1),
+    ((Outcome.FAILED, None), 1)
+])
+def test_errors_per_outcome(result, errors):
+    dispatcher = dispatcher_for(lambda: result)
+    assert dispatcher.dispatch(1) == result
+    (entry,) = dispatcher.entries()
+    assert (entry.calls, entry.errors) == (1, errors)
+
+
+def test_exception_counts_as_error_and_propagates():
+    def broken():
+        raise RuntimeError("broken handler")
+
+    dispatcher = dispatcher_for(broken)
+    with pytest.raises(RuntimeError):
+        dispatcher.dispatch(1)
+    (entry,) = dispatcher.entries()
+    assert (entry.calls, entry.errors) == (1, 1)
+
+
+def test_failed_builtin_handler_counts_as_error():
+    responder = MsspResponder("unused", 9600, "log")  # No port, so sending the response fails
+    device = responder.devices.lookup(LIGHT_SENSOR_ADDRESS)
+    message = MsspMessage.create(MSG_GET_LIGHT_VALUE_REQ, b"\x05\x00", ctrl=0x41)
+    outcome, frame = responder.dispatcher.dispatch(MSG_GET_LIGHT_VALUE_REQ, device, message, 0x41, 0)
+    assert (outcome, frame) == (Outcome.FAILED, None)
+    assert responder.dispatcher.table[MSG_GET_LIGHT_VALUE_REQ].errors == 1
+
+
+def test_register_rejects_commands_beyond_one_byte():
+    with pytest.raises(ValueError):
+        CommandRegistry().register(0x100, lambda: None)
+
+
+def test_plugin_gets_the_responder_and_a_default_name(plugin_command):
+    @register_command(plugin_command)
+    def single_param(responder, *args):
+        return Outcome.INFO, None
+
+    responder = MsspResponder("unused", 9600, "log")
+    entry = responder.dispatcher.table[plugin_command]
+    assert entry.name == "Single param"
+    assert entry.handler.args == (responder,)
+
+
+def test_duplicate_plugin_registration_keeps_the_last_handler(plugin_command):
+    register_command(plugin_command, lambda responder: (Outcome.INFO, None), name="first")
+    register_command(plugin_command, lambda responder: (Outcome.RESPONDED, b"x"), name="second")
+
+    dispatcher = build_dispatcher("responder", CommandRegistry(), None)
+    assert dispatcher.table[plugin_command].name == "second"
+    assert dispatcher.dispatch(plugin_command) == (Outcome.RESPONDED, b"x")
+
+
+def test_plugin_replaces_builtin_command(plugin_command):
+    builtin = CommandRegistry()
+    builtin.register(plugin_command, lambda: (Outcome.FAILED, None), name="builtin")
+    register_command(plugin_command, lambda responder: (Outcome.RESPONDED, b"x"), name="plugin")
+
+    dispatcher = build_dispatcher("responder", builtin, None)
+    assert dispatcher.table[plugin_command].name == "plugin"
+    assert dispatcher.dispatch(plugin_command) == (Outcome.RESPONDED, b"x")
@@ -0,0 +1,87 @@
+"""
+Description: Tests for the shared memory event ring: records come out in order across the end of
+the ring, and a full ring drops and counts new records instead of overwriting old ones.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import pytest
+from simulator.event_ring import EventRing, LENGTH
+
+
+@pytest.fixture
+def ring():
+    ring = EventRing(capacity=64)
+    yield ring
+    ring.close()
+    ring.unlink()
+
+
+def record(number, length):
+    return bytes([number]) * length
+
+
+def test_rejects_capacity_that_is_no_power_of_two():
+    with pytest.raises(ValueError):
+        EventRing(capacity=100)
+
+
+def test_wraps_with_marker(ring):
+    first = [record(n, 10) for n in range(4)]
+    assert all(ring.push(payload) for payload in first)
+    assert ring.drain() == first
+
+    # 56 bytes used, the next record does not fit before the end and starts over at the beginning
+    second = [record(n, 10) for n in range(4, 8)]
+    assert all(ring.push(payload) for payload in second)
+    assert ring.drain() == second
+    assert ring.dropped == 0
+
+
+def test_wraps_when_no_room_for_a_marker(ring):
+    # 62 bytes used leaves less than a length field before the end
+    first = [record(1, 31 - LENGTH.size), record(2, 31 - LENGTH.size)]
+    assert all(ring.push(payload) for payload in first)
+    assert ring.drain() == first
+
+    second = [record(3, 4), record(4, 20)]
+    assert all(ring.push(payload) for payload in second)
+    assert ring.drain() == second
+
+
+def test_many_laps_keep_order(ring):
+    expected = []
+    received = []
+    for number in range(200):
+        payload = record(number, number % 13 + 1)
+        assert ring.push(payload)
+        expected.append(payload)
+        if number % 3 == 2:
+            received += ring.drain()
+    received += ring.drain()
+    assert received == expected
+
+
+def test_full_ring_drops_and_counts(ring):
+    pushed = []
+    while ring.push(record(len(pushed), 10)):
+        pushed.append(record(len(pushed), 10))
+    assert not ring.push(record(99, 10))
+    assert ring.dropped == 2
+
+    # The records already in the ring are untouched, and there is room again after a drain
+    assert ring.drain() == pushed
+    assert ring.push(record(100, 10))
+    assert ring.drain() == [record(100, 10)]
+    assert ring.dropped == 2
+
+
+def test_consumer_attaches_by_name(ring):
+    consumer = EventRing(ring.name, capacity=64)
+    try:
+        ring.push(b"event")
+        assert consumer.drain() == [b"event"]
+        assert ring.drain() == []
+    finally:
+        consumer.close()
@@ -0,0 +1,103 @@
+"""
+Description: Tests for the response frame cache: hits, misses, dropping frames of an old snapshot
+version, the size bound, and that device info frames survive new sensor values.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import pytest
+from simulator.frame_cache import ResponseFrameCache
+from simulator.mssp_codec import LIGHT_SENSOR_ADDRESS, MSG_DEVICE_INFO_REQ, MsspMessage, MsspPort
+from simulator.responder import MsspResponder
+
+
+def builder(frame, calls):
+    def build():
+        calls.append(frame)
+        return frame
+    return build
+
+
+def test_hit_after_miss():
+    cache = ResponseFrameCache()
+    calls = []
+    assert cache.lookup(1, "a", builder(b"A", calls)) == b"A"
+    assert cache.lookup(1, "a", builder(b"other", calls)) == b"A"
+    assert calls == [b"A"]
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+
+def test_new_version_drops_old_frames():
+    cache = ResponseFrameCache()
+    calls = []
+    cache.lookup(1, "a", builder(b"A1", calls))
+    assert cache.lookup(2, "a", builder(b"A2", calls)) == b"A2"
+    assert (cache.hits, cache.misses, len(cache)) == (0, 2, 1)
+
+
+def test_version_none_never_expires():
+    cache = ResponseFrameCache()
+    calls = []
+    cache.lookup(None, "a", builder(b"A", calls))
+    cache.lookup(None, "a", builder(b"A", calls))
+    assert calls == [b"A"]
+
+
+def test_full_cache_starts_over():
+    cache = ResponseFrameCache(max_entries=3)
+    calls = []
+    for key in "abc":
+        cache.lookup(1, key, builder(key.encode(), calls))
+    assert len(cache) == 3
+    cache.lookup(1, "d", builder(b"d", calls))
+    assert len(cache) == 1
+    cache.lookup(1, "a", builder(b"a", calls))
+    assert calls == [b"a", b"b", b"c", b"d", b"a"]
+    assert cache.misses == 5
+
+
+def test_invalidate():
+    cache = ResponseFrameCache()
+    calls = []
+    cache.lookup(None, "a", builder(b"A", calls))
+    cache.invalidate()
+    assert len(cache) == 0
+    cache.lookup(None, "a", builder(b"A", calls))
+    assert calls == [b"A", b"A"]
+
+
+@pytest.fixture
+def responder():
+    pytest.importorskip("serial")
+    responder = MsspResponder("loop://", 9600, "log")
+    responder.attach_port(MsspPort("loop://", timeout=0))
+    yield responder
+    responder.mssp.close()
+
+
+def poll_device_info(responder, counter=1):
+    device = responder.devices.lookup(LIGHT_SENSOR_ADDRESS)
+    message = MsspMessage.create(MSG_DEVICE_INFO_REQ, ctrl=0x40 | counter)
+    return responder.dispatcher.dispatch(MSG_DEVICE_INFO_REQ, device, message, message.get_ctrl(), 0)
+
+
+def test_device_info_frame_survives_new_sensor_values(responder):
+    device = responder.devices.lookup(LIGHT_SENSOR_ADDRESS)
+    _, first = poll_device_info(responder)
+    for light in (100, 200, 300):
+        responder.update_sensor_values(light, 20, 24)
+        _, frame = poll_device_info(responder)
+        assert frame is first
+    assert (device.info_frames.hits, device.info_frames.misses) == (3, 1)
+
+
+def test_device_info_frame_follows_identity_and_counter(responder):
+    device = responder.devices.lookup(LIGHT_SENSOR_ADDRESS)
+    _, first = poll_device_info(responder, counter=1)
+    _, other_counter = poll_device_info(responder, counter=2)
+    assert other_counter != first
+    device.dev_id = 1234
+    _, other_id = poll_device_info(responder, counter=1)
+    assert other_id != first
+    assert device.info_frames.misses == 3
@@ -0,0 +1,100 @@
+"""
+Description: Tests for the latency histograms: every value lands in the bucket whose bounds hold it,
+and the percentiles shown in the GUI match a known distribution.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import random
+import pytest
+from simulator.latency import (
+    BUCKET_COUNT, LATE_RESPONSE_NS, SUB_BUCKETS, LatencyHistogram, LatencyRecorder, bucket_bounds, bucket_index
+)
+from simulator.mssp_codec import MSG_GET_LIGHT_VALUE_REQ
+
+
+# Buckets that still fit a 64 bit ns counter
+INDEXES = [index for index in range(BUCKET_COUNT) if bucket_bounds(index)[1] <= 1 << 64]
+
+
+def test_bucket_edges():
+    for index in INDEXES:
+        lower, upper = bucket_bounds(index)
+        assert lower < upper
+        assert bucket_index(lower) == index, index
+        assert bucket_index(upper - 1) == index, index
+        assert bucket_index(upper) == index + 1, index
+
+
+def test_buckets_are_contiguous_and_narrow():
+    for index in INDEXES[:-1]:
+        assert bucket_bounds(index)[1] == bucket_bounds(index + 1)[0]
+    for index in INDEXES[SUB_BUCKETS:]:
+        lower, upper = bucket_bounds(index)
+        assert (upper - lower) * SUB_BUCKETS <= lower
+
+
+def test_random_values_fall_inside_their_bucket():
+    rng = random.Random(3)
+    for _ in range(10000):
+        value = rng.randrange(1 << rng.randrange(1, 63))
+        lower, upper = bucket_bounds(bucket_index(value))
+        assert lower <= value < upper
+
+
+def test_negative_values_go_to_the_first_bucket():
+    assert bucket_index(-5) == 0
+
+
+def expected_percentile(values, fraction):
+    ordered = sorted(values)
+    wanted = max(1, int(round(fraction * len(ordered))))
+    lower, upper = bucket_bounds(bucket_index(ordered[wanted - 1]))
+    return min((lower + upper) // 2, ordered[-1])
+
+
+def test_percentiles_of_a_known_distribution():
+    # 1 us to 1 ms in 1 us steps, shuffled so the order of recording does not matter
+    values = [step * 1000 for step in range(1, 1001)]
+    random.Random(5).shuffle(values)
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    for fraction in (0.5, 0.9, 0.99, 0.999):
+        assert histogram.percentile(fraction) == expected_percentile(values, fraction)
+        # Within one bucket width of the exact percentile
+        assert histogram.percentile(fraction) == pytest.approx(fraction * 1_000_000, rel=0.125)
+
+    data = histogram.to_dict()
+    assert data["count"] == 1000
+    assert data["min_us"] == 1.0 and data["max_us"] == 1000.0
+    assert data["mean_us"] == 500.5
+    assert sum(bucket[2] for bucket in data["buckets"]) == 1000
+
+
+def test_percentile_never_exceeds_the_maximum():
+    histogram = LatencyHistogram()
+    for _ in range(10):
+        histogram.record(250_000)
+    assert histogram.percentile(0.5) <= 250_000
+    assert histogram.percentile(0.999) == histogram.percentile(0.5)
+
+
+def test_empty_histogram():
+    assert LatencyHistogram().percentile(0.99) == 0
+    assert LatencyHistogram().to_dict()["count"] == 0
+
+
+def test_recorder_counts_late_responses_and_keeps_its_state():
+    recorder = LatencyRecorder()
+    recorder.record(MSG_GET_LIGHT_VALUE_REQ, 80_000)
+    recorder.record(MSG_GET_LIGHT_VALUE_REQ, LATE_RESPONSE_NS + 1)
+    assert recorder.late == 1
+    assert recorder.totals() == (2, 80_000 + LATE_RESPONSE_NS + 1)
+
+    mirror = LatencyRecorder()
+    mirror.load_state(recorder.state())
+    assert mirror.summary_lines() == recorder.summary_lines()
+    assert mirror.to_dict()["commands"] == recorder.to_dict()["commands"]
@@ -0,0 +1,119 @@
+"""
+Description: Tests for the MSSP codec: COBS against the examples of the MSSP spec, the CRC16-CCITT
+range of a frame and the incremental frame decoder.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import struct
+import pytest
+from simulator.mssp_codec import (
+    MsspError, MsspCrcError, MsspMessage, FrameDecoder, MAX_FRAME_SIZE, MSG_GET_LIGHT_VALUE_REQ,
+    cobs_encode, cobs_decode, crc16_ccitt, decode_frame
+)
+
+
+def run(first, last):
+    return bytes(range(first, last + 1))
+
+
+# Table 4 of the MSSP spec, without the 0x00 frame delimiter the table adds at the end
+COBS_EXAMPLES = [
+    (bytes.fromhex("00"), bytes.fromhex("0101")),
+    (bytes.fromhex("0000"), bytes.fromhex("010101")),
+    (bytes.fromhex("11220033"), bytes.fromhex("0311220233")),
+    (bytes.fromhex("11223344"), bytes.fromhex("0511223344")),
+    (bytes.fromhex("11000000"), bytes.fromhex("0211010101")),
+    (run(0x01, 0xFE), b"\xff" + run(0x01, 0xFE)),
+    (b"\x00" + run(0x01, 0xFE), b"\x01\xff" + run(0x01, 0xFE)),
+    (run(0x01, 0xFF), b"\xff" + run(0x01, 0xFE) + b"\x02\xff"),
+    (run(0x02, 0xFF) + b"\x00", b"\xff" + run(0x02, 0xFF) + b"\x01\x01"),
+    (run(0x03, 0xFF) + b"\x00\x01", b"\xfe" + run(0x03, 0xFF) + b"\x02\x01")
+]
+
+
+@pytest.mark.parametrize("data, encoded", COBS_EXAMPLES)
+def test_cobs_encode_matches_spec_examples(data, encoded):
+    assert cobs_encode(data) == encoded
+
+
+@pytest.mark.parametrize("data, encoded", COBS_EXAMPLES)
+def test_cobs_decode_matches_spec_examples(data, encoded):
+    assert cobs_decode(encoded) == data
+    assert cobs_decode(memoryview(encoded)) == data
+
+
+@pytest.mark.parametrize("encoded", [b"\x00\x11", b"\x05\x11\x22", b"\x02\x11\x00"])
+def test_cobs_decode_rejects_invalid_data(encoded):
+    with pytest.raises(MsspError):
+        cobs_decode(encoded)
+
+
+# Standard check value of CRC16-CCITT with initial value 0xFFFF ("CRC-16/CCITT-FALSE")
+def test_crc16_ccitt_check_value():
+    assert crc16_ccitt(b"123456789") == 0x29B1
+
+
+def test_crc_covers_ctrl_to_end_of_data():
+    message = MsspMessage.create(MSG_GET_LIGHT_VALUE_REQ, b"\x05\x00", ctrl=0x43)
+    frame = message.encode()
+    assert frame[0] == 0 and frame[-1] == 0
+    decoded = cobs_decode(frame[1:-1])
+    assert bytes(decoded[:-2]) == bytes(message)
+    (crc,) = struct.unpack("<H", decoded[-2:])
+    assert crc == crc16_ccitt(bytes(message)[1:])
+    assert crc != crc16_ccitt(bytes(message))
+
+
+# VER is outside the CRC, CTRL is the first byte inside it
+def test_decode_frame_checks_crc_from_ctrl():
+    decoded = cobs_decode(MsspMessage.create(MSG_GET_LIGHT_VALUE_REQ, b"\x05\x00", ctrl=0x43).encode()[1:-1])
+
+    other_version = bytearray(decoded)
+    other_version[0] ^= 0x02
+    assert decode_frame(cobs_encode(other_version))[0] == other_version[0]
+
+    other_ctrl = bytearray(decoded)
+    other_ctrl[1] ^= 0x02
+    with pytest.raises(MsspCrcError):
+        decode_frame(cobs_encode(other_ctrl))
+
+
+def test_decoder_joins_frames_split_across_reads():
+    messages = [MsspMessage.create(MSG_GET_LIGHT_VALUE_REQ, bytes((n, 0)), ctrl=0x40 | n) for n in range(1, 4)]
+    stream = b"".join(message.encode() for message in messages)
+    decoder = FrameDecoder()
+
+    received = []
+    for position in range(len(stream)):
+        received += decoder.feed(stream[position:position + 1])
+    assert received == messages
+    assert decoder.crc_errors == 0 and decoder.framing_errors == 0
+
+
+def test_decoder_skips_garbage_and_bad_crc():
+    message = MsspMessage.create(MSG_GET_LIGHT_VALUE_REQ, b"\x05\x00", ctrl=0x41)
+    corrupted = bytearray(message.encode())
+    corrupted[3] ^= 0x01
+    decoder = FrameDecoder()
+
+    received = decoder.feed(b"\x00\x12\x00" + bytes(corrupted) + message.encode())
+    assert received == [message]
+    assert decoder.framing_errors == 1
+    assert decoder.crc_errors == 1
+
+
+def test_decoder_drops_oversized_partial_frame():
+    message = MsspMessage.create(MSG_GET_LIGHT_VALUE_REQ, b"\x05\x00", ctrl=0x41)
+    decoder = FrameDecoder()
+
+    assert decoder.feed(b"\x11" * (MAX_FRAME_SIZE + 1)) == []
+    assert decoder.framing_errors == 1
+    assert decoder.feed(message.encode()) == [message]
+
+
+def test_decoder_keeps_raw_frame():
+    frame = MsspMessage.create(MSG_GET_LIGHT_VALUE_REQ, b"\x05\x00", ctrl=0x41).encode()
+    (message,) = FrameDecoder(keep_raw=True).feed(frame)
+    assert message.raw == frame
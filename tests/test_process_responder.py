@@ -0,0 +1,47 @@
+"""
+Description: Tests for the GUI side of the responder process: decoding the event rings, and
+dropping the events that are still waiting when the output is cleared.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import marshal
+import pytest
+from simulator.events import BusEvent
+from simulator.process_responder import (
+    EVENT_BUS, EVENT_ERROR, EVENT_METRICS, ResponderProcess
+)
+
+
+@pytest.fixture
+def process():
+    process = ResponderProcess("loop://")
+    yield process
+    process.stop()
+
+
+def push(ring, event):
+    assert ring.push(marshal.dumps(event))
+
+
+def test_events_decodes_both_rings(process):
+    push(process.ring, (EVENT_BUS, BusEvent.info(" hello").to_tuple()))
+    push(process.ring, (EVENT_ERROR, "port gone"))
+    push(process.ring, b"not marshal")
+    events = process.events()
+    assert events[0].payload == " hello"
+    assert events[1:] == ["port gone"]
+    assert process.corrupt_records == 1
+    assert process.events() == []
+
+
+def test_discard_keeps_errors_and_counters(process):
+    metrics = (1000, 10, 9, 1, 0, 0, 0, 9, 90000, 900)
+    push(process.ring, (EVENT_BUS, BusEvent.info(" before clear").to_tuple()))
+    push(process.ring, (EVENT_ERROR, "port gone"))
+    push(process.status_ring, (EVENT_METRICS, metrics))
+
+    assert process.discard_events() == ["port gone"]
+    assert tuple(process.metrics()) == metrics
+    assert process.events() == []
@@ -0,0 +1,72 @@
+"""
+Description: Tests for the scenario file schema: the shipped scenarios.yaml loads, and every kind of
+broken entry is rejected with a ScenarioError instead of reaching the GUI or the responder.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import pytest
+from simulator.scenarios import MANUAL_SITUATION, SCENARIOS_PATH, ScenarioError, load_scenarios
+
+yaml = pytest.importorskip("yaml")
+
+
+def scenario(**changes):
+    entry = {"key": "tunnel", "title": "Train inside a tunnel", "light": 20, "temp": 21, "voltage": 24, "image": "Tunnel"}
+    entry.update(changes)
+    return {field: value for field, value in entry.items() if value is not None}
+
+
+def write(tmp_path, entries):
+    path = tmp_path / "scenarios.yaml"
+    path.write_text(entries if isinstance(entries, str) else yaml.safe_dump(entries), encoding="utf-8")
+    return str(path)
+
+
+def test_shipped_scenarios_load():
+    table = load_scenarios(SCENARIOS_PATH)
+    assert len(table) > 0
+    assert all(table.find(key) is not None for key in table.keys())
+
+
+def test_valid_scenario_with_curve(tmp_path):
+    curves = {"light": [["hold", 20, 5.0], ["strobe", 20, 800, 10, 1.0, 0.3], ["shadow", 800, 100, 2]]}
+    table = load_scenarios(write(tmp_path, [scenario(curves=curves, image_intensity=2)]))
+    (loaded,) = table
+    assert loaded.key == "tunnel" and loaded.image_intensity == 2
+    assert loaded.light_curve == (("hold", 20, 5.0), ("strobe", 20, 800, 10, 1.0, 0.3), ("shadow", 800, 100, 2))
+    assert loaded.temp_curve is None
+    assert table.find("Train inside a tunnel") is loaded
+
+
+@pytest.mark.parametrize("entries, message", [
+    ("- key: [unclosed", "not valid YAML"),
+    ({"key": "tunnel"}, "must be a list"),
+    (["tunnel"], "mapping"),
+    ([scenario(image=None)], "missing image"),
+    ([scenario(colour="red")], "unknown colour"),
+    ([scenario(key="Tunnel")], "key must be"),
+    ([scenario(title="  ")], "title must be"),
+    ([scenario(title=MANUAL_SITUATION)], "reserved"),
+    ([scenario(light="bright")], "light must be a number"),
+    ([scenario(temp=True)], "temp must be a number"),
+    ([scenario(image_intensity=1.5)], "image_intensity"),
+    ([scenario(curves={"humidity": [["hold", 1, 1]]})], "curves may only have"),
+    ([scenario(curves={"light": ["hold", 1, 1]})], "list of segments"),
+    ([scenario(curves={"light": [["flash", 1, 1]]})], "Unknown curve segment"),
+    ([scenario(curves={"light": [["ramp", 1, 1]]})], "needs 3 to 3 values"),
+    ([scenario(curves={"light": [["hold", "high", 1]]})], "only hold numbers"),
+    ([scenario(curves={"light": [["shadow", 800, 100, 0]]})], "duration above 0"),
+    ([scenario(curves={"light": [["strobe", 0, 800, 0, 1]]})], "frequency above 0"),
+    ([scenario(), scenario(title="Another title")], "key 'tunnel'"),
+    ([scenario(), scenario(key="other")], "title 'Train inside a tunnel'")
+])
+def test_rejects_broken_scenarios(tmp_path, entries, message):
+    with pytest.raises(ScenarioError, match=message):
+        load_scenarios(write(tmp_path, entries))
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(ScenarioError, match="Could not read"):
+        load_scenarios(str(tmp_path / "missing.yaml"))
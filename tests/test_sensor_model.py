@@ -0,0 +1,61 @@
+"""
+Description: Tests for the sensor model: the averages from the cumulative sums must equal the plain
+mean of the last n measurements, also after the ring has wrapped around.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import pytest
+from simulator.sensor_model import NORMALIZED_MAX, RING_CAPACITY, NoiseSource, SensorModel
+
+
+def brute_force_average(measurements, n):
+    n = max(1, min(n, len(measurements), RING_CAPACITY - 1))
+    window = measurements[-n:]
+    return round(sum(window) / len(window))
+
+
+@pytest.mark.parametrize("kind", ["gaussian", "flicker", "drift"])
+def test_average_matches_brute_force(kind):
+    model = SensorModel(NoiseSource(kind, level=25.0, seed=7, block_size=64))
+    measurements = []
+    for step in range(3 * RING_CAPACITY + 17):
+        measurements.append(model.measure(400 + step % 50))
+        for n in (1, 2, 5, 64, 255, 300):
+            assert model.average(n) == brute_force_average(measurements, n), (step, n)
+        assert model.last() == measurements[-1]
+
+
+def test_read_normalizes_to_0_1000():
+    model = SensorModel(NoiseSource("none"))
+    assert model.read(1500, 5) == (1500, NORMALIZED_MAX, NORMALIZED_MAX)
+    model.reset()
+    assert model.read(-20, 5) == (-20, 0, 0)
+
+
+def test_empty_and_reset():
+    model = SensorModel(NoiseSource("none"))
+    assert model.average(5) == 0 and model.last() == 0
+    model.measure(300)
+    model.reset()
+    assert model.average(5) == 0 and model.last() == 0
+    model.measure(200)
+    assert model.average(5) == 200
+
+
+def test_noise_is_reproducible_with_a_seed():
+    first = NoiseSource("gaussian", level=3.0, seed=42, block_size=16)
+    second = NoiseSource("gaussian", level=3.0, seed=42, block_size=16)
+    assert [first.next() for _ in range(50)] == [second.next() for _ in range(50)]
+
+
+def test_noiseless():
+    assert SensorModel(NoiseSource("none")).noiseless
+    assert SensorModel(NoiseSource("gaussian", level=0)).noiseless
+    assert not SensorModel(NoiseSource("gaussian", level=1.0, seed=1)).noiseless
+
+
+def test_unknown_noise_kind():
+    with pytest.raises(ValueError):
+        NoiseSource("pink")
@@ -0,0 +1,79 @@
+"""
+Description: Tests for the sensor values in shared memory: the reader only takes values from a
+finished update, retries while one is being written, and keeps the last good values when the
+writer never finishes.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import threading
+import pytest
+from simulator.curves import compile_curves
+from simulator.shared_state import SEQUENCE, SharedSensorState, SharedSensorView
+
+
+@pytest.fixture
+def state():
+    state = SharedSensorState(light=100, temp=25, voltage=5)
+    yield state
+    state.close()
+
+
+@pytest.fixture
+def view(state):
+    view = SharedSensorView(state.name)
+    yield view
+    view.close()
+
+
+def test_reads_published_values(state, view):
+    assert view.current()[:3] == (100, 25, 5)
+    state.publish(400, 30, 12)
+    snapshot = view.current()
+    assert snapshot[:4] == (400, 30, 12, 1)
+    assert view.current() is snapshot
+
+
+def test_keeps_last_values_while_writer_is_stuck(state, view):
+    state.publish(400, 30, 12)
+    good = view.current()
+
+    # A writer that died between its two sequence writes leaves the sequence odd
+    sequence = SEQUENCE.unpack_from(state.shm.buf, 0)[0]
+    SEQUENCE.pack_into(state.shm.buf, 0, sequence + 1)
+    assert view.current() is good
+
+    SEQUENCE.pack_into(state.shm.buf, 0, sequence + 2)
+    assert view.current()[:3] == (400, 30, 12)
+
+
+def test_never_reads_half_an_update(state, view):
+    done = threading.Event()
+
+    def writer():
+        for value in range(20000):
+            state.publish(value, value, value)
+        done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while not done.is_set():
+        light, temp, voltage = view.current()[:3]
+        assert light == temp == voltage
+    thread.join()
+    assert view.current()[:3] == (19999, 19999, 19999)
+
+
+def test_answers_plain_values_until_curves_arrive(state, view):
+    sent = []
+    state.send_curves = lambda version, curves: sent.append((version, curves))
+    curves = compile_curves([("ramp", 0, 1000, 1.0)], 30, 12)
+    state.publish(400, 30, 12, curves)
+
+    snapshot = view.current()
+    assert snapshot[:3] == (400, 30, 12)
+    assert snapshot.curves is None
+
+    view.add_curves(*sent[0])
+    assert view.current().curves is curves
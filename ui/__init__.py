@@ -1,17 +1,21 @@
-from .main_window import SensorMonitorMainWindow
-from .situation_panel import SituationPanel
-from .render_panel import RenderPanel
-from .input_panel import InputPanel
-from .output_panel import OutputPanel
-from .view_input_panel import ViewInputPanel
-from .styles import apply_main_style
+# Panels are imported on first use, so "import ui" does not pull in every PyQt6 widget module
+_EXPORTS = {
+    "SensorMonitorMainWindow": ".main_window",
+    "SituationPanel": ".situation_panel",
+    "RenderPanel": ".render_panel",
+    "InputPanel": ".input_panel",
+    "OutputPanel": ".output_panel",
+    "ViewInputPanel": ".view_input_panel",
+    "apply_main_style": ".styles"
+}
 
-__all__ = [
-    "SensorMonitorMainWindow",
-    "SituationPanel",
-    "RenderPanel",
-    "InputPanel",
-    "OutputPanel",
-    "ViewInputPanel",
-    "apply_main_style"
-]
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,169 @@
+"""
+Description: Asset pack for the GUI. All images and the stylesheet go into one file with an offset
+index, which is memory-mapped once, so start-up and scenario switching do not open dozens of small
+files (slow to extract in PyInstaller builds). Python only slices the map, Qt still copies an image
+into a QByteArray once when it decodes it. Assets are
+found relative to the project, not the working directory, and loose files under assets/ are used
+when no pack has been built. Build the pack with: python -m ui.asset_pack
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+
+# PyInstaller unpacks bundled data to sys._MEIPASS, otherwise the project folder is one up from ui/
+PROJECT_DIR = getattr(sys, "_MEIPASS", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ASSETS_DIR = os.path.join(PROJECT_DIR, "assets")
+PACK_PATH = os.path.join(PROJECT_DIR, "assets.pack")
+
+# File layout:
+#   header : magic, version, number of entries, offset of the index
+#   data   : the asset files one after the other, each starting on a DATA_ALIGNMENT boundary
+#   index  : per entry data offset, size and name length, then the name (utf-8, "/" separated)
+PACK_MAGIC = b"SSASSETS"
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct("<8sIIQ")
+INDEX_ENTRY = struct.Struct("<QQH")
+DATA_ALIGNMENT = 16
+
+
+class AssetPack:
+
+    def __init__(self, path=PACK_PATH):
+        self.path = path
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._data) < PACK_HEADER.size:
+            raise ValueError(f"{path} is not an asset pack")
+
+        magic, version, count, index_offset = PACK_HEADER.unpack_from(self._data, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{path} is not an asset pack")
+
+        # Read the whole index once, after that every lookup is a dictionary access
+        self._entries = {}
+        offset = index_offset
+        for _ in range(count):
+            data_offset, size, name_length = INDEX_ENTRY.unpack_from(self._data, offset)
+            offset += INDEX_ENTRY.size
+            name = self._data[offset:offset + name_length].decode("utf-8")
+            offset += name_length
+            if data_offset + size > index_offset:
+                raise ValueError(f"{path} is damaged, {name} points past the data")
+            self._entries[name] = (data_offset, size)
+
+    # View of the asset in the map, None if the pack has no such asset
+    def data(self, name):
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        offset, size = entry
+        return memoryview(self._data)[offset:offset + size]
+
+    # Assets in the pack have no file of their own
+    def file_path(self, name):
+        return None
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def names(self):
+        return sorted(self._entries)
+
+    def close(self):
+        try:
+            self._data.close()
+        except BufferError:
+            pass  # Qt or the caches still hold a view, the map goes away with it
+        self._file.close()
+
+
+class AssetDirectory:
+    """Loose files under assets/, used when no asset pack has been built."""
+
+    def __init__(self, path=ASSETS_DIR):
+        self.path = path
+
+    def data(self, name):
+        try:
+            with open(os.path.join(self.path, *name.split("/")), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    # The file Qt can read the asset from itself, None if there is no such asset
+    def file_path(self, name):
+        path = os.path.join(self.path, *name.split("/"))
+        return path if os.path.isfile(path) else None
+
+    def __contains__(self, name):
+        return self.file_path(name) is not None
+
+    def names(self):
+        return sorted(
+            os.path.relpath(os.path.join(folder, file), self.path).replace(os.sep, "/")
+            for folder, _, files in os.walk(self.path) for file in files
+        )
+
+    def close(self):
+        pass
+
+
+_assets = None
+
+
+# The asset source for this process: the pack when there is one, else the loose files
+def assets():
+    global _assets
+    if _assets is None:
+        try:
+            _assets = AssetPack(PACK_PATH) if os.path.exists(PACK_PATH) else AssetDirectory(ASSETS_DIR)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not open asset pack: {e}")
+            _assets = AssetDirectory(ASSETS_DIR)
+    return _assets
+
+
+# Pack every file under source_dir into one asset pack, returns the number of assets
+def write_pack(source_dir=ASSETS_DIR, path=PACK_PATH):
+    names = AssetDirectory(source_dir).names()
+    index = bytearray()
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as pack:
+        pack.write(b"\0" * PACK_HEADER.size)
+        for name in names:
+            pack.write(b"\0" * (-pack.tell() % DATA_ALIGNMENT))
+            offset = pack.tell()
+            with open(os.path.join(source_dir, *name.split("/")), "rb") as f:
+                data = f.read()
+            pack.write(data)
+            encoded_name = name.encode("utf-8")
+            index += INDEX_ENTRY.pack(offset, len(data), len(encoded_name)) + encoded_name
+
+        index_offset = pack.tell()
+        pack.write(index)
+        pack.seek(0)
+        pack.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(names), index_offset))
+    # Replace the old pack only once the new one is complete
+    os.replace(temporary_path, path)
+    return len(names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the GUI asset pack from the assets folder")
+    parser.add_argument("--source", default=ASSETS_DIR, help="Folder with the images/ and stylesheet/ assets")
+    parser.add_argument("--output", default=PACK_PATH, help="Asset pack to write")
+    args = parser.parse_args()
+
+    count = write_pack(args.source, args.output)
+    print(f"Packed {count} assets into {args.output} ({os.path.getsize(args.output) / (1024 * 1024):.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Description: Background JPEG decoding for the render panel. A small thread pool decodes images and
+scales them to the panel size off the GUI thread: loose asset files with QImageReader straight from
+disk, assets in the pack from the memory-mapped data (QImage.fromData copies them once). The GUI
+thread only turns the finished QImage into a pixmap, so prefetched images fade in without a decode stall.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader
+from .asset_pack import assets
+
+
+class DecodeJob(QRunnable):
+
+    def __init__(self, loader, key, name, size):
+        super().__init__()
+        self.loader = loader
+        self.key = key
+        self.name = name
+        self.size = size
+
+    # Runs on a pool thread, QImage (unlike QPixmap) may be used outside the GUI thread
+    def run(self):
+        path = assets().file_path(self.name)
+        data = assets().data(self.name) if path is None else None
+        if path is not None:
+            image = QImageReader(path).read()
+        else:
+            image = QImage.fromData(data) if data is not None else QImage()
+        if not image.isNull() and self.size is not None:
+            image = image.scaled(
+                self.size,
+                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                Qt.TransformationMode.SmoothTransformation
+            )
+        # The loader lives in the GUI thread, so this signal is delivered there as a queued call
+        found = path is not None or data is not None
+        error = "" if not image.isNull() else f"Could not decode {self.name}" if found else f"No asset {self.name}"
+        self.loader.image_decoded.emit(self.key, image, error)
+
+
+class ImageLoader(QObject):
+    image_decoded = pyqtSignal(object, object, str)  # key, QImage, error (internal, from the pool threads)
+    image_ready = pyqtSignal(object, object)         # key, QImage, on the GUI thread
+
+    def __init__(self, threads=2, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(threads)
+        self.pending = set()
+        self.failed = 0
+        self.image_decoded.connect(self.on_image_decoded)
+
+    # Decode the asset called name in the background, scaled to size (a QSize) unless size is None.
+    # Returns False when the same key is already queued.
+    def request(self, key, name, size=None, priority=0):
+        if key in self.pending:
+            return False
+        self.pending.add(key)
+        self.pool.start(DecodeJob(self, key, name, size), priority)
+        return True
+
+    def on_image_decoded(self, key, image, error):
+        self.pending.discard(key)
+        if image.isNull():
+            self.failed += 1
+            return
+        self.image_ready.emit(key, image)
+
+    # Forget queued jobs that have not started yet, for example after a resize made their size stale
+    def cancel_pending(self):
+        self.pool.clear()
+        self.pending.clear()
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
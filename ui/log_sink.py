@@ -0,0 +1,85 @@
+"""
+Description: Batching log sink between the MSSP communication thread and the output panel.
+The comms thread only appends events to a bounded queue, the GUI thread drains the queue
+at a fixed frame rate and writes each batch with a single append.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+from collections import deque
+from PyQt6.QtCore import QObject, QTimer
+
+
+class LogSink(QObject):
+
+    def __init__(self, deliver, fps=20, capacity=5000, max_batch=500, parent=None):
+        super().__init__(parent)
+        # deliver(events) is called on the GUI thread with a list of simulator.events.BusEvent
+        self.deliver = deliver
+        self.max_batch = max_batch
+
+        # deque.append and popleft are thread-safe, so the comms thread never waits for the GUI
+        self._events = deque(maxlen=capacity)
+        self.posted = 0     # Written by the comms thread only
+        self.consumed = 0   # Written by the GUI thread only
+        self.trimmed = 0
+        self.flushes = 0
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(max(1, int(1000 / fps)))
+        self.timer.timeout.connect(self.flush)
+        self.timer.start()
+
+    # Called from the comms thread for every event
+    def post(self, event):
+        self._events.append(event)
+        self.posted += 1
+
+    # Drain everything queued since the last frame and hand it over in one batch
+    def flush(self):
+        count = len(self._events)
+        if not count:
+            return
+
+        events = [self._events.popleft() for _ in range(count)]
+        self.consumed += count
+
+        # Under a very fast poll loop only the newest lines are worth showing
+        if count > self.max_batch:
+            self.trimmed += count - self.max_batch
+            events = events[-self.max_batch:]
+
+        self.flushes += 1
+        self.deliver(events)
+
+    # Events that never reached the screen: pushed out of the full queue or trimmed from a batch
+    @property
+    def dropped(self):
+        overflowed = self.posted - self.consumed - len(self._events)
+        return max(overflowed, 0) + self.trimmed
+
+    # Events that shared an append with others instead of getting their own
+    @property
+    def merged(self):
+        return max(self.consumed - self.trimmed - self.flushes, 0)
+
+    def stats(self):
+        return {
+            "posted": self.posted,
+            "shown": self.consumed - self.trimmed,
+            "merged": self.merged,
+            "dropped": self.dropped,
+            "flushes": self.flushes
+        }
+
+    # Discard queued events, for example when the user clears the outputs
+    def clear(self):
+        count = len(self._events)
+        self._events.clear()
+        self.consumed += count
+        self.trimmed += count
+
+    def stop(self):
+        self.timer.stop()
+        self.flush()
@@ -0,0 +1,124 @@
+"""
+Description: Bounded, virtualized log view for the raw MSSP output. Lines live in a fixed size
+ring buffer behind a list model, and the list view only paints the rows that are visible,
+so memory stays flat and scrolling stays fast during multi-hour sessions. Bus events are kept
+as records and only turned into text when their rows are painted or copied.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+from PyQt6.QtWidgets import QListView, QAbstractItemView, QApplication
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QKeySequence
+from simulator.events import format_event, line_count
+
+
+FORMAT_CACHE_SIZE = 2000  # Formatted events kept around, a screen shows far fewer
+
+
+class RingLogModel(QAbstractListModel):
+
+    def __init__(self, capacity=100000, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self.total_lines = 0  # Every line ever appended, also the ones already overwritten
+        # A slot holds a text line, or (event, line number) for a line of a not yet formatted event
+        self._lines = [None] * capacity
+        self._formatted = {}
+        self._start = 0
+        self._count = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        return self.line(index.row())
+
+    def line(self, row):
+        entry = self._lines[(self._start + row) % self.capacity]
+        if type(entry) is str:
+            return entry
+        event, number = entry
+        lines = self._formatted.get(event)
+        if lines is None:
+            if len(self._formatted) >= FORMAT_CACHE_SIZE:
+                self._formatted.clear()
+            lines = self._formatted[event] = format_event(event)
+        return lines[number]
+
+    # Append events, each takes as many rows as it has lines but none is formatted yet
+    def append_events(self, events):
+        self.append_lines([(event, number) for event in events for number in range(line_count(event))])
+
+    # Append lines at the end, the oldest lines are overwritten once the buffer is full
+    def append_lines(self, lines):
+        self.total_lines += len(lines)
+        lines = lines[-self.capacity:]
+        if not lines:
+            return
+
+        overflow = self._count + len(lines) - self.capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            self._start = (self._start + overflow) % self.capacity
+            self._count -= overflow
+            self.endRemoveRows()
+
+        first = self._count
+        self.beginInsertRows(QModelIndex(), first, first + len(lines) - 1)
+        for offset, text in enumerate(lines):
+            self._lines[(self._start + first + offset) % self.capacity] = text
+        self._count += len(lines)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._lines = [None] * self.capacity
+        self._formatted = {}
+        self._start = 0
+        self._count = 0
+        self.endResetModel()
+
+
+class LogView(QListView):
+    """List view with the parts of the QTextEdit API the output panel uses (append, clear, setPlainText)."""
+
+    def __init__(self, capacity=100000, parent=None):
+        super().__init__(parent)
+        self.log_model = RingLogModel(capacity, self)
+        self.setModel(self.log_model)
+
+        # Same height for every row lets the view skip measuring, it only lays out visible rows
+        self.setUniformItemSizes(True)
+        self.setWordWrap(False)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+
+    def append(self, text):
+        self.log_model.append_lines(text.split("\n"))
+
+    # Bus events from the responder, formatted only when their rows become visible
+    def append_events(self, events):
+        self.log_model.append_events(events)
+
+    def setPlainText(self, text):
+        self.log_model.clear()
+        self.append(text)
+
+    def clear(self):
+        self.log_model.clear()
+
+    def toPlainText(self):
+        return "\n".join(self.log_model.line(row) for row in range(self.log_model.rowCount()))
+
+    # Copy the selected rows as text, like selecting in the old text box
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.Copy):
+            rows = sorted(index.row() for index in self.selectedIndexes())
+            QApplication.clipboard().setText("\n".join(self.log_model.line(row) for row in rows))
+            return
+        super().keyPressEvent(event)
@@ -4,19 +4,26 @@ and handles the main logic of the sensor monitor application.
 Author(s): Mohammad Amman, Thet Htar Zin
 Reviewed by: Thet Htar Zin, Salek MD PEASH BEEN
 Date: 26 May 2025
-Last Updated: 27 May 2025
+Last Updated: 18 October 2026
 
 """
 
 # Import necessary modules for UI components
 from PyQt6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QPushButton
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QTimer, QFileSystemWatcher
+import os
+import threading
 from .situation_panel import SituationPanel
 from .render_panel import RenderPanel
-from .output_panel import OutputPanel  # Enhanced with scenario responses
+from . import tone_mapping
 from .input_panel import InputPanel
 from .view_input_panel import ViewInputPanel
 from .styles import apply_main_style
+from simulator.scenarios import (
+    SCENARIOS_PATH, MANUAL_SITUATION, ScenarioError, ScenarioTable,
+    scenarios, reload_scenarios, set_scenarios, find_scenario, scenario_curves
+)
+from simulator.startup import startup_timer
 
 
 class SensorMonitorMainWindow(QMainWindow):
@@ -30,18 +37,19 @@ class SensorMonitorMainWindow(QMainWindow):
         self.setCentralWidget(main_widget)
         main_layout = QHBoxLayout(main_widget)
         
-        # Create panels
+        # Create panels, the scenario buttons and the output panel are added after the first paint
         self.situation_panel = SituationPanel()
         self.render_panel = RenderPanel()
-        self.output_panel = OutputPanel()  # Enhanced with scenario simulation
+        self.output_panel = None
         self.input_panel = InputPanel()
         self.view_input_panel = ViewInputPanel()
         
-        # Create center section (render + output panels)
+        # Create center section (render + output panels), the placeholder keeps the layout until then
         center_widget = QWidget()
-        center_layout = QVBoxLayout(center_widget)
-        center_layout.addWidget(self.render_panel)
-        center_layout.addWidget(self.output_panel)
+        self.center_layout = QVBoxLayout(center_widget)
+        self.center_layout.addWidget(self.render_panel)
+        self.output_placeholder = QWidget()
+        self.center_layout.addWidget(self.output_placeholder)
         
         # Create right section (input + view panels)
         right_widget = QWidget()
@@ -54,13 +62,9 @@ class SensorMonitorMainWindow(QMainWindow):
         main_layout.addWidget(center_widget, 1)  # Give center more space
         main_layout.addWidget(right_widget)
         
-        # Connect signals
-        self.setup_connections()
-        
-        # Set up data update timer
+        # Set up data update timer, started with the output panel
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_sensor_data)
-        self.timer.start(2000)
         
         # Apply styling
         apply_main_style(self)
@@ -85,39 +89,117 @@ class SensorMonitorMainWindow(QMainWindow):
             }
         """
         
-        # Enhanced SEND DATA button
-        send_button = QPushButton("SEND DATA TO LCU")
-        send_button.setStyleSheet(button_style)
-        send_button.clicked.connect(self.send_data_to_lcu)
+        # Enhanced SEND DATA button, connected once the output panel exists
+        self.send_button = QPushButton("SEND DATA TO LCU")
+        self.send_button.setStyleSheet(button_style)
         
-        right_layout.addWidget(send_button) 
+        right_layout.addWidget(self.send_button) 
+        self.first_paint_done = False
     
     #Basically, the end of frontend design for the main window.
 
+    # The first paint means the window is on screen, everything that can wait is started from here
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            startup_timer.mark("first_paint")
+            QTimer.singleShot(0, self.finish_startup)
+
+    # Deferred startup work: decode the banner, load the scenarios, build the output panel,
+    # and load the protocol modules and images in the background
+    def finish_startup(self):
+        self.render_panel.load_banner()
+        self.load_scenarios()
+        
+        # The output panel brings in the bus event and codec modules, so it is imported only now
+        from .output_panel import OutputPanel, preload_protocol  # Enhanced with scenario responses
+        self.output_panel = OutputPanel()  # Enhanced with scenario simulation
+        self.center_layout.replaceWidget(self.output_placeholder, self.output_panel)
+        self.output_placeholder.deleteLater()
+        
+        # Connect signals
+        self.setup_connections()
+        self.timer.start(2000)
+        
+        threading.Thread(target=preload_protocol, name="preload-protocol", daemon=True).start()
+        threading.Thread(target=tone_mapping.preload, name="preload-numpy", daemon=True).start()
+        self.prefetch_manual_images()
+        self.prefetch_scenario_images()
+
+    # Scenarios come from scenarios.yaml, a broken file still lets the window open
+    def load_scenarios(self):
+        try:
+            table = reload_scenarios()
+        except ScenarioError as e:
+            print(f"Scenarios not loaded: {e}")
+            table = ScenarioTable()
+            set_scenarios(table)
+        self.situation_panel.set_situations(table.titles())
+        
+        # Reload the scenarios when the file is saved, debounced because editors write in several steps
+        self.scenario_watcher = QFileSystemWatcher([SCENARIOS_PATH], self)
+        self.scenario_watcher.fileChanged.connect(lambda path: self.scenario_reload_timer.start())
+        self.scenario_reload_timer = QTimer(self)
+        self.scenario_reload_timer.setSingleShot(True)
+        self.scenario_reload_timer.setInterval(300)
+        self.scenario_reload_timer.timeout.connect(self.reload_scenario_file)
+
+    def prefetch_scenario_images(self):
+        self.render_panel.prefetch([(scenario.image, scenario.image_intensity) for scenario in scenarios()])
+
+    # scenarios.yaml was saved: compile it again and show the new list, a broken file keeps the old scenarios
+    def reload_scenario_file(self):
+        # Editors that save by replacing the file make the watcher forget it
+        if SCENARIOS_PATH not in self.scenario_watcher.files() and os.path.exists(SCENARIOS_PATH):
+            self.scenario_watcher.addPath(SCENARIOS_PATH)
+        try:
+            table = reload_scenarios(SCENARIOS_PATH)
+        except ScenarioError as e:
+            print(f"Scenarios not reloaded: {e}")
+            self.output_panel.processed_output.append(f" Scenario file not reloaded: {e}")
+            return
+        
+        print(f"Scenarios reloaded: {len(table)} scenarios")
+        self.output_panel.processed_output.append(f" Scenarios reloaded ({len(table)})")
+        if self.situation_panel.set_situations(table.titles()):
+            # The selected scenario is gone, back to manual input
+            self.input_panel.set_manual_mode(True)
+            self.on_situation_changed(True)
+        self.prefetch_scenario_images()
+
+    # Prefetch the images the manual light value will need
+    def prefetch_manual_images(self):
+        try:
+            light = float(self.input_panel.light_input.text() or "400")
+        except ValueError:
+            return
+        time_of_day = self.input_panel.get_selected_time_of_day()
+        self.render_panel.prefetch(self.render_panel.images_for_light(time_of_day, light))
+
     # Enhanced method to send data to LCU and show responses
     def send_data_to_lcu(self):
 
         # Get current situation from situation panel
         current_situation = self.situation_panel.get_current_situation()
-        intensities = [0, 50, 100, 150, 200, 250, 300, 400, 500, 600, 700, 800, 900, 1000]
         
         # Initialize default values
         light = 0
         temp = 0
         voltage = 0
+        curves = None
         time_of_day = "Manual"
         
         # Set values based on the selected situation
-        if current_situation == "Enter values manually":
+        if current_situation == MANUAL_SITUATION:
             try:
                 light = float(self.input_panel.light_input.text() or "400")
                 temp = float(self.input_panel.temp_input.text() or "25")
                 voltage = float(self.input_panel.voltage_input.text() or "5")
                 time_of_day = self.input_panel.get_selected_time_of_day()
                 
-                # Update render panel for manual input
-                closest_light = min(intensities, key=lambda x: abs(x - light))
-                self.render_panel.update_image(time_of_day.lower(), int(closest_light))
+                # Update render panel for manual input, the image names start with a capital (Dawn_400.jpg)
+                self.render_panel.show_light_level(time_of_day, light)
                 
             except ValueError:
                 # Handle invalid input
@@ -128,45 +210,15 @@ class SensorMonitorMainWindow(QMainWindow):
                 
         else:
             # Handle predefined scenarios with various visuals
-            scenario_data = {
-                "Train inside a tunnel": {
-                    "light": 20, "temp": 21, "voltage": 5,
-                    "image": "tunnel", "image_intensity": 1
-                },
-                "Under direct sunlight": {
-                    "light": 1000, "temp": 30, "voltage": 5,
-                    "image": "directsunlight", "image_intensity": 1
-                },
-                "Person blocking sensor": {
-                    "light": 50, "temp": 25, "voltage": 3.3,
-                    "image": "block", "image_intensity": 1
-                },
-                "Vandalizing Sensor": {
-                    "light": 10, "temp": 22, "voltage": 3.3,
-                    "image": "vandalism", "image_intensity": 1
-                },
-                "Flashing at the Sensor": {
-                    "light": 950, "temp": 22, "voltage": 5,
-                    "image": "flash", "image_intensity": 1
-                },
-                "Broken Sensor": {
-                    "light": -1000, "temp": -999, "voltage": 0,
-                    "image": "broken", "image_intensity": 1
-                },
-                "Train on fire": {
-                    "light": 800, "temp": 80, "voltage": 3.3,
-                    "image": "fire", "image_intensity": 1
-                }
-            }
-            
-            if current_situation in scenario_data:
-                data = scenario_data[current_situation]
-                light = data["light"]
-                temp = data["temp"]
-                voltage = data["voltage"]
+            data = find_scenario(current_situation)
+            if data is not None:
+                light = data.light
+                temp = data.temp
+                voltage = data.voltage
+                curves = scenario_curves(data)  # None for scenarios with constant values
                 
                 # Update render panel for scenario
-                self.render_panel.update_image(data["image"], data["image_intensity"])
+                self.render_panel.update_image(data.image, data.image_intensity)
         
         # Update the view panel to show what was sent
         self.view_input_panel.update_display((str(light), str(temp), str(voltage)))
@@ -177,7 +229,8 @@ class SensorMonitorMainWindow(QMainWindow):
             light=light,
             temp=temp,
             voltage=voltage,
-            time_of_day=time_of_day
+            time_of_day=time_of_day,
+            curves=curves
         )
         
         # Provide console feedback
@@ -190,6 +243,8 @@ class SensorMonitorMainWindow(QMainWindow):
     # Connect signals between panels
     def setup_connections(self):
         
+        self.send_button.clicked.connect(self.send_data_to_lcu)
+        
         # Connect situation changes to input panel state
         self.situation_panel.situation_changed.connect(
             self.input_panel.set_manual_mode
@@ -199,6 +254,10 @@ class SensorMonitorMainWindow(QMainWindow):
             self.on_situation_changed
         )
         
+        # Decode the images the next send is likely to need while the user is still typing
+        self.input_panel.light_input.textChanged.connect(self.prefetch_manual_images)
+        self.input_panel.time_dropdown.currentTextChanged.connect(self.prefetch_manual_images)
+        
     # Only handle situation changes when the button is pressed
     def on_situation_changed(self, is_manual):
         
@@ -207,24 +266,14 @@ class SensorMonitorMainWindow(QMainWindow):
             current_situation = self.situation_panel.get_current_situation()
             
             # Get scenario data for preview
-            scenario_data = {
-                "Train inside a tunnel": {"light": 20, "temp": 21, "voltage": 5},
-                "Under direct sunlight": {"light": 1000, "temp": 30, "voltage": 5},
-                "Person blocking sensor": {"light": 50, "temp": 25, "voltage": 3.3},
-                "Vandalizing Sensor": {"light": 10, "temp": 22, "voltage": 3.3},
-                "Flashing at the Sensor": {"light": 950, "temp": 22, "voltage": 5},
-                "Broken Sensor": {"light": -1000, "temp": -999, "voltage": 0},
-                "Train on fire": {"light": 800, "temp": 80, "voltage": 3.3}
-            }
+            data = find_scenario(current_situation)
             
-            if current_situation in scenario_data:
-                data = scenario_data[current_situation]
-                
+            if data is not None:
                 # Show preview in view panel
                 self.view_input_panel.update_display((
-                    str(data["light"]), 
-                    str(data["temp"]), 
-                    str(data["voltage"])
+                    str(data.light), 
+                    str(data.temp), 
+                    str(data.voltage)
                 ))
                 
                 # Clear LCU output and show waiting message
@@ -254,7 +303,7 @@ class SensorMonitorMainWindow(QMainWindow):
             self.timer.stop()
         
         # Stop MSSP communication
-        if hasattr(self.output_panel, 'mssp_thread') and self.output_panel.mssp_thread:
+        if getattr(self.output_panel, 'mssp_thread', None):
             self.output_panel.mssp_thread.stop()
             
         event.accept()
\ No newline at end of file
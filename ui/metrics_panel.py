@@ -0,0 +1,129 @@
+"""
+Description: Live health panel of the MSSP session. Every tick of the main window timer takes a
+snapshot of the responder's counters and shows frames/s received, responses/s sent, errors and
+timeouts, how long ago each address was polled and a sparkline of the mean turnaround latency,
+so it is visible at a glance whether the simulator keeps up with the LCU.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+from collections import deque
+from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel, QWidget
+from PyQt6.QtCore import Qt, QPointF
+from PyQt6.QtGui import QFont, QPainter, QPen, QColor
+from simulator.metrics import bus_rates
+
+
+SPARKLINE_POINTS = 60   # Two minutes of history at the 2 second tick
+STALE_POLL_S = 5.0      # Addresses not polled for this long are marked
+MAX_ADDRESSES = 6       # Poll ages shown, the most recently polled first
+
+
+class Sparkline(QWidget):
+    """Line of the last values, None leaves a gap (no responses in that interval)."""
+
+    def __init__(self, points=SPARKLINE_POINTS, parent=None):
+        super().__init__(parent)
+        self.values = deque(maxlen=points)
+        self.setMinimumHeight(36)
+
+    def add(self, value):
+        self.values.append(value)
+        self.update()
+
+    def clear(self):
+        self.values.clear()
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        width, height = self.width() - 2, self.height() - 2
+        painter.setPen(QPen(QColor("#3583d0"), 1))
+        painter.drawLine(1, height, width, height)
+
+        known = [value for value in self.values if value is not None]
+        if not known:
+            return
+        top = max(known) or 1
+        step = width / max(self.values.maxlen - 1, 1)
+        offset = self.values.maxlen - len(self.values)  # Newest value always at the right edge
+
+        painter.setPen(QPen(QColor("#2ecc71"), 1.5))
+        previous = None
+        for index, value in enumerate(self.values):
+            if value is None:
+                previous = None
+                continue
+            point = QPointF(1 + (offset + index) * step, 1 + height - height * value / top)
+            if previous is not None:
+                painter.drawLine(previous, point)
+            else:
+                painter.drawPoint(point)
+            previous = point
+
+
+class MetricsPanel(QFrame):
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.previous = None  # Snapshot of the last tick, rates are the difference to it
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.setSpacing(1)
+
+        self.throughput_label = self.add_label(layout)
+        self.health_label = self.add_label(layout)
+        self.polls_label = self.add_label(layout)
+        self.sparkline = Sparkline(parent=self)
+        self.sparkline.setToolTip("Mean turnaround latency per tick, last two minutes")
+        layout.addWidget(self.sparkline)
+        self.latency_label = self.add_label(layout)
+        self.reset()
+
+    def add_label(self, layout):
+        label = QLabel()
+        label.setFont(QFont("Consolas", 8))
+        label.setStyleSheet("color: #d4d4d4;")
+        label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        layout.addWidget(label)
+        return label
+
+    # Start over for a new session
+    def reset(self):
+        self.previous = None
+        self.sparkline.clear()
+        self.throughput_label.setText("RX: - frames/s   TX: - responses/s")
+        self.health_label.setText("Errors: 0   Timeouts: 0")
+        self.polls_label.setText("Last poll: never")
+        self.latency_label.setText("Latency: -")
+
+    # Called every tick with the responder's BusMetrics, None while there is nothing to show yet
+    def update_metrics(self, metrics):
+        if metrics is None:
+            return
+        rates = bus_rates(self.previous, metrics)
+        if self.previous is not None:
+            self.throughput_label.setText(
+                f"RX: {rates.frames_per_s:.1f} frames/s   TX: {rates.responses_per_s:.1f} responses/s"
+            )
+        self.previous = metrics
+
+        crc = f" (CRC {metrics.crc_errors})" if metrics.crc_errors else ""
+        ignored = f"   Ignored: {metrics.ignored}" if metrics.ignored else ""
+        self.health_label.setText(
+            f"Errors: {metrics.errors + metrics.crc_errors}{crc}   Timeouts: {metrics.timeouts}{ignored}"
+        )
+
+        ages = sorted(rates.poll_age_s.items(), key=lambda item: item[1])[:MAX_ADDRESSES]
+        if ages:
+            self.polls_label.setText("Last poll: " + "  ".join(
+                f"0x{address:02X} {age:.1f} s{' !' if age > STALE_POLL_S else ''}" for address, age in ages
+            ))
+
+        self.sparkline.add(rates.latency_ms)
+        known = [value for value in self.sparkline.values if value is not None]
+        if known:
+            now = f"{rates.latency_ms:.2f} ms" if rates.latency_ms is not None else "idle"
+            self.latency_label.setText(f"Latency: {now}   max {max(known):.2f} ms (2 min)")
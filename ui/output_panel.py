@@ -3,187 +3,257 @@ Description: Display area for raw and processed sensor data with MSSP communicat
 Author(s): Mohammad Amman, Thet Htar Zin
 Reviewed by: Thet Htar Zin, Salek MD PEASH BEEN
 Date: 26 May 2025
-Last Updated: 27 May 2025
+Last Updated: 18 October 2026
 
 """
 
 # Import necessary modules for UI components
 from PyQt6.QtWidgets import (
     QFrame, QVBoxLayout, QHBoxLayout, QLabel, QTextEdit,
-    QPushButton, QSpacerItem, QSizePolicy
+    QPushButton, QFileDialog, QComboBox, QCheckBox, QLineEdit
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont
-import time
-import struct
-from datetime import datetime
+from PyQt6.QtCore import Qt, QThread, QObject, pyqtSignal, QTimer
+from PyQt6.QtGui import QFont, QIntValidator
+import os
 import random
+import importlib
+import importlib.util
+from datetime import datetime
+from simulator.capture import prune_captures
+from simulator.events import Direction, Outcome
+from simulator.mssp_codec import MSG_DEVICE_INFO_REQ, MSG_GET_LIGHT_VALUE_REQ
+from .log_sink import LogSink
+from .log_view import LogView
+from .metrics_panel import MetricsPanel
 
 
 MSSP_AVAILABLE = False
 mssp_error = None
 
 try:
-    import sys
-    import os
-    # We're using tw_mssp.py library given to us.
-    # So, we add current directory to path for that file.
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    if current_dir not in sys.path:
-        sys.path.insert(0, current_dir)
-    
+    # The MSSP codec is part of this project (simulator/mssp_codec.py),
+    # so the only thing needed for real communication is pyserial.
+    # Only look it up here, it is imported in the background after the window is shown.
+    if importlib.util.find_spec("serial") is None:
+        raise ImportError("No module named 'serial'")
     
     MSSP_AVAILABLE = True
-    print("✅ MSSP library loaded successfully!")
+    print("✅ MSSP library found!")
 except Exception as e:
     mssp_error = str(e)
     MSSP_AVAILABLE = False
     print(f"❌ MSSP library failed to load: {e}")
 
-# This thread handles the MSSP communication with the LCU (Light Control Unit).
+
+# Recordings of the bus that are kept in the captures folder, the oldest go first
+KEEP_CAPTURES = 20
+
+# Status line for every command whose responses we count as a success
+RESPONSE_STATUS = {
+    MSG_GET_LIGHT_VALUE_REQ: "Success! Light data sent to LCU",
+    MSG_DEVICE_INFO_REQ: "Success! Device info sent to LCU"
+}
+
+
+# Status of a sent response, None for every other event
+def response_status(event):
+    if event.direction is Direction.TX and event.outcome is Outcome.RESPONDED:
+        return RESPONSE_STATUS.get(event.command)
+    return None
+
+
+# Import the protocol modules ahead of the first SEND, called from a background thread after startup
+def preload_protocol():
+    importlib.import_module("simulator.responder")
+    if MSSP_AVAILABLE:
+        importlib.import_module("serial")
+
+
+# This thread runs the MSSP responder (simulator/responder.py) and turns its callbacks into Qt signals.
 class MSSPCommunicationThread(QThread):
-    message_received = pyqtSignal(str, str, str)  # raw_msg, ctrl_info, response_info
+    message_received = pyqtSignal(object)  # simulator.events.BusEvent
     error_occurred = pyqtSignal(str)
     
-    def __init__(self, com_port="COM7", baud_rate=9600):
+    def __init__(self, com_port="COM7", baud_rate=9600, unknown_command_policy="log"):
         super().__init__()
+        # The protocol is loaded on demand, usually preload_protocol has done it already
+        from simulator.responder import MsspResponder
+        self.responder = MsspResponder(
+            com_port, baud_rate, unknown_command_policy,
+            on_event=self.message_received.emit,
+            on_error=self.error_occurred.emit
+        )
         self.com_port = com_port
-        self.baud_rate = baud_rate
-        self.mssp = None
-        self.running = False
-        self.current_light_value = 100
-        self.current_temp_value = 25
-        self.current_voltage_value = 5
-        
-    # Initialize the MSSP communication
-    def initialize_mssp(self):
-        
-        try:
-            # We import here to avoid issues with main thread
-            from tw_mssp import Mssp, Mssp_message, MASTER_BIT
-            self.Mssp = Mssp
-            self.Mssp_message = Mssp_message  
-            self.MASTER_BIT = MASTER_BIT
-            self.mssp = Mssp(self.com_port, self.baud_rate, 5, True)
-            return True
-        
-        except Exception as e:
-            self.error_occurred.emit(f"Failed to initialize MSSP: {str(e)}")
-            return False
+        self.latency = self.responder.latency  # Frame received to response sent, per command
     
-    # Update sensor values that will be sent to LCU
-    def update_sensor_values(self, light, temp, voltage):
-        self.current_light_value = int(light)
-        self.current_temp_value = int(temp)
-        self.current_voltage_value = int(voltage)
+    # When set, messages are batched through the log sink instead of emitted one by one
+    def set_log_sink(self, log_sink):
+        self.responder.log_sink = log_sink
     
-    # This is the main communication loop that runs in a separate thread.
-    def run(self):
+    # When set, all bus traffic is recorded to this capture file
+    def set_capture_path(self, path):
+        self.responder.capture_path = path
 
-        if not self.initialize_mssp():
-            return
-            
-        self.running = True
-        self.message_received.emit(" MSSP Communication Started", "", f"Listening on {self.com_port} at {self.baud_rate} baud")
-        
-        while self.running:
-            try:
-                # Get message from LCU (this will block until message received or timeout)
-                msg = self.mssp.get_msg()
-                
-                # Check if we got a valid message
-                if msg is None or len(msg) < 4:
-                    continue
-                    
-                ctrl = msg.get_ctrl()
-                timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                
-                # Process the message
-                raw_msg = f"[{timestamp}]  Message: {msg.hex()}" # Convert to hex string for display
-                ctrl_info = f"[{timestamp}] Control: 0x{ctrl:02X}"
-                
-                # Extract command and address
-                addr = int(msg[2])
-                cmd = int(msg[3])
-                
-                response_info = f"[{timestamp}]  Addr: 0x{addr:02X}, Cmd: 0x{cmd:02X}"
-                
-                # We tried to follow RespExample and implement process commands
-                if cmd == self.mssp.MSG_GET_LIGHT_VALUE_REQ:
-                    self.handle_light_value_request(msg, ctrl, timestamp)
-                elif cmd == self.mssp.MSG_DEVICE_INFO_REQ:
-                    self.handle_device_info_request(msg, ctrl, timestamp)
-                else:
-                    response_info += f"\n[{timestamp}]  Command: 0x{cmd:02X}"
-                
-                self.message_received.emit(raw_msg, ctrl_info, response_info)
-                
-            except Exception as e:
-                if self.running:  # Only show error if we're still supposed to be running
-                    self.error_occurred.emit(f"Communication error: {str(e)}")
-                    time.sleep(1)  # Wait before retrying
-    
-    # Handle specific requests from LCU
-    def handle_light_value_request(self, msg, ctrl, timestamp):
-        
-        try:
-            # Prepare response with current sensor values 
-            light_raw = self.current_light_value
-            light_avg = self.current_light_value + random.randint(-5, 5)  # Small variation
-            light_last = self.current_light_value
-            
-            # Create response message based on RespExample.py 
-            ctrl = ctrl & ~self.MASTER_BIT  # Flip bit 6, keep rest of mask same
-            message = self.mssp.create_msg_get_light_value_resp(light_raw, light_avg, light_last)
-            message.set_addr(self.mssp.LIGHT_SENSOR_ADDRESS)
-            message.set_ctrl(ctrl)
-            
-            # Send response
-            self.mssp.send_msg(message)
-            
-            response_info = f"[{timestamp}] ✅ Light Value Response Sent"
-            response_info += f"\n[{timestamp}]  Raw: {light_raw}, Avg: {light_avg}, Last: {light_last}"
-            
-            self.message_received.emit("", "", response_info)
-            
-        except Exception as e:
-            self.error_occurred.emit(f"Error handling light request: {str(e)}")
+    # Same as the command line --seed, call before start
+    def set_noise_seed(self, seed):
+        self.responder.devices.set_noise(seed=seed)
     
-    # Handle device info request from LCU based on RespExample.py
-    def handle_device_info_request(self, msg, ctrl, timestamp):
-        
-        try:
-            # Device info for TSA0002 sensor (reference from RespExample.py)
-            devType = 4096  # 0x00001000 Light sensor – TSA0002x (LSB format)
-            devId = 65535
-            fw = 16842753
-            addr = self.mssp.LIGHT_SENSOR_ADDRESS
-            group = 254  # 0xFE
-            
-            # Create response message (reference from RespExample.py)
-            ctrl = ctrl & ~self.MASTER_BIT  # Flip bit 6, keep rest of mask same
-            message = self.mssp.create_msg_device_info_resp(devType, devId, fw, addr, group)
-            message.set_addr(self.mssp.LIGHT_SENSOR_ADDRESS)
-            message.set_ctrl(ctrl)
-            
-            # Send response
-            self.mssp.send_msg(message)
-            
-            response_info = f"[{timestamp}] ✅ Device Info Response Sent"
-            response_info += f"\n[{timestamp}]  Type: {devType}, ID: {devId}, FW: {fw}"
-            
-            self.message_received.emit("", "", response_info)
-            
-        except Exception as e:
-            self.error_occurred.emit(f"Error handling device info request: {str(e)}")
+    # Safe to call while the thread is running, the next poll answers with the new snapshot
+    def update_sensor_values(self, light, temp, voltage, address=None, curves=None):
+        return self.responder.update_sensor_values(light, temp, voltage, address, curves)
+
+    # Health counters of the responder, read from the GUI thread
+    def metrics(self):
+        return self.responder.metrics()
     
+    # The whole communication loop runs in this thread
+    def run(self):
+        self.responder.run()
+
     # Stop the communication thread
     def stop(self):
-        self.running = False
+        self.responder.stop()
         self.quit()
         self.wait()
 
 
+# Same interface as MSSPCommunicationThread, but the responder runs in its own process
+# (simulator/process_responder.py) and this only drains its event ring on the GUI thread.
+class MSSPProcessBridge(QObject):
+    message_received = pyqtSignal(object)  # simulator.events.BusEvent
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, com_port="COM7", baud_rate=9600, unknown_command_policy="log"):
+        super().__init__()
+        from simulator.process_responder import ResponderProcess
+        self.process = ResponderProcess(com_port, baud_rate, unknown_command_policy)
+        self.com_port = com_port
+        self.latency = self.process.latency  # Mirror, updated whenever the ring is drained
+        self.log_sink = None
+        self.drain_timer = QTimer(self)
+        self.drain_timer.setInterval(50)
+        self.drain_timer.timeout.connect(self.drain)
+
+    def set_log_sink(self, log_sink):
+        self.log_sink = log_sink
+
+    def set_capture_path(self, path):
+        self.process.capture_path = path
+
+    def set_noise_seed(self, seed):
+        self.process.noise_seed = seed
+
+    def update_sensor_values(self, light, temp, voltage, address=None, curves=None):
+        return self.process.update_sensor_values(light, temp, voltage, address, curves)
+
+    # Latest health counters the process sent, None until the first ones arrived
+    def metrics(self):
+        return self.process.metrics()
+
+    def start(self):
+        self.process.start()
+        self.drain_timer.start()
+
+    def isRunning(self):
+        return self.process.is_alive()
+
+    # Hand the events over like the comms thread would, stop draining once the process has ended
+    def drain(self, events=None):
+        alive = self.process.is_alive()
+        for event in self.process.events() if events is None else events:
+            if isinstance(event, str):
+                self.error_occurred.emit(event)
+            elif self.log_sink is not None:
+                self.log_sink.post(event)
+            else:
+                self.message_received.emit(event)
+        if not alive and events is None:
+            self.stop()
+
+    # Events still waiting in the ring belong to the output that is being cleared, drop them
+    def discard_pending(self):
+        self.drain(self.process.discard_events())
+
+    def stop(self):
+        self.drain_timer.stop()
+        self.drain(self.process.stop())
+
+
+_transport = None
+
+
+# The event loop thread of simulator/async_transport.py, started by the first session that needs it
+# and shared by every later one
+def shared_transport():
+    global _transport
+    if _transport is None:
+        from simulator.async_transport import AsyncTransport
+        _transport = AsyncTransport().start()
+    return _transport
+
+
+# Same interface as MSSPCommunicationThread, but the port is served by the asyncio transport.
+# Calls from the GUI run in the loop thread through run_coroutine_threadsafe (AsyncTransport.call),
+# the responder's events come back as Qt signals, which Qt queues over to the GUI thread.
+class MSSPAsyncBridge(QObject):
+    message_received = pyqtSignal(object)  # simulator.events.BusEvent
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, com_port="COM7", baud_rate=9600, unknown_command_policy="log"):
+        super().__init__()
+        from simulator.responder import MsspResponder
+        self.responder = MsspResponder(
+            com_port, baud_rate, unknown_command_policy,
+            on_event=self.message_received.emit,
+            on_error=self.error_occurred.emit
+        )
+        self.transport = shared_transport()
+        self.com_port = com_port
+        self.baud_rate = baud_rate
+        self.latency = self.responder.latency
+
+    def set_log_sink(self, log_sink):
+        self.responder.log_sink = log_sink
+
+    def set_capture_path(self, path):
+        self.responder.capture_path = path
+
+    # The port is not served yet, so the devices can still be changed from here
+    def set_noise_seed(self, seed):
+        self.responder.devices.set_noise(seed=seed)
+
+    # Runs in the loop thread, so the values change between two requests and never during one
+    def update_sensor_values(self, light, temp, voltage, address=None, curves=None):
+        return self.transport.call(self.responder.update_sensor_values, light, temp, voltage, address, curves)
+
+    def metrics(self):
+        return self.transport.call(self.responder.metrics)
+
+    # A port that cannot be opened is reported like the comms thread reports it
+    def start(self):
+        try:
+            self.transport.add_port(self.com_port, self.responder, self.baud_rate)
+        except (OSError, ValueError) as e:
+            self.responder.report_error(f"Failed to initialize MSSP: {str(e)}")
+
+    # False once the port is closed, also when its device went away
+    def isRunning(self):
+        return self.responder.running
+
+    # Only this session's port is closed, the loop keeps serving the others
+    def stop(self):
+        self.transport.remove_port(self.com_port)
+
+
+# Where the responder of a new session runs. The event loop needs non-blocking ttys, so Linux only.
+RESPONDER_MODES = {
+    "Responder in a thread": MSSPCommunicationThread,
+    "Responder in its own process": MSSPProcessBridge
+}
+if os.name == "posix":
+    RESPONDER_MODES["Responder on the asyncio event loop"] = MSSPAsyncBridge
+
+
 class OutputPanel(QFrame):
 
     # Basically, the start of frontend UI design.
@@ -192,7 +262,11 @@ class OutputPanel(QFrame):
         self.setObjectName("outputPanel")
         self.setFrameStyle(QFrame.Shape.StyledPanel)
         self.mssp_thread = None
+        self.com_port = "COM7"
         self.setup_ui()
+        
+        # Messages from the comms thread are written at most 20 times per second
+        self.log_sink = LogSink(self.write_log_batch, fps=20, parent=self)
 
     def setup_ui(self):
         layout = QHBoxLayout(self)
@@ -220,16 +294,12 @@ class OutputPanel(QFrame):
         raw_title.setStyleSheet("color: white;")
         raw_layout.addWidget(raw_title)
 
-        self.raw_output = QTextEdit()
+        # Ring buffer backed list, keeps the newest 100 000 lines and only renders visible rows
+        self.raw_output = LogView(capacity=100000)
         self.raw_output.setFont(QFont("Consolas", 9))
         self.raw_output.setStyleSheet(
             "background-color: #1e1e1e; color: #d4d4d4; border: 2px solid #3583d0; padding: 3px;"
         )
-        self.raw_output.setReadOnly(True)
-        self.raw_output.setTextInteractionFlags(
-            Qt.TextInteractionFlag.TextSelectableByKeyboard | 
-            Qt.TextInteractionFlag.TextSelectableByMouse
-        )
         
         # Initial message
         if MSSP_AVAILABLE:
@@ -244,7 +314,7 @@ class OutputPanel(QFrame):
                 "❌ MSSP Library Not Available\n"
                 f"Error: {mssp_error}\n"
                 "Running in simulation mode\n"
-                "Install tw_mssp library for real communication"
+                "Install pyserial for real communication"
             )
         
         raw_layout.addWidget(self.raw_output)
@@ -283,6 +353,44 @@ class OutputPanel(QFrame):
         
         processed_layout.addWidget(self.processed_output)
 
+        # Throughput and health of the session, refreshed by update_automatic_data
+        self.metrics_panel = MetricsPanel()
+        processed_layout.addWidget(self.metrics_panel)
+
+        # Turnaround latency per command, refreshed by update_automatic_data
+        self.latency_label = QLabel("Latency: no requests yet")
+        self.latency_label.setFont(QFont("Consolas", 8))
+        self.latency_label.setWordWrap(True)
+        self.latency_label.setStyleSheet("color: #d4d4d4; padding: 2px;")
+        processed_layout.addWidget(self.latency_label)
+
+        # Takes effect when the next session starts
+        self.responder_dropdown = QComboBox()
+        self.responder_dropdown.addItems(list(RESPONDER_MODES))
+        self.responder_dropdown.setToolTip(
+            "Its own process keeps GUI work from delaying the answers to the LCU, "
+            "the event loop serves every port from one shared thread"
+        )
+        self.responder_dropdown.setStyleSheet("color: #d4d4d4;")
+        processed_layout.addWidget(self.responder_dropdown)
+
+        # Off by default, recording is only wanted when chasing a bus problem
+        self.capture_checkbox = QCheckBox("Record bus traffic")
+        self.capture_checkbox.setToolTip(
+            f"Takes effect when the next session starts, the last {KEEP_CAPTURES} "
+            "recordings are kept in the captures folder"
+        )
+        self.capture_checkbox.setStyleSheet("color: #d4d4d4;")
+        processed_layout.addWidget(self.capture_checkbox)
+
+        # Blank picks a new seed for every session, the seed in use is shown in the raw output
+        self.seed_input = QLineEdit()
+        self.seed_input.setPlaceholderText("Noise seed (random)")
+        self.seed_input.setValidator(QIntValidator(0, 2 ** 31 - 1))
+        self.seed_input.setToolTip("The same seed gives the same measurement noise again, like --seed on the command line")
+        self.seed_input.setStyleSheet("color: #d4d4d4;")
+        processed_layout.addWidget(self.seed_input)
+
         # Clear button
         clear_button = QPushButton("Clear All")
         clear_button.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -323,9 +431,30 @@ class OutputPanel(QFrame):
         """)
         stop_button.clicked.connect(self.stop_communication)
 
+        # Export latency histograms button
+        export_button = QPushButton("Export")
+        export_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        export_button.setToolTip("Save the turnaround latency histograms as JSON")
+        export_button.setStyleSheet("""
+            QPushButton {
+                background-color: #2c6cab;
+                color: white;
+                border: none;
+                border-radius: 6px;
+                margin-top: 5px;
+                padding: 6px 12px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #3583d0;
+            }
+        """)
+        export_button.clicked.connect(self.export_latency)
+
         button_layout = QHBoxLayout()
         button_layout.addWidget(clear_button)
         button_layout.addWidget(stop_button)
+        button_layout.addWidget(export_button)
         processed_layout.addLayout(button_layout)
 
         return processed_frame
@@ -333,25 +462,39 @@ class OutputPanel(QFrame):
     # Basically, the end of frontend UI design.
 
     # Process scenario data and start MSSP communication
-    def process_scenario_data(self, scenario, light, temp, voltage, time_of_day=None):
+    def process_scenario_data(self, scenario, light, temp, voltage, time_of_day=None, curves=None):
         if not MSSP_AVAILABLE:
             self.show_simulation_fallback(scenario, light, temp, voltage, time_of_day)
             return
         
-        # Stop any existing communication
+        # Keep the running session open and only swap the sensor values,
+        # so the LCU polls keep getting answered while the scenario changes.
+        if self.is_session_active():
+            snapshot = self.mssp_thread.update_sensor_values(light, temp, voltage, curves=curves)
+            self.show_scenario_update(scenario, snapshot)
+            return
+        
+        # Stop a session that is still running on another port
         if self.mssp_thread and self.mssp_thread.isRunning():
             self.mssp_thread.stop()
         
         # Clear previous output
         self.clear_outputs()
         
-        # Create and start MSSP communication thread
-        self.mssp_thread = MSSPCommunicationThread()
+        # Create and start MSSP communication thread, the responder process or the event loop session
+        session_class = RESPONDER_MODES[self.responder_dropdown.currentText()]
+        self.mssp_thread = session_class(self.com_port)
+        self.metrics_panel.reset()
         self.mssp_thread.message_received.connect(self.on_mssp_message_received)
         self.mssp_thread.error_occurred.connect(self.on_mssp_error)
+        self.mssp_thread.set_log_sink(self.log_sink)
+        if self.capture_checkbox.isChecked():
+            self.mssp_thread.set_capture_path(self.new_capture_path())
+        seed = self.noise_seed()
+        self.mssp_thread.set_noise_seed(seed)
         
         # Update sensor values in the thread
-        self.mssp_thread.update_sensor_values(light, temp, voltage)
+        self.mssp_thread.update_sensor_values(light, temp, voltage, curves=curves)
         
         # Start communication
         self.mssp_thread.start()
@@ -363,6 +506,9 @@ class OutputPanel(QFrame):
         self.raw_output.append(f"[{timestamp}] Light: {light} lux")
         self.raw_output.append(f"[{timestamp}] Temperature: {temp}°C")
         self.raw_output.append(f"[{timestamp}] Voltage: {voltage}V")
+        self.raw_output.append(f"[{timestamp}] Noise seed: {seed} (enter it as the seed to repeat this run)")
+        if curves is not None:
+            self.raw_output.append(f"[{timestamp}] Light follows the scenario curve ({curves.duration_s:.1f} s loop)")
         self.raw_output.append(f"[{timestamp}] Waiting for LCU messages...")
         
         self.processed_output.clear()
@@ -371,21 +517,71 @@ class OutputPanel(QFrame):
         self.processed_output.append(f"Light: {light} lux")
         self.processed_output.append("Listening for LCU...")
 
-    # Handle received MSSP messages and update outputs
-    def on_mssp_message_received(self, raw_msg, ctrl_info, response_info):
-        if raw_msg:
-            self.raw_output.append(raw_msg)
-        if ctrl_info:
-            self.raw_output.append(ctrl_info)
-        if response_info:
-            self.raw_output.append(response_info)
+    # The seed typed in, or a new random one like the command line picks without --seed
+    def noise_seed(self):
+        text = self.seed_input.text().strip()
+        return int(text) if text else random.SystemRandom().randrange(2 ** 31)
+
+    # Recorded sessions go to captures/rs485_log_<date>_<time>.cap in the project folder,
+    # older recordings are deleted so the folder does not grow without end
+    def new_capture_path(self):
+        project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        capture_dir = os.path.join(project_dir, "captures")
+        prune_captures(capture_dir, KEEP_CAPTURES - 1, prefix="rs485_log_")
+        file_name = datetime.now().strftime("rs485_log_%Y%m%d_%H%M%S.cap")
+        return os.path.join(capture_dir, file_name)
+
+    # True when a responder session is already running on our COM port
+    def is_session_active(self):
+        return (
+            self.mssp_thread is not None
+            and self.mssp_thread.isRunning()
+            and self.mssp_thread.com_port == self.com_port
+        )
+
+    # Show the new values that the running session answers with from the next poll on
+    def show_scenario_update(self, scenario, snapshot):
+        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        self.raw_output.append(f"[{timestamp}] Scenario updated (values v{snapshot.version}): {scenario}")
+        self.raw_output.append(
+            f"[{timestamp}] Light: {snapshot.light} lux, Temperature: {snapshot.temp}°C, Voltage: {snapshot.voltage}V"
+        )
+        self.processed_output.append(f"Scenario: {scenario}")
+        self.processed_output.append(f"Light: {snapshot.light} lux (active from next poll)")
+        if snapshot.curves is not None:
+            self.processed_output.append(f"Dynamic light curve, {snapshot.curves.duration_s:.1f} s loop")
+        self.scroll_to_bottom()
+
+    # Handle a bus event from the responder and update outputs
+    def on_mssp_message_received(self, event):
+        self.raw_output.append_events([event])
             
         # Update status when successful response is sent
-        if "Light Value Response Sent" in response_info:
-            self.processed_output.append("Success! Light data sent to LCU")
-        elif "Device Info Response Sent" in response_info:
-            self.processed_output.append("Success! Device info sent to LCU")
+        status = response_status(event)
+        if status is not None:
+            self.processed_output.append(status)
+            
+        self.scroll_to_bottom()
+
+    # Write a batch of events from the log sink with one append per output
+    def write_log_batch(self, events):
+        status_lines = []
+        for event in events:
+            status = response_status(event)
+            if status is None:
+                continue
             
+            # Repeated statuses are merged into one line with a count
+            if status_lines and status_lines[-1][0] == status:
+                status_lines[-1][1] += 1
+            else:
+                status_lines.append([status, 1])
+        
+        self.raw_output.append_events(events)
+        if status_lines:
+            self.processed_output.append("\n".join(
+                status if count == 1 else f"{status} (x{count})" for status, count in status_lines
+            ))
         self.scroll_to_bottom()
 
     # Handle MSSP communication errors
@@ -405,40 +601,65 @@ class OutputPanel(QFrame):
         self.raw_output.append(f"[{timestamp}]  Light: {light} lux")
         self.raw_output.append(f"[{timestamp}]   Temperature: {temp}°C")
         self.raw_output.append(f"[{timestamp}]  Voltage: {voltage}V")
-        self.raw_output.append(f"[{timestamp}]  tw_mssp library not available")
+        self.raw_output.append(f"[{timestamp}]  pyserial not available")
         self.raw_output.append(f"[{timestamp}]  Install library for real communication")
         
         self.processed_output.clear()
         self.processed_output.append(" Simulation Mode")
         self.processed_output.append(f" {scenario}")
         self.processed_output.append(f" Light: {light} lux")
-        self.processed_output.append(" MSSP library required")
+        self.processed_output.append(" pyserial required")
 
     # Stop MSSP communication when user clicks stop button
     # Otherwise, it will run until user closes the application.
     def stop_communication(self):
         if self.mssp_thread and self.mssp_thread.isRunning():
             self.mssp_thread.stop()
+            self.log_sink.flush()
             timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+            stats = self.log_sink.stats()
             self.raw_output.append(f"[{timestamp}] 🛑 Communication stopped by user")
+            self.raw_output.append(
+                f"[{timestamp}] Log: {stats['posted']} events, {stats['merged']} merged, {stats['dropped']} dropped"
+            )
             self.processed_output.append("🛑 Communication stopped")
 
-    # Placeholder for automatic data updates (if needed in future)
+    # Called every 2 seconds by the main window, shows the latest health and latency numbers
     def update_automatic_data(self):
-    
-        pass
+        if self.mssp_thread is None:
+            return
+        self.metrics_panel.update_metrics(self.mssp_thread.metrics())
+        lines = self.mssp_thread.latency.summary_lines()
+        if lines:
+            self.latency_label.setText("\n".join(lines))
+
+    # Save the latency histograms of the current session as JSON
+    def export_latency(self):
+        if self.mssp_thread is None:
+            self.processed_output.append(" No session to export latency from")
+            return
+        file_name = datetime.now().strftime("latency_%Y%m%d_%H%M%S.json")
+        path, _ = QFileDialog.getSaveFileName(self, "Export latency histograms", file_name, "JSON files (*.json)")
+        if not path:
+            return
+        try:
+            self.mssp_thread.latency.export(path)
+            self.processed_output.append(f" Latency exported to {os.path.basename(path)}")
+        except OSError as e:
+            self.on_mssp_error(f"Could not export latency: {str(e)}")
 
     # Scroll both outputs to the bottom
     def scroll_to_bottom(self):
-        self.raw_output.verticalScrollBar().setValue(
-            self.raw_output.verticalScrollBar().maximum()
-        )
+        self.raw_output.scrollToBottom()
         self.processed_output.verticalScrollBar().setValue(
             self.processed_output.verticalScrollBar().maximum()
         )
 
     # Clear both output areas
     def clear_outputs(self):
+        if isinstance(self.mssp_thread, MSSPProcessBridge):
+            self.mssp_thread.discard_pending()
+        self.log_sink.clear()
         self.raw_output.clear()
         self.processed_output.clear()
         if MSSP_AVAILABLE:
@@ -452,4 +673,5 @@ class OutputPanel(QFrame):
     def closeEvent(self, event):
         if self.mssp_thread and self.mssp_thread.isRunning():
             self.mssp_thread.stop()
+        self.log_sink.stop()
         event.accept()
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Description: Memory-bounded LRU cache of decoded and pre-scaled pixmaps for the render panel.
+Switching back to an image that was shown before needs no disk I/O and no rescaling.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+from collections import OrderedDict
+
+
+class PixmapCache:
+
+    # budget_bytes bounds the decoded pixel data, the least recently used pixmaps go first
+    def __init__(self, budget_bytes=96 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._pixmaps = OrderedDict()
+
+    @staticmethod
+    def cost(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    # Cached pixmap for key, or None. A hit makes the entry the most recently used one.
+    def get(self, key):
+        entry = self._pixmaps.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._pixmaps.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, pixmap):
+        self.remove(key)
+        cost = self.cost(pixmap)
+        # A pixmap bigger than the whole budget is not kept at all
+        if cost > self.budget_bytes:
+            return pixmap
+        self._pixmaps[key] = (pixmap, cost)
+        self.used_bytes += cost
+        while self.used_bytes > self.budget_bytes:
+            _, (_, evicted_cost) = self._pixmaps.popitem(last=False)
+            self.used_bytes -= evicted_cost
+        return pixmap
+
+    def remove(self, key):
+        entry = self._pixmaps.pop(key, None)
+        if entry is not None:
+            self.used_bytes -= entry[1]
+
+    # Drop every entry the predicate accepts the key of, or everything without a predicate
+    def invalidate(self, predicate=None):
+        for key in [key for key in self._pixmaps if predicate is None or predicate(key)]:
+            self.remove(key)
+
+    def stats(self):
+        return {
+            "entries": len(self._pixmaps),
+            "used_mb": round(self.used_bytes / (1024 * 1024), 1),
+            "budget_mb": round(self.budget_bytes / (1024 * 1024), 1),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def __contains__(self, key):
+        return key in self._pixmaps
+
+    def __len__(self):
+        return len(self._pixmaps)
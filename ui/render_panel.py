@@ -4,13 +4,45 @@ depending on the light intensity, time of day and situations.
 Author: Mohammad Amman, Modified by: Thet Htar Zin
 Reviewed by: Salek MD PEASH BEEN, Thet Htar Zin
 Date: 26 May 2025
-Last Updated: 27 May 2025
+Last Updated: 18 October 2026
 
 """
 # import necessary modules for UI components
 from PyQt6.QtWidgets import QFrame, QLabel, QGraphicsOpacityEffect, QSizePolicy
-from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve
+from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer
 from PyQt6.QtGui import QPixmap
+from .pixmap_cache import PixmapCache
+from .image_loader import ImageLoader
+from . import tone_mapping
+from .asset_pack import assets
+
+
+# Light intensities there is a time of day image for, e.g. images/Dawn_400.jpg
+INTENSITIES = [0, 50, 100, 150, 200, 250, 300, 400, 500, 600, 700, 800, 900, 1000]
+
+RESIZE_SETTLE_MS = 150
+
+
+# Asset name of an image, see ui/asset_pack.py
+def image_name(image_description, lcu_light_intensity):
+    return f"images/{image_description}_{lcu_light_intensity}.jpg"
+
+
+# Decode an image from its file, or from the memory-mapped asset pack. A null pixmap if it is missing.
+def load_pixmap(name):
+    path = assets().file_path(name)
+    if path is not None:
+        return QPixmap(path)
+    pixmap = QPixmap()
+    data = assets().data(name)
+    if data is not None:
+        pixmap.loadFromData(data)
+    return pixmap
+
+
+# Intensity with an image closest to a light value
+def closest_intensity(light):
+    return min(INTENSITIES, key=lambda x: abs(x - light))
 
 
 class RenderPanel(QFrame):
@@ -20,6 +52,18 @@ class RenderPanel(QFrame):
         self.setFrameStyle(QFrame.Shape.StyledPanel)
         self.image_description = "banner"
         self.LCU_light_intensity = 1
+        self.pixmap_cache = PixmapCache()  # Decoded and pre-scaled images, keyed by (description, intensity, size)
+        self.image_loader = ImageLoader(parent=self)  # Decodes prefetched images off the GUI thread
+        self.image_loader.image_ready.connect(self.on_image_ready)
+        self.procedural_lighting = True  # Render manual light values from one base image per time of day
+        self.procedural_shown = False
+        self.shown_pixmap = None  # Last smoothly scaled background, the source for fast resize previews
+
+        # Smooth rescaling waits until the size has not changed for RESIZE_SETTLE_MS
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_SETTLE_MS)
+        self.resize_timer.timeout.connect(self.finish_resize)
 
         # Prevent this widget from changing layout size hints
         self.setMinimumSize(1, 1)
@@ -39,45 +83,146 @@ class RenderPanel(QFrame):
         self.fade_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
         self.fade_label.setVisible(False)
 
-        # Initial background image
-        self.set_background_image(f"assets/images/{self.image_description}_{self.LCU_light_intensity}.jpg")
+        # The initial background image is decoded and scaled by load_banner once the window is on screen
+
+    # Show the banner image, called by the main window after its first paint so startup does not wait for it.
+    # Skipped when an image was already selected in the meantime.
+    def load_banner(self):
+        if self.image_description == "banner" and self.background_label.pixmap().isNull():
+            self.set_background_image(self.image_description, self.LCU_light_intensity)
 
     # This method is called when the widget is resized to ensure the labels cover the entire panel.
+    # While the user drags, the last smooth pixmap is stretched with the fast transformation,
+    # the smooth rescale happens once in finish_resize when the size has stopped changing.
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self.background_label.setGeometry(self.rect())
         self.fade_label.setGeometry(self.rect())
-
-    # Method to set the background image without animation
-    def set_background_image(self, image_path):
-        pixmap = QPixmap(image_path)
+        if self.shown_pixmap is not None:
+            self.background_label.setPixmap(self.shown_pixmap.scaled(
+                self.size(),
+                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                Qt.TransformationMode.FastTransformation
+            ))
+        self.resize_timer.start()
+
+    # The size has been stable for a moment: one smooth rescale from the cached original
+    def finish_resize(self):
+        size = self.size()
+        size_key = (size.width(), size.height())
+        # Scaled pixmaps are only good for their size, the decoded originals stay cached
+        self.pixmap_cache.invalidate(lambda key: key[2] is not None and key[2] != size_key)
+        self.image_loader.cancel_pending()
+        if self.shown_pixmap is not None:
+            self.show_background(self.current_pixmap())
+
+    # The current image smooth-scaled to the panel size, from the cache when possible
+    def current_pixmap(self):
+        if self.procedural_shown:
+            return self.lit_pixmap(self.image_description, self.LCU_light_intensity)
+        return self.scaled_pixmap(self.image_description, self.LCU_light_intensity)
+
+    def show_background(self, pixmap):
+        self.shown_pixmap = pixmap
+        self.background_label.setPixmap(pixmap)
+
+    # Decoded image for (description, intensity), loaded from disk only the first time
+    def decoded_pixmap(self, image_description, lcu_light_intensity):
+        key = (image_description, lcu_light_intensity, None)
+        pixmap = self.pixmap_cache.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        name = image_name(image_description, lcu_light_intensity)
+        pixmap = load_pixmap(name)
         if pixmap.isNull():
-            print(f"Warning: Could not load image at {image_path}")
-            pixmap = QPixmap("assets/images/default_background.jpg") #Fallback image incase of error
-
-        self.background_label.setPixmap(pixmap.scaled(
-            self.size(),
+            print(f"Warning: Could not load image {name}")
+            pixmap = load_pixmap("images/default_background.jpg") #Fallback image incase of error
+        return self.pixmap_cache.put(key, pixmap)
+
+    # Image for (description, intensity) smooth-scaled to the current panel size, scaled only once per size
+    def scaled_pixmap(self, image_description, lcu_light_intensity):
+        size = self.size()
+        key = (image_description, lcu_light_intensity, (size.width(), size.height()))
+        pixmap = self.pixmap_cache.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        pixmap = self.decoded_pixmap(image_description, lcu_light_intensity).scaled(
+            size,
             Qt.AspectRatioMode.KeepAspectRatioByExpanding,
             Qt.TransformationMode.SmoothTransformation
-        ))
+        )
+        return self.pixmap_cache.put(key, pixmap)
+
+    # Decode and scale these (description, intensity) images in the background, so a later
+    # update_image finds them in the cache. Earlier entries in the list get decoded first.
+    def prefetch(self, images):
+        size = self.size()
+        size_key = (size.width(), size.height())
+        for rank, (image_description, lcu_light_intensity) in enumerate(images):
+            key = (image_description, lcu_light_intensity, size_key)
+            if key in self.pixmap_cache:
+                continue
+            self.image_loader.request(key, image_name(image_description, lcu_light_intensity), size, -rank)
+
+    # A prefetched image is decoded, keep it unless the panel has been resized since it was requested
+    def on_image_ready(self, key, image):
+        size = self.size()
+        if key[2] == (size.width(), size.height()) and key not in self.pixmap_cache:
+            self.pixmap_cache.put(key, QPixmap.fromImage(image))
+
+    # Method to set the background image without animation
+    def set_background_image(self, image_description, lcu_light_intensity):
+        self.show_background(self.scaled_pixmap(image_description, lcu_light_intensity))
+
+    # Time of day image for any light value, the base image with the tone curve gain applied.
+    # Cached per whole lux value and panel size.
+    def lit_pixmap(self, time_of_day, light):
+        size = self.size()
+        light = int(round(light))
+        key = (time_of_day, ("lux", light), (size.width(), size.height()))
+        pixmap = self.pixmap_cache.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        base = self.scaled_pixmap(time_of_day, tone_mapping.base_intensity(time_of_day))
+        gain = tone_mapping.light_gain(time_of_day, light)
+        return self.pixmap_cache.put(key, QPixmap.fromImage(tone_mapping.apply_gain(base.toImage(), gain)))
+
+    # Whether manual light values are rendered from the base image instead of the nearest JPEG
+    def uses_procedural_lighting(self, time_of_day):
+        return self.procedural_lighting and tone_mapping.NUMPY_AVAILABLE and time_of_day in tone_mapping.TONE_CURVES
+
+    # Images a manual light value needs: the base image, or the nearest JPEG and its neighbouring intensities
+    def images_for_light(self, time_of_day, light):
+        if self.uses_procedural_lighting(time_of_day):
+            return [(time_of_day, tone_mapping.base_intensity(time_of_day))]
+        index = INTENSITIES.index(closest_intensity(light))
+        return [(time_of_day, INTENSITIES[i]) for i in (index, index + 1, index - 1) if 0 <= i < len(INTENSITIES)]
+
+    # Show a manual light value with a fade-in, continuous with procedural lighting, else snapped to a JPEG
+    def show_light_level(self, time_of_day, light):
+        if not self.uses_procedural_lighting(time_of_day):
+            self.update_image(time_of_day, closest_intensity(light))
+            return
+        self.image_description = time_of_day
+        self.LCU_light_intensity = light
+        self.procedural_shown = True
+        self.fade_to(self.lit_pixmap(time_of_day, light))
 
     # Method to update the image with a fade-in effect
     def update_image(self, image_description, lcu_light_intensity):
         self.image_description = image_description
         self.LCU_light_intensity = lcu_light_intensity
-        image_path = f"assets/images/{self.image_description}_{self.LCU_light_intensity}.jpg"
+        self.procedural_shown = False
+        self.fade_to(self.scaled_pixmap(image_description, lcu_light_intensity))
 
-        pixmap = QPixmap(image_path)
-        if pixmap.isNull():
-            print(f"Warning: Could not load image at {image_path}")
-            pixmap = QPixmap("assets/images/default_background.jpg")
+    def fade_to(self, pixmap):
+        faded_size = self.size()
 
         # Prepare fade label
-        self.fade_label.setPixmap(pixmap.scaled(
-            self.size(),
-            Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-            Qt.TransformationMode.SmoothTransformation
-        ))
+        self.fade_label.setPixmap(pixmap)
         self.fade_label.setVisible(True)
         self.fade_label.raise_()
 
@@ -91,9 +236,10 @@ class RenderPanel(QFrame):
         animation.setEndValue(1.0)
         animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
 
-        # After animation completes, update background and hide overlay
+        # After animation completes, show the same pixmap as background (or the one for the
+        # new size if the panel was resized meanwhile) and hide overlay
         def on_animation_finished():
-            self.set_background_image(image_path)
+            self.show_background(pixmap if self.size() == faded_size else self.current_pixmap())
             self.fade_label.setVisible(False)
             self.fade_label.setGraphicsEffect(None)
 
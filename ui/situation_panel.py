@@ -3,20 +3,23 @@ Description: Left panel for selecting sensor situations with radio buttons.
 Author(s): Mohammad Amman
 Reviewed by: Thet Htar Zin, Salek MD PEASH BEEN
 Date: 26 May 2025
-Last Updated: 27 May 2025
+Last Updated: 18 October 2026
 
 """
 #import necessary modules for UI components
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel, QRadioButton, QButtonGroup, QPushButton
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
+from simulator.scenarios import MANUAL_SITUATION
 
 
 class SituationPanel(QFrame):
     situation_changed = pyqtSignal(bool)  # True if manual mode
     
-    def __init__(self):
+    # titles are the scenario buttons shown after the manual input button
+    def __init__(self, titles=()):
         super().__init__()
+        self.situations = [MANUAL_SITUATION] + list(titles)
         self.setObjectName("situationPanel")
         self.setFrameStyle(QFrame.Shape.StyledPanel)
         self.setup_ui()
@@ -32,7 +35,7 @@ class SituationPanel(QFrame):
         layout.addWidget(title)
 
         # Style for box selectors
-        box_style = """
+        self.box_style = """
             QPushButton {
                 background-color: #ffffff;
                 color: black;
@@ -55,31 +58,39 @@ class SituationPanel(QFrame):
 
         self.button_group = QButtonGroup()
         self.button_group.setExclusive(True)  # Only one button checked at a time
+        self.button_group.buttonClicked.connect(self.on_situation_changed)
 
-        self.situations = [
-            "Enter values manually",
-            "Train inside a tunnel", 
-            "Under direct sunlight",
-            "Person blocking sensor",
-            "Vandalizing Sensor",
-            "Flashing at the Sensor",
-            "Broken Sensor",
-            "Train on fire"
-        ]
+        # The buttons get their own layout, so they can be rebuilt when the scenario file changes
+        self.button_layout = QVBoxLayout()
+        layout.addLayout(self.button_layout)
+        self.create_buttons(MANUAL_SITUATION)
+        layout.addStretch()
 
-        # Loop through each situation and create a corresponding clickable button
+    # Loop through each situation and create a corresponding clickable button, `selected` stays checked
+    def create_buttons(self, selected):
         for i, situation in enumerate(self.situations):
             box = QPushButton(situation)
             box.setCheckable(True)
-            box.setStyleSheet(box_style)
+            box.setStyleSheet(self.box_style)
             box.setFont(QFont("Poppins", 10))
-            if i == 0:
-                box.setChecked(True)    # Set the first button as checked by default
+            if situation == selected:
+                box.setChecked(True)
             self.button_group.addButton(box, i)
-            layout.addWidget(box)
+            self.button_layout.addWidget(box)
 
-        self.button_group.buttonClicked.connect(self.on_situation_changed)
-        layout.addStretch()
+    # Show a new list of scenarios, keeps the selected one if it still exists, else manual input is selected.
+    # Returns True when the selection had to fall back to manual input.
+    def set_situations(self, titles):
+        selected = self.get_current_situation()
+        for button in self.button_group.buttons():
+            self.button_group.removeButton(button)
+            self.button_layout.removeWidget(button)
+            button.deleteLater()
+
+        self.situations = [MANUAL_SITUATION] + list(titles)
+        lost_selection = selected not in self.situations
+        self.create_buttons(MANUAL_SITUATION if lost_selection else selected)
+        return lost_selection and selected != MANUAL_SITUATION
         
     #This method is called when a situation button is clicked.    
     def on_situation_changed(self, button):
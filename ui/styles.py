@@ -1,7 +1,10 @@
+from .asset_pack import assets
+
+
 def apply_main_style(main_window):
-    """Apply the main application stylesheet from a .qss file"""
-    try:
-        with open("assets/stylesheet/style.qss", "r") as f:
-            main_window.setStyleSheet(f.read())
-    except FileNotFoundError:
-        print("style.qss not found.")
\ No newline at end of file
+    """Apply the main application stylesheet from a .qss file (packed or under assets/, whatever the working directory)"""
+    data = assets().data("stylesheet/style.qss")
+    if data is None:
+        print("style.qss not found.")
+        return
+    main_window.setStyleSheet(bytes(data).decode("utf-8"))
@@ -0,0 +1,76 @@
+"""
+Description: Procedural lighting for the render panel. Instead of one JPEG per (time of day, intensity)
+pair, a single base image per time of day is brightened or darkened for any lux value with a NumPy
+lookup table applied in linear light. NumPy is optional and imported on first use; without it the
+render panel keeps using the pre-rendered JPEGs.
+Author(s): Mohammad Amman
+Date: 18 October 2026
+Last Updated: 18 October 2026
+
+"""
+import importlib.util
+from PyQt6.QtGui import QImage
+
+
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+# Light values the tone curves are sampled at, the same as the pre-rendered JPEG intensities
+CURVE_LIGHT = [0, 50, 100, 150, 200, 250, 300, 400, 500, 600, 700, 800, 900, 1000]
+
+# Per time of day: the base image intensity and the linear light gain relative to it at CURVE_LIGHT.
+# Fitted against the pre-rendered JPEGs in assets/images, the base is the one that matches them best.
+TONE_CURVES = {
+    "Dawn": (500, [0.162, 0.222, 0.267, 0.321, 0.373, 0.473, 0.604, 0.692, 1.0, 1.173, 1.385, 1.571, 1.627, 1.635]),
+    "Morning": (400, [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.002, 0.984]),
+    "Noon": (400, [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.001, 1.007, 1.014]),
+    "Afternoon": (300, [0.9, 0.937, 0.969, 0.974, 0.981, 0.988, 1.0, 1.007, 1.025, 1.032, 1.038, 1.043, 1.093, 1.137]),
+    "Evening": (600, [0.088, 0.143, 0.185, 0.232, 0.298, 0.372, 0.49, 0.569, 0.844, 1.0, 1.191, 1.373, 1.442, 1.446]),
+    "Night": (600, [0.022, 0.079, 0.123, 0.174, 0.245, 0.323, 0.45, 0.535, 0.832, 1.0, 1.204, 1.469, 1.543, 1.543])
+}
+
+_srgb_to_linear = None
+
+
+def base_intensity(time_of_day):
+    return TONE_CURVES[time_of_day][0]
+
+
+# Import NumPy and build the sRGB table ahead of the first render, safe to call from any thread
+def preload():
+    if NUMPY_AVAILABLE:
+        _linear_table()
+
+
+def _linear_table():
+    global _srgb_to_linear
+    if _srgb_to_linear is None:
+        import numpy as np
+        x = np.arange(256) / 255.0
+        _srgb_to_linear = np.where(x <= 0.04045, x / 12.92, ((x + 0.055) / 1.055) ** 2.4)
+    return _srgb_to_linear
+
+
+# Linear light gain for a lux value, interpolated between the curve points and clamped at the ends
+def light_gain(time_of_day, light):
+    import numpy as np
+    return float(np.interp(light, CURVE_LIGHT, TONE_CURVES[time_of_day][1]))
+
+
+# 256 entry table mapping an sRGB byte of the base image to the byte for this gain
+def brightness_lut(gain):
+    import numpy as np
+    linear = np.clip(_linear_table() * gain, 0.0, 1.0)
+    srgb = np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+    return np.round(srgb * 255).astype(np.uint8)
+
+
+# Copy of image with the gain applied to every colour channel, one table lookup per byte
+def apply_gain(image, gain):
+    import numpy as np
+    image = image.convertToFormat(QImage.Format.Format_RGB32)
+    width, height, stride = image.width(), image.height(), image.bytesPerLine()
+    pixels = np.frombuffer(image.constBits().asarray(image.sizeInBytes()), np.uint8).reshape(height, stride)
+
+    lit = brightness_lut(gain)[pixels]
+    lit.reshape(height, stride // 4, 4)[:, :, 3] = 0xFF  # Keep RGB32's alpha byte opaque
+    return QImage(lit.data, width, height, stride, QImage.Format.Format_RGB32).copy()